@@ -0,0 +1,230 @@
+"""
+AIFIX Grade Index
+grade.csv(ESG 등급표)를 로드할 때 한 번 만들어 두는 메모리 인덱스
+
+- company_code → 행: dict (O(1), 앞자리 0 이 빠진 코드도 조회 가능)
+- 회사명 접두어 검색: 정규화한 이름의 정렬 목록 + bisect (O(log n))
+- 초성 검색: "ㅅㅅㅈ" → 삼성전자 (초성 문자열 정렬 목록 + bisect)
+- 등급(esg/env/soc/gov)·연도 → 행 번호 배열, 여러 조건은 배열 교집합
+- 등급 분포는 로드 시 미리 집계
+- 행은 NO 내림차순으로 정렬해 두므로 행 번호 순서 = 기존 top10 순서
+- grade.csv 의 mtime/크기가 바뀌면 다음 조회 때 다시 생성
+"""
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.common.dataset_cache import get_dataset_cache
+
+GRADE_CSV = Path(__file__).parent / "grade.csv"
+RATING_COLUMNS = ("esg_rating", "env_rating", "soc_rating", "gov_rating")
+# 높은 등급 → 낮은 등급
+GRADE_ORDER = ("A+", "A", "B+", "B", "C", "D")
+NO_GRADE = "등급없음"
+CODE_WIDTH = 6
+
+# 한글 음절의 초성 (유니코드 순서)
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_HANGUL_BASE, _HANGUL_LAST, _CHOSEONG_SPAN = 0xAC00, 0xD7A3, 588
+_PREFIX_END = "\uffff"
+
+
+def normalize_name(text: str) -> str:
+    """검색용 이름 정규화 (NFKC, 소문자, 공백 제거)"""
+    return "".join(unicodedata.normalize("NFKC", str(text)).lower().split())
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절은 초성으로 바꾸고 나머지 문자는 그대로 둠 ("삼성전자" → "ㅅㅅㅈㅈ")"""
+    chars = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            chars.append(CHOSEONG[(code - _HANGUL_BASE) // _CHOSEONG_SPAN])
+        else:
+            chars.append(ch)
+    return "".join(chars)
+
+
+def is_choseong_query(text: str) -> bool:
+    """초성(자음)만으로 이루어진 검색어인지"""
+    return bool(text) and all(ch in CHOSEONG for ch in text)
+
+
+def normalize_code(code: Any) -> str:
+    """종목 코드 정규화 (95570 → "095570")"""
+    text = str(code).strip()
+    return text.zfill(CODE_WIDTH) if text.isdigit() else text.upper()
+
+
+class AifixGradeIndex:
+    """ESG 등급표 메모리 인덱스 (생성 후 읽기 전용)"""
+
+    def __init__(self, df: pd.DataFrame, fingerprint: Tuple[int, int] = (0, 0)) -> None:
+        started = time.perf_counter()
+        self.fingerprint = fingerprint
+        # NO 내림차순 (기존 top10 정렬 기준)
+        if "NO" in df.columns:
+            df = df.sort_values("NO", ascending=False, kind="stable")
+        self.frame = df.reset_index(drop=True)
+        n = len(self.frame)
+
+        codes = [normalize_code(c) for c in self.frame["company_code"].tolist()]
+        self.by_code: Dict[str, int] = {code: i for i, code in enumerate(codes)}
+
+        names = [normalize_name(name) for name in self.frame["company_name"].tolist()]
+        self._name_keys: List[Tuple[str, int]] = sorted(zip(names, range(n)))
+        self._names = [key for key, _ in self._name_keys]
+        self._choseong_keys: List[Tuple[str, int]] = sorted(zip((to_choseong(name) for name in names), range(n)))
+        self._choseongs = [key for key, _ in self._choseong_keys]
+
+        # 컬럼 → 값 → 행 번호 배열 (오름차순 = NO 내림차순)
+        self.postings: Dict[str, Dict[Any, np.ndarray]] = {}
+        for column in RATING_COLUMNS + ("year",):
+            if column in self.frame.columns:
+                groups = self.frame.groupby(column, sort=False).indices
+                self.postings[column] = {key: np.sort(rows) for key, rows in groups.items()}
+
+        self.distribution = self._build_distribution()
+        self.build_seconds = time.perf_counter() - started
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    # ------------------------------------------------------------------
+    # 집계
+    # ------------------------------------------------------------------
+    @staticmethod
+    def grade_sort_key(grade: Any) -> Tuple[int, str]:
+        text = str(grade)
+        return (GRADE_ORDER.index(text), text) if text in GRADE_ORDER else (len(GRADE_ORDER), text)
+
+    def _build_distribution(self) -> Dict[str, Any]:
+        total = len(self.frame)
+        ratings = {}
+        for column in RATING_COLUMNS:
+            if column not in self.postings:
+                continue
+            counts = {grade: len(rows) for grade, rows in self.postings[column].items()}
+            ordered = sorted(counts, key=self.grade_sort_key)
+            ratings[column] = [
+                {"grade": grade, "count": counts[grade], "ratio": round(counts[grade] / total, 4) if total else 0.0}
+                for grade in ordered
+            ]
+        years = {int(year): len(rows) for year, rows in sorted(self.postings.get("year", {}).items())}
+
+        # ESG 등급 × 환경/사회/지배구조 등급 교차표
+        crosstab = {}
+        if "esg_rating" in self.frame.columns:
+            for column in RATING_COLUMNS[1:]:
+                if column not in self.frame.columns:
+                    continue
+                table = pd.crosstab(self.frame["esg_rating"], self.frame[column])
+                rows = sorted(table.index, key=self.grade_sort_key)
+                cols = sorted(table.columns, key=self.grade_sort_key)
+                table = table.loc[rows, cols]
+                crosstab[column] = {str(r): {str(c): int(v) for c, v in zip(cols, values)}
+                                    for r, values in zip(rows, table.to_numpy().tolist())}
+        return {"total": total, "ratings": ratings, "years": years, "esg_crosstab": crosstab}
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def rows(self, positions: Sequence[int]) -> pd.DataFrame:
+        return self.frame.iloc[list(positions)]
+
+    def top(self, n: int = 10) -> pd.DataFrame:
+        """NO 내림차순 상위 n 개"""
+        return self.frame.head(n)
+
+    def get_by_code(self, code: Any) -> Optional[pd.DataFrame]:
+        position = self.by_code.get(normalize_code(code))
+        return None if position is None else self.frame.iloc[[position]]
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+        return bisect_left(keys, prefix), bisect_left(keys, prefix + _PREFIX_END)
+
+    def search(self, query: str, limit: int = 10) -> Tuple[str, List[int]]:
+        """
+        회사명 접두어 검색 (초성만 입력하면 초성 검색)
+
+        Returns:
+            (검색 방식 "prefix"/"choseong", 이름이 짧은 순의 행 번호 목록)
+        """
+        # NFKC 는 호환 자모(ㅅ)를 첫가끝 자모로 바꾸므로 초성 판별은 정규화 전에 수행
+        raw = "".join(str(query).lower().split())
+        if is_choseong_query(raw):
+            mode, prefix, keys, entries = "choseong", raw, self._choseongs, self._choseong_keys
+        else:
+            mode, prefix, keys, entries = "prefix", normalize_name(query), self._names, self._name_keys
+        if not prefix:
+            return mode, []
+        lo, hi = self._prefix_range(keys, prefix)
+        # 이름이 짧은(= 입력과 가까운) 회사 우선, 같으면 이름순
+        matched = sorted(entries[lo:hi], key=lambda item: (len(item[0]), item[0]))
+        return mode, [position for _, position in matched[:limit]]
+
+    def filter(self, **conditions: Any) -> np.ndarray:
+        """
+        등급/연도 조건에 맞는 행 번호 (조건 간 AND, 값이 None 이면 무시)
+
+        예: filter(esg_rating="A", gov_rating="B+", year=2025)
+        """
+        result: Optional[np.ndarray] = None
+        for column, value in conditions.items():
+            if value is None:
+                continue
+            if column not in self.postings:
+                raise KeyError(f"조회할 수 없는 컬럼입니다: {column}")
+            key = int(value) if column == "year" else str(value).strip()
+            rows = self.postings[column].get(key, np.empty(0, dtype=np.intp))
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+        return np.arange(len(self.frame)) if result is None else result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rows": len(self.frame),
+            "codes": len(self.by_code),
+            "build_seconds": round(self.build_seconds, 4),
+            "fingerprint": {"mtime_ns": self.fingerprint[0], "size": self.fingerprint[1]},
+        }
+
+
+_index: Optional[AifixGradeIndex] = None
+_index_lock = threading.Lock()
+
+
+def _fingerprint(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def peek_grade_index(path: Path = GRADE_CSV) -> Optional[AifixGradeIndex]:
+    """
+    최신 인덱스가 이미 있으면 반환, grade.csv 가 바뀌었거나 아직 없으면 None
+    (파일 stat 만 하므로 이벤트 루프에서 호출해도 됨)
+    """
+    index = _index
+    if index is not None and path.exists() and index.fingerprint == _fingerprint(path):
+        return index
+    return None
+
+
+def get_grade_index(path: Path = GRADE_CSV) -> AifixGradeIndex:
+    """ESG 등급표 인덱스 싱글톤 반환 (grade.csv 가 바뀌었으면 다시 생성)"""
+    global _index
+    with _index_lock:
+        if not path.exists():
+            raise FileNotFoundError(f"grade.csv 파일을 찾을 수 없습니다: {path}")
+        fingerprint = _fingerprint(path)
+        if _index is None or _index.fingerprint != fingerprint:
+            df = get_dataset_cache().read_csv(path, encoding='utf-8')
+            _index = AifixGradeIndex(df, fingerprint)
+        return _index
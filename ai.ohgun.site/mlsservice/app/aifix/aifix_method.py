@@ -1,20 +1,113 @@
+"""
+AIFIX Method
+ESG 등급 순서형 인코딩과 학습 데이터(피처/레이블) 생성
+"""
+from typing import Any, Dict, Iterable, List, Optional
 
+import numpy as np
+import pandas as pd
 
-class AifixMethod(object): 
+from .aifix_index import GRADE_ORDER, NO_GRADE, RATING_COLUMNS, AifixGradeIndex, get_grade_index
 
-    def __init__(self):
-        #데이터셋 객체 생성
-        pass
+# 환경/사회/지배구조 등급으로 ESG 등급 예측
+FEATURE_COLUMNS = list(RATING_COLUMNS[1:])
+LABEL_COLUMN = RATING_COLUMNS[0]
 
-    def new_model(self):
-        #grade.csv 파일을 읽어와서 데이터프레임 작성
-        pass
 
-    def create_train(self):
-        #ESG등급 값을 제거한 데이터프레임 작성
-        pass
+class GradeEncoder:
+    """
+    ESG 등급 ↔ 순서형 정수 변환 (D=0 < C < B < B+ < A < A+=5)
+    명시적인 등급없음만 MISSING(-1), 비어 있는 값(None/NaN/빈 문자열)과 그 외 값은 ValueError
+    """
+    MISSING = -1
 
-    def create_label(self):
-        #ESG등급 값을 거치는 답안지 데이터프레임 작성
-        pass
+    def __init__(self, grades: Iterable[str] = GRADE_ORDER) -> None:
+        # GRADE_ORDER 는 높은 등급부터이므로 뒤집어서 낮은 등급 = 0
+        self.scale: List[str] = list(reversed(list(grades)))
+        self._categories = pd.Index(self.scale)
 
+    @property
+    def classes(self) -> List[str]:
+        return list(self.scale)
+
+    def encode(self, values: Any) -> np.ndarray:
+        """등급 배열 → int8 코드 배열 (벡터 연산)"""
+        series = pd.Series(values, dtype="object").astype("string").str.strip().str.upper()
+        empty = (series.isna() | series.eq("")).to_numpy(dtype=bool)
+        if empty.any():
+            raise ValueError(f"비어 있는 등급이 {int(empty.sum())}개 있습니다. (등급이 없으면 '{NO_GRADE}'으로 지정)")
+        missing = series.eq(NO_GRADE).to_numpy(dtype=bool)
+        codes = self._categories.get_indexer(series)
+        invalid = (codes < 0) & ~missing
+        if invalid.any():
+            bad = sorted(set(series[invalid].tolist()))
+            raise ValueError(f"알 수 없는 등급입니다: {', '.join(bad)} (지원: {', '.join(GRADE_ORDER)}, {NO_GRADE})")
+        codes[missing] = self.MISSING
+        return codes.astype(np.int8)
+
+    def decode(self, codes: Any) -> np.ndarray:
+        """int 코드 배열 → 등급 문자열 배열 (MISSING 은 등급없음)"""
+        codes = np.asarray(codes, dtype=np.int64)
+        labels = np.array(self.scale + [NO_GRADE], dtype=object)
+        return labels[np.where(codes < 0, len(self.scale), codes)]
+
+    # 등급이 비어 있는 행을 오류 메시지에 나열하는 최대 개수
+    MAX_REPORTED_ROWS = 10
+
+    def encode_frame(self, df: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        등급 컬럼들을 한 번에 인코딩한 피처 데이터프레임
+        등급이 비어 있는 행이 있으면 행 번호(0부터)와 비어 있는 필드를 나열한 ValueError
+        """
+        columns = columns or FEATURE_COLUMNS
+        missing = [c for c in columns if c not in df.columns]
+        if missing:
+            raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+        empty = pd.DataFrame({
+            c: (df[c].isna() | df[c].astype("string").str.strip().eq("")).fillna(True).to_numpy(dtype=bool)
+            for c in columns
+        })
+        empty_rows = np.flatnonzero(empty.to_numpy().any(axis=1))
+        if len(empty_rows):
+            details = "; ".join(
+                f"{row}번째 행: {', '.join(c for c in columns if empty.at[row, c])}"
+                for row in empty_rows[:self.MAX_REPORTED_ROWS]
+            )
+            more = f" 외 {len(empty_rows) - self.MAX_REPORTED_ROWS}개 행" if len(empty_rows) > self.MAX_REPORTED_ROWS else ""
+            raise ValueError(f"등급이 비어 있는 필드가 있습니다 - {details}{more} (등급이 없으면 '{NO_GRADE}'으로 지정)")
+        return pd.DataFrame({c: self.encode(df[c].to_numpy()) for c in columns}, index=df.index)
+
+    def get_info(self) -> Dict[str, Any]:
+        return {"scale": self.scale, "missing": {NO_GRADE: self.MISSING}}
+
+
+class AifixMethod(object):
+
+    def __init__(self, index: Optional[AifixGradeIndex] = None):
+        # grade.csv 인덱스 (등급표 원본 프레임과 파일 버전)
+        self.index = index or get_grade_index()
+        self.encoder = GradeEncoder()
+
+    @property
+    def fingerprint(self) -> str:
+        mtime_ns, size = self.index.fingerprint
+        return f"{mtime_ns}:{size}"
+
+    def new_model(self) -> pd.DataFrame:
+        # grade.csv 를 읽은 데이터프레임 (인덱스가 보관한 프레임의 복사본)
+        return self.index.frame.copy()
+
+    def labeled(self) -> pd.DataFrame:
+        # ESG 등급이 있는 기업만 (등급없음은 학습에서 제외)
+        df = self.new_model()
+        return df[df[LABEL_COLUMN].astype(str).str.strip() != NO_GRADE]
+
+    def create_train(self, df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        # ESG등급 값을 제거한 피처 데이터프레임 (환경/사회/지배구조 등급 → 순서형 정수)
+        df = self.labeled() if df is None else df
+        return self.encoder.encode_frame(df, FEATURE_COLUMNS)
+
+    def create_label(self, df: Optional[pd.DataFrame] = None) -> pd.Series:
+        # ESG등급 답안지 (순서형 정수)
+        df = self.labeled() if df is None else df
+        return pd.Series(self.encoder.encode(df[LABEL_COLUMN].to_numpy()), index=df.index, name=LABEL_COLUMN)
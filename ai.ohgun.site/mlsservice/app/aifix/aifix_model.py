@@ -1,10 +1,93 @@
-from multiprocessing.process import parent_process
+"""
+AIFIX Models
+ESG 등급 예측 모델 캐시
+
+학습한 모델은 (grade.csv 버전, 모델 이름, 하이퍼파라미터) 키로 메모리에 보관하여
+같은 데이터로는 다시 학습하지 않습니다. 활성 모델 교체는 학습이 끝난 뒤 락 안에서 한 번에 이루어집니다.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
 import pandas as pd
-import os
-from icecream import ic
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+MODEL_FACTORIES = {
+    "RandomForest": lambda **p: RandomForestClassifier(**{"n_estimators": 200, "random_state": 42, "n_jobs": 1, **p}),
+    "DecisionTree": lambda **p: DecisionTreeClassifier(**{"random_state": 42, **p}),
+    "LogisticRegression": lambda **p: LogisticRegression(**{"max_iter": 1000, **p}),
+}
+DEFAULT_MODEL_NAME = "RandomForest"
 
 
 class AifixModels:
+    """ESG 등급 예측 모델 메모리 캐시"""
+
     def __init__(self) -> None:
-       pass
+        self._lock = threading.Lock()
+        self._train_lock = threading.Lock()
+        self._entries: Dict[Tuple, Dict[str, Any]] = {}
+        self._active: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    def build(name: str, params: Dict[str, Any]):
+        """모델 이름과 파라미터로 estimator 생성"""
+        if name not in MODEL_FACTORIES:
+            raise ValueError(f"지원하지 않는 모델입니다: {name} (지원: {', '.join(MODEL_FACTORIES)})")
+        return MODEL_FACTORIES[name](**params)
+
+    @staticmethod
+    def _key(data_fingerprint: str, name: str, params: Dict[str, Any]) -> Tuple:
+        return data_fingerprint, name, tuple(sorted((k, repr(v)) for k, v in params.items()))
+
+    @property
+    def active(self) -> Optional[Dict[str, Any]]:
+        """현재 활성 모델 엔트리 ({"model", "meta"})"""
+        return self._active
+
+    def get_or_train(self, X: pd.DataFrame, y: pd.Series, data_fingerprint: str,
+                     name: str = DEFAULT_MODEL_NAME, params: Optional[Dict[str, Any]] = None,
+                     force: bool = False) -> Dict[str, Any]:
+        """
+        같은 데이터/모델/파라미터로 학습한 모델이 캐시에 있으면 재사용, 없으면 학습 후 활성화
+        """
+        params = params or {}
+        key = self._key(data_fingerprint, name, params)
+        with self._train_lock:
+            entry = None if force else self._entries.get(key)
+            if entry is None:
+                started = time.perf_counter()
+                model = self.build(name, params).fit(X, y)
+                entry = {
+                    "model": model,
+                    "meta": {
+                        "name": name,
+                        "params": params,
+                        "data_fingerprint": data_fingerprint,
+                        "features": list(X.columns),
+                        "train_rows": len(X),
+                        "train_seconds": round(time.perf_counter() - started, 4),
+                        "trained_at": datetime.now().isoformat(timespec="seconds"),
+                    },
+                }
+                # grade.csv 가 바뀌면 이전 버전 데이터로 학습한 모델은 버림
+                for stale in [k for k in self._entries if k[0] != data_fingerprint]:
+                    del self._entries[stale]
+                self._entries[key] = entry
+            with self._lock:
+                self._active = entry
+            return entry
+
+    def clear(self) -> None:
+        with self._train_lock, self._lock:
+            self._entries.clear()
+            self._active = None
 
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cached_models": len(self._entries),
+            "active": self._active["meta"] if self._active else None,
+        }
@@ -3,11 +3,17 @@ AIFIX Router
 AIFIX ESG 평가 데이터 관련 API 라우터
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import List, Optional, Dict, Any, Union
+from pydantic import BaseModel, Field
 import pandas as pd
 import os
+import time
 from pathlib import Path
+from app.common.executor import get_executor
+from app.common.export import EXPORT_CHUNK_ROWS, export_response
+from app.common.serializer import frame_response, frame_to_records
+from .aifix_index import AifixGradeIndex, get_grade_index, normalize_code, peek_grade_index
 from .aifix_service import AifixService
 
 # APIRouter 생성 (prefix와 tags 설정)
@@ -24,6 +30,14 @@ def get_service() -> AifixService:
     return _service_instance
 
 
+async def _grade_index() -> AifixGradeIndex:
+    """최신 등급 인덱스 (이미 있으면 바로 반환, 없거나 grade.csv 가 바뀌었으면 실행기에서 생성)"""
+    index = peek_grade_index()
+    if index is None:
+        index = await get_executor().run_in_thread("aifix.data", get_grade_index)
+    return index
+
+
 @aifix_router.get("/")
 async def aifix_root():
     """AIFIX 서비스 상태 확인"""
@@ -37,65 +51,176 @@ async def aifix_root():
 
 @aifix_router.post("/preprocess")
 async def preprocess():
-    """데이터 전처리 실행"""
+    """데이터 전처리 실행 (등급 순서형 인코딩, 학습 데이터 요약)"""
     service = get_service()
-    service.preprogress()
+    try:
+        result = await get_executor().run_in_thread("aifix.model", service.preprogress)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     return {
         "message": "전처리 완료",
-        "status": "success"
+        "status": "success",
+        "result": result
     }
 
 
+class ModelingRequest(BaseModel):
+    """모델 설정 요청 모델"""
+    model_name: str = Field("RandomForest", description="RandomForest, DecisionTree, LogisticRegression")
+    params: Optional[Dict[str, Any]] = Field(None, description="하이퍼파라미터 (생략 시 기본값)")
+
+
 @aifix_router.post("/modeling")
-async def modeling():
-    """모델링 실행"""
+async def modeling(request: Optional[ModelingRequest] = None):
+    """모델링 실행 (사용할 모델과 하이퍼파라미터 설정 - 학습에 성공한 설정만 적용)"""
     service = get_service()
-    service.modeling()
+    try:
+        name, params = (request.model_name, request.params) if request else (None, None)
+        result = await get_executor().run_in_thread("aifix.model", service.modeling, name, params)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"모델 설정 오류: {str(e)}")
     return {
         "message": "모델링 완료",
-        "status": "success"
+        "status": "success",
+        "result": result
     }
 
 
 @aifix_router.post("/learning")
-async def learning():
-    """학습 실행"""
+async def learning(force: bool = Query(False, description="캐시된 모델이 있어도 다시 학습")):
+    """학습 실행 (같은 데이터/설정으로 학습한 모델은 메모리 캐시에서 재사용)"""
     service = get_service()
-    service.learning()
+    try:
+        result = await get_executor().run_in_thread("aifix.model", service.learning, force)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        # 잘못된 하이퍼파라미터(sklearn InvalidParameterError 포함)
+        raise HTTPException(status_code=400, detail=f"모델 설정 오류: {str(e)}")
     return {
         "message": "학습 완료",
-        "status": "success"
+        "status": "success",
+        "result": result
     }
 
 
 @aifix_router.post("/evaluating")
-async def evaluating():
-    """평가 실행"""
+async def evaluating(cv: int = Query(5, ge=2, le=20, description="교차 검증 폴드 수")):
+    """평가 실행 (홀드아웃 정확도, 한 등급 이내 정확도, 혼동 행렬, 교차 검증)"""
     service = get_service()
-    service.evaluating()
+    try:
+        result = await get_executor().run_in_thread("aifix.model", service.evaluating, cv)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        # 잘못된 하이퍼파라미터(sklearn InvalidParameterError 포함)
+        raise HTTPException(status_code=400, detail=f"모델 설정 오류: {str(e)}")
     return {
         "message": "평가 완료",
-        "status": "success"
+        "status": "success",
+        "result": result
     }
 
 
 @aifix_router.post("/submit")
 async def submit():
-    """제출 실행"""
+    """제출 실행 (전체 기업 ESG 등급 예측 결과를 save/esg_predictions.csv 로 저장)"""
     service = get_service()
-    service.submit()
+    try:
+        result = await get_executor().run_in_thread("aifix.model", service.submit)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        # 잘못된 하이퍼파라미터(sklearn InvalidParameterError 포함)
+        raise HTTPException(status_code=400, detail=f"모델 설정 오류: {str(e)}")
     return {
         "message": "제출 완료",
-        "status": "success"
+        "status": "success",
+        "result": result
     }
 
 
+class CompanyGrades(BaseModel):
+    """예측 입력 (기업 1개)"""
+    company_code: Optional[str] = None
+    company_name: Optional[str] = None
+    env_rating: Optional[str] = Field(None, description="환경 등급 (A+, A, B+, B, C, D, 등급없음)")
+    soc_rating: Optional[str] = Field(None, description="사회 등급")
+    gov_rating: Optional[str] = Field(None, description="지배구조 등급")
+
+
+class AifixPredictRequest(BaseModel):
+    """예측 요청 모델 (기업 1개 ~ 수천 개, 또는 등급표에 있는 종목 코드)"""
+    companies: List[CompanyGrades] = Field(default_factory=list)
+    company_codes: List[str] = Field(default_factory=list, description="grade.csv 의 등급으로 예측할 종목 코드")
+
+
+def _predict_companies(request: AifixPredictRequest) -> pd.DataFrame:
+    """요청 기업들을 하나의 데이터프레임으로 모아 한 번에 예측 (실행기 스레드에서 실행)"""
+    frames = []
+    if request.companies:
+        frames.append(pd.DataFrame([company.model_dump() for company in request.companies]))
+    if request.company_codes:
+        index = get_grade_index()
+        rows = [index.get_by_code(code) for code in request.company_codes]
+        unknown = [code for code, row in zip(request.company_codes, rows) if row is None]
+        if unknown:
+            raise KeyError(f"기업을 찾을 수 없습니다: {', '.join(unknown)}")
+        codes = pd.concat(rows, ignore_index=True)
+        # 직접 입력한 기업과 같은 형태로 응답하도록 종목 코드는 6자리 문자열로 통일
+        codes["company_code"] = codes["company_code"].map(normalize_code)
+        frames.append(codes)
+    return get_service().predict(pd.concat(frames, ignore_index=True))
+
+
+@aifix_router.post("/predict")
+async def predict(request: Union[AifixPredictRequest, List[CompanyGrades], CompanyGrades]):
+    """
+    환경/사회/지배구조 등급으로 ESG 등급 예측
+    
+    기업 1개(객체), 기업 목록(배열) 또는 {"companies": [...], "company_codes": [...]} 형식을 받아
+    메모리에 있는 모델로 한 번에 예측합니다.
+    
+    Returns:
+        company_code, company_name, predicted_esg_rating, confidence 목록
+    """
+    started = time.perf_counter()
+    if isinstance(request, list):
+        request = AifixPredictRequest(companies=request)
+    elif isinstance(request, CompanyGrades):
+        request = AifixPredictRequest(companies=[request])
+    if not request.companies and not request.company_codes:
+        raise HTTPException(status_code=400, detail="예측할 기업 데이터가 없습니다.")
+    try:
+        result = await get_executor().run_in_thread("aifix.predict", _predict_companies, request)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"예측 중 오류 발생: {str(e)}"
+        )
+    service = get_service()
+    active = service.models.active
+    return frame_response(result, envelope={
+        "success": True,
+        "model": active["meta"]["name"] if active else None,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    })
+
+
 @aifix_router.get("/companies/top10")
-async def get_top_10_companies():
+async def get_top_10_companies(
+    format: str = Query("json", pattern="^(json|ndjson|arrow)$", description="응답 형식 (json, ndjson, arrow)")
+):
     """
     grade.csv 파일에서 상위 10개 기업 목록을 조회합니다.
     
-    NO 컬럼 기준으로 내림차순 정렬하여 상위 10개를 반환합니다.
+    NO 컬럼 기준 내림차순 상위 10개를 반환합니다 (정렬은 인덱스 생성 시 한 번만 수행).
     
     Returns:
         {
@@ -105,55 +230,21 @@ async def get_top_10_companies():
         }
     """
     try:
-        # CSV 파일 경로 설정
-        current_dir = Path(__file__).parent
-        csv_path = current_dir / "grade.csv"
-        
-        # 파일 존재 확인
-        if not csv_path.exists():
-            raise HTTPException(
-                status_code=404, 
-                detail=f"grade.csv 파일을 찾을 수 없습니다: {csv_path}"
-            )
-        
-        # CSV 파일 읽기 (UTF-8 인코딩)
-        df = pd.read_csv(csv_path, encoding='utf-8')
+        # 로드 시 NO 내림차순으로 정렬해 둔 인덱스 사용 (grade.csv 가 바뀔 때만 다시 읽음)
+        index = await _grade_index()
         
         # NO 컬럼이 있는지 확인
-        if 'NO' not in df.columns:
+        if 'NO' not in index.frame.columns:
             raise HTTPException(
                 status_code=400,
                 detail="CSV 파일에 'NO' 컬럼이 없습니다."
             )
         
-        # NO 기준으로 내림차순 정렬 (NO가 큰 순서대로)
-        df_sorted = df.sort_values('NO', ascending=False)
-        
         # 상위 10개 선택
-        top_10 = df_sorted.head(10)
+        top_10 = index.top(10)
         
-        # NaN, inf 값을 None으로 변환하여 JSON 직렬화 가능하게 함
-        top_10 = top_10.replace([float('inf'), float('-inf')], None)
-        top_10 = top_10.where(pd.notna(top_10), None)
-        
-        # DataFrame을 딕셔너리 리스트로 변환
-        companies_list = top_10.to_dict(orient='records')
-        
-        # 딕셔너리 내부의 모든 값도 확인하여 inf, nan, 빈 문자열 처리
-        for company in companies_list:
-            for key, value in company.items():
-                # NaN, inf 값 처리
-                if pd.isna(value) or (isinstance(value, float) and (value == float('inf') or value == float('-inf'))):
-                    company[key] = None
-                # 빈 문자열 처리
-                elif isinstance(value, str) and value.strip() == '':
-                    company[key] = None
-        
-        return {
-            "success": True,
-            "count": len(companies_list),
-            "data": companies_list
-        }
+        # NaN/inf/빈 문자열을 컬럼 단위로 None 처리하여 요청 형식(json/ndjson/arrow)으로 직렬화
+        return frame_response(top_10, format, {"success": True}, blank_as_null=True)
         
     except HTTPException:
         # HTTPException은 그대로 전달
@@ -172,3 +263,124 @@ async def get_top_10_companies():
         )
 
 
+@aifix_router.get("/companies/export")
+async def export_companies(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="출력 형식 (ndjson, csv)"),
+    compress: bool = Query(True, description="Accept-Encoding: gzip 이면 gzip 으로 전송")
+):
+    """
+    grade.csv 전체 기업 목록 스트리밍 다운로드
+    
+    EXPORT_CHUNK_ROWS 행 단위로 읽어서 바로 내보내므로 파일 크기와 무관하게
+    한 청크만 메모리에 올립니다. NDJSON 은 top10 과 같이 NaN/빈 값을 null 로 출력합니다.
+    """
+    csv_path = Path(__file__).parent / "grade.csv"
+    if not csv_path.exists():
+        raise HTTPException(
+            status_code=404,
+            detail=f"grade.csv 파일을 찾을 수 없습니다: {csv_path}"
+        )
+    return export_response(
+        request,
+        lambda: pd.read_csv(csv_path, encoding='utf-8', chunksize=EXPORT_CHUNK_ROWS),
+        format, "aifix_grade", compress=compress, blank_as_null=True,
+    )
+
+
+@aifix_router.get("/companies/search")
+async def search_companies(
+    q: str = Query(..., min_length=1, description="회사명 앞부분 또는 초성 (예: 삼성, ㅅㅅ)"),
+    limit: int = Query(10, ge=1, le=100, description="최대 결과 수")
+):
+    """
+    회사명 자동완성 검색
+    
+    회사명 앞부분(공백/대소문자 무시) 또는 초성만으로 검색합니다.
+    인덱스의 정렬된 이름 목록을 이진 탐색하므로 입력할 때마다 호출해도 됩니다.
+    """
+    try:
+        index = await _grade_index()
+        mode, positions = index.search(q, limit)
+        return frame_response(index.rows(positions), envelope={"success": True, "query": q, "mode": mode})
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"검색 중 오류 발생: {str(e)}"
+        )
+
+
+@aifix_router.get("/companies")
+async def filter_companies(
+    esg_rating: Optional[str] = Query(None, description="ESG 등급 (A+, A, B+, B, C, D, 등급없음)"),
+    env_rating: Optional[str] = Query(None, description="환경 등급"),
+    soc_rating: Optional[str] = Query(None, description="사회 등급"),
+    gov_rating: Optional[str] = Query(None, description="지배구조 등급"),
+    year: Optional[int] = Query(None, description="평가 연도"),
+    limit: int = Query(50, ge=1, le=1000, description="페이지 크기"),
+    offset: int = Query(0, ge=0, description="시작 위치")
+):
+    """
+    등급/연도 조건으로 기업 목록 조회 (NO 내림차순)
+    
+    조건별 행 번호 목록을 미리 만들어 두고 교집합만 계산합니다.
+    """
+    try:
+        index = await _grade_index()
+        positions = index.filter(
+            esg_rating=esg_rating, env_rating=env_rating, soc_rating=soc_rating, gov_rating=gov_rating, year=year
+        )
+        return frame_response(
+            index.rows(positions[offset:offset + limit]),
+            envelope={"success": True, "total": len(positions), "offset": offset, "limit": limit},
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"데이터 조회 중 오류 발생: {str(e)}"
+        )
+
+
+@aifix_router.get("/grades/distribution")
+async def get_grade_distribution():
+    """
+    ESG/환경/사회/지배구조 등급 분포, 연도별 기업 수, ESG 등급 교차표
+    
+    인덱스 생성 시 미리 집계한 값을 반환합니다.
+    """
+    try:
+        index = await _grade_index()
+        return {"success": True, **index.distribution}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@aifix_router.get("/index")
+async def get_index_stats():
+    """등급 인덱스 상태 (행 수, 생성 시간, 원본 파일 버전)"""
+    try:
+        index = await _grade_index()
+        return {"success": True, **index.stats()}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@aifix_router.get("/companies/{company_code}")
+async def get_company(company_code: str):
+    """
+    종목 코드로 기업 조회 (앞자리 0 생략 가능, 예: 95570 → 095570)
+    """
+    try:
+        index = await _grade_index()
+        row = index.get_by_code(company_code)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"기업을 찾을 수 없습니다: {company_code}")
+    return {"success": True, "data": frame_to_records(row, blank_as_null=True)[0]}
@@ -3,45 +3,220 @@ AIFIX 데이터 서비스
 판다스, 넘파이, 사이킷런을 사용한 데이터 처리 및 머신러닝 서비스
 """
 import sys
+import logging
 from pathlib import Path
-from typing import List, Dict, Optional, Any, ParamSpecArgs
+from typing import List, Dict, Optional, Any
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-from icecream import ic
+from sklearn.model_selection import StratifiedKFold, cross_val_score, train_test_split
+from sklearn.metrics import accuracy_score, confusion_matrix
+from app.common.log_capture import make_ic
+
+logger = logging.getLogger(__name__)
+
+# ic() 출력은 logging 으로 보냄
+ic = make_ic(logger)
 
 # 공통 모듈 경로 추가
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
+from .aifix_index import NO_GRADE, get_grade_index
+from .aifix_method import AifixMethod, FEATURE_COLUMNS, LABEL_COLUMN
+from .aifix_model import AifixModels, DEFAULT_MODEL_NAME
+
+SAVE_DIR = Path(__file__).parent / "save"
+
 
 class AifixService:
     """
     AIFIX ESG 평가 데이터 CRUD 서비스 클래스
     Java 스타일의 서비스 레이어 패턴 구현
+
+    환경/사회/지배구조 등급(순서형 인코딩)으로 ESG 등급을 예측합니다.
+    학습한 모델과 인코더는 grade.csv 버전별로 메모리에 유지합니다.
     """
+    # 예측 시 함께 돌려줄 식별 컬럼
+    ID_COLUMNS = ["company_code", "company_name"]
+
     def __init__(self):
-        pass
+        self.models = AifixModels()
+        self.model_name = DEFAULT_MODEL_NAME
+        self.model_params: Dict[str, Any] = {}
+        self._method: Optional[AifixMethod] = None
+        self._train_cache: Optional[Dict[str, Any]] = None
+        self._evaluation_cache: Dict[tuple, Dict[str, Any]] = {}
+
+    def get_method(self) -> AifixMethod:
+        """현재 grade.csv 인덱스 기준 AifixMethod (파일이 바뀌면 새로 생성)"""
+        index = get_grade_index()
+        if self._method is None or self._method.index is not index:
+            self._method = AifixMethod(index)
+            self._train_cache = None
+        return self._method
+
+    def get_training_data(self):
+        """인코딩된 피처(X)와 레이블(y) 반환 (같은 grade.csv 버전이면 재사용)"""
+        method = self.get_method()
+        if self._train_cache is None or self._train_cache["fingerprint"] != method.fingerprint:
+            labeled = method.labeled()
+            self._train_cache = {
+                "fingerprint": method.fingerprint,
+                "X": method.create_train(labeled),
+                "y": method.create_label(labeled),
+            }
+        return self._train_cache["X"], self._train_cache["y"]
+
+    def get_model(self) -> Dict[str, Any]:
+        """현재 grade.csv 와 모델 설정에 맞는 모델 반환 ({"model", "meta"}), 없을 때만 학습"""
+        active = self.models.active
+        X, y = self.get_training_data()
+        fingerprint = self.get_method().fingerprint
+        if (active is not None and active["meta"]["data_fingerprint"] == fingerprint
+                and active["meta"]["name"] == self.model_name and active["meta"]["params"] == self.model_params):
+            return active
+        return self.models.get_or_train(X, y, fingerprint, name=self.model_name, params=self.model_params)
 
-    def preprogress(self):
+    def predict(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        기업들의 ESG 등급 예측 (전체 행을 한 번의 predict_proba 호출로 처리)
+
+        Args:
+            df: env_rating, soc_rating, gov_rating 컬럼 (company_code/company_name/esg_rating 은 선택)
+
+        Returns:
+            식별 컬럼 + predicted_esg_rating, confidence, esg_rating (입력에 없는 컬럼은 None)
+            → 입력 형태와 관계없이 같은 컬럼
+        """
+        method = self.get_method()
+        model = self.get_model()["model"]
+        X = method.encoder.encode_frame(df, FEATURE_COLUMNS)
+
+        result = pd.DataFrame({c: df[c].to_numpy() if c in df.columns else np.full(len(df), None, dtype=object)
+                               for c in self.ID_COLUMNS})
+        if len(X):
+            proba = model.predict_proba(X)
+            best = proba.argmax(axis=1)
+            result["predicted_esg_rating"] = method.encoder.decode(model.classes_[best])
+            result["confidence"] = proba[np.arange(len(best)), best].round(4)
+        else:
+            result["predicted_esg_rating"] = pd.Series(dtype=object)
+            result["confidence"] = pd.Series(dtype=float)
+        result[LABEL_COLUMN] = (df[LABEL_COLUMN].to_numpy() if LABEL_COLUMN in df.columns
+                                else np.full(len(df), None, dtype=object))
+        return result
+
+    def preprogress(self) -> Dict[str, Any]:
+        """등급 인코딩 및 학습 데이터 요약"""
         ic("😊😊 전처리 시작")
+        method = self.get_method()
+        df = method.new_model()
+        X, y = self.get_training_data()
+        summary = {
+            "rows": len(df),
+            "train_rows": len(X),
+            "excluded_no_grade": len(df) - len(X),
+            "features": FEATURE_COLUMNS,
+            "label": LABEL_COLUMN,
+            "encoding": method.encoder.get_info(),
+            "missing_features": {c: int((X[c] < 0).sum()) for c in FEATURE_COLUMNS},
+            "label_distribution": dict(zip(method.encoder.decode(np.arange(len(method.encoder.scale))).tolist(),
+                                           np.bincount(y, minlength=len(method.encoder.scale)).tolist())),
+        }
+        ic(f"학습 대상 {summary['train_rows']}개 기업 (등급없음 {summary['excluded_no_grade']}개 제외)")
         ic("😊😊 전처리 완료")
+        return summary
 
-    def modeling(self):
+    def modeling(self, name: Optional[str] = None, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        사용할 모델과 하이퍼파라미터 설정
+        현재 학습 데이터로 먼저 학습해 보고(모델 캐시에 보관), 성공했을 때만 설정을 바꿈
+        → fit 때만 드러나는 잘못된 조합(예: lbfgs + l1)도 설정 전에 예외로 거절
+        """
         ic("😊😊 모델링 시작")
+        name = name or self.model_name
+        params = params if params is not None else ({} if name != self.model_name else self.model_params)
+        X, y = self.get_training_data()
+        entry = self.models.get_or_train(X, y, self.get_method().fingerprint, name=name, params=params)
+        self.model_name, self.model_params = name, params
+        estimator = entry["model"]
+        ic(f"모델: {estimator}")
         ic("😊😊 모델링 완료")
+        return {"name": name, "params": params, "estimator": str(estimator), "model": entry["meta"]}
 
-    def learning(self):
+    def learning(self, force: bool = False) -> Dict[str, Any]:
+        """현재 설정으로 모델 학습 (같은 데이터/설정의 모델이 캐시에 있으면 재사용)"""
         ic("😊😊 학습 시작")
+        X, y = self.get_training_data()
+        entry = self.models.get_or_train(X, y, self.get_method().fingerprint,
+                                         name=self.model_name, params=self.model_params, force=force)
+        ic(f"학습 완료: {entry['meta']['name']} ({entry['meta']['train_rows']}개, {entry['meta']['train_seconds']}초)")
         ic("😊😊 학습 완료")
+        return entry["meta"]
 
-    def evaluating(self):
+    def evaluating(self, cv: int = 5) -> Dict[str, Any]:
+        """
+        홀드아웃(80/20) 정확도, 한 등급 이내 정확도, 혼동 행렬, Stratified K-Fold 교차 검증
+        (grade.csv 버전/모델 설정/cv 기준으로 결과를 캐시)
+        """
         ic("😊😊 평가 시작")
+        if cv < 2:
+            raise ValueError("cv 는 2 이상이어야 합니다.")
+        X, y = self.get_training_data()
+        method = self.get_method()
+        key = (method.fingerprint, self.model_name, repr(sorted(self.model_params.items())), cv)
+        cached = self._evaluation_cache.get(key)
+        if cached is not None:
+            ic("😊😊 평가 완료 [cached]")
+            return {**cached, "cached": True}
+
+        X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+        model = self.models.build(self.model_name, self.model_params).fit(X_train, y_train)
+        y_pred = model.predict(X_val)
+        labels = np.arange(len(method.encoder.scale))
+        names = method.encoder.decode(labels).tolist()
+        matrix = confusion_matrix(y_val, y_pred, labels=labels)
+
+        folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=42)
+        scores = cross_val_score(self.models.build(self.model_name, self.model_params), X, y, cv=folds)
+
+        result = {
+            "model": self.model_name,
+            "params": self.model_params,
+            "holdout_accuracy": round(float(accuracy_score(y_val, y_pred)), 4),
+            "holdout_within_one_grade": round(float(np.mean(np.abs(y_val.to_numpy() - y_pred) <= 1)), 4),
+            "cv": cv,
+            "cv_accuracy": round(float(scores.mean()), 4),
+            "cv_std": round(float(scores.std()), 4),
+            "confusion_matrix": {"labels": names, "matrix": matrix.tolist()},
+        }
+        self._evaluation_cache = {k: v for k, v in self._evaluation_cache.items() if k[0] == method.fingerprint}
+        self._evaluation_cache[key] = result
+        ic(f"{self.model_name} 검증 정확도: {result['holdout_accuracy']*100:.2f}% "
+           f"(교차 검증 {result['cv_accuracy']*100:.2f}% ±{result['cv_std']*100:.2f})")
         ic("😊😊 평가 완료")
+        return {**result, "cached": False}
 
-    def submit(self):
+    def submit(self) -> Dict[str, Any]:
+        """
+        전체 기업(등급없음 포함)의 ESG 등급 예측 결과를 CSV 로 저장
+        출력: save/esg_predictions.csv
+        """
         ic("😊😊 제출 시작")
-        ic("😊😊 제출 완료")
+        df = self.get_method().new_model()
+        result = self.predict(df)
+        SAVE_DIR.mkdir(parents=True, exist_ok=True)
+        output_path = SAVE_DIR / "esg_predictions.csv"
+        result.to_csv(output_path, index=False, encoding="utf-8-sig")
 
+        graded = result[LABEL_COLUMN].astype(str).str.strip() != NO_GRADE
+        accuracy = float((result.loc[graded, "predicted_esg_rating"] == result.loc[graded, LABEL_COLUMN]).mean()) \
+            if graded.any() else None
+        ic(f"제출 파일 생성 완료: {output_path}")
+        ic("😊😊 제출 완료")
+        return {
+            "output_file": str(output_path),
+            "total_predictions": len(result),
+            "train_accuracy": round(accuracy, 4) if accuracy is not None else None,
+            "model": self.get_model()["meta"],
+            "preview": result.head(10).to_dict(orient="records"),
+        }
@@ -0,0 +1,16 @@
+"""
+Common Module
+여러 라우터가 함께 쓰는 공통 모듈 (실행기, 캐시, 직렬화 등)
+"""
+
+from .executor import get_executor, ExecutorLayer
+from .jobs import get_job_manager, JobManager
+
+__version__ = "1.0.0"
+
+__all__ = [
+    "get_executor",
+    "ExecutorLayer",
+    "get_job_manager",
+    "JobManager",
+]
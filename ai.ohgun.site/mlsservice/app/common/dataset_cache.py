@@ -0,0 +1,258 @@
+"""
+Dataset Cache
+CSV/XLS 원본을 처음 읽을 때 컬럼형 바이너리(Feather)로 변환해 두고,
+이후에는 텍스트 파싱 없이 바로 읽는 공용 데이터셋 캐시
+(Arrow → pandas 변환에서 한 번 복사하므로 zero-copy 는 아님 - 이득은 CSV/XLS 파싱 생략)
+
+- 캐시 키: 원본 경로 + 읽기 옵션(variant)
+- 유효성: 원본 mtime/크기가 같으면 그대로 사용, 달라졌으면 내용 해시(sha1)를 비교하여
+  내용이 같으면(예: git checkout 으로 mtime 만 바뀐 경우) 재변환 없이 재사용
+- pyarrow 가 없으면 pickle 로 대체 (메모리 매핑은 하지 않음)
+- 변환에 실패하는 프레임(혼합 타입 object 컬럼 등)은 캐시하지 않고 원본 로더 결과를 반환
+- 캐시에서 읽은 object 컬럼의 결측값(Arrow null → None)은 원본 로더와 같은 NaN 으로 통일
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+    HAS_PYARROW = True
+except ImportError:
+    feather = None
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+# mlsservice/.cache/datasets
+CACHE_DIR = Path(os.getenv(
+    "MLS_DATASET_CACHE_DIR",
+    str(Path(__file__).resolve().parent.parent.parent / ".cache" / "datasets")
+))
+CACHE_FORMAT_VERSION = 1
+
+PathLike = Union[str, Path]
+
+
+def _sha1(file_path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _dtype_name(dtype) -> str:
+    # str(StringDtype) 는 저장 방식과 관계없이 "string" 이므로 string[python]/string[pyarrow] 로 구분
+    if isinstance(dtype, pd.StringDtype):
+        return f"string[{dtype.storage}]"
+    return str(dtype)
+
+
+class DatasetCache:
+    """
+    원본 파일 → 컬럼형 캐시 파일 변환/조회
+
+    사용 예:
+        df = get_dataset_cache().read(path, lambda p: pd.read_excel(p, header=2), variant="pop-v1")
+    """
+
+    def __init__(self, cache_dir: PathLike = CACHE_DIR, use_arrow: bool = HAS_PYARROW) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.use_arrow = use_arrow and HAS_PYARROW
+        self.suffix = ".feather" if self.use_arrow else ".pkl"
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _paths(self, source: Path, variant: str):
+        key = hashlib.sha1(f"{source.resolve()}|{variant}|{CACHE_FORMAT_VERSION}".encode("utf-8")).hexdigest()[:12]
+        stem = f"{source.stem}-{key}"
+        return key, self.cache_dir / f"{stem}{self.suffix}", self.cache_dir / f"{stem}.json"
+
+    # ------------------------------------------------------------------
+    # 캐시 파일 입출력
+    # ------------------------------------------------------------------
+    def _load(self, data_path: Path) -> pd.DataFrame:
+        if self.use_arrow:
+            # 비압축 Feather 를 메모리 매핑으로 읽음 (파싱 없음, to_pandas 에서 pandas 메모리로 복사)
+            return self._restore_missing(feather.read_table(data_path, memory_map=True).to_pandas())
+        return self._restore_missing(pd.read_pickle(data_path))
+
+    @staticmethod
+    def _restore_missing(df: pd.DataFrame) -> pd.DataFrame:
+        # object 컬럼 결측값은 None 이 아니라 원본 로더(read_csv 등)와 같은 NaN 으로
+        # (astype(str)/해시 결과가 캐시 적중 여부와 관계없이 같도록)
+        for column in df.columns[df.dtypes == object]:
+            values = df[column]
+            missing = values.isna()
+            if missing.any():
+                df[column] = values.where(~missing, np.nan)
+        return df
+
+    def _store(self, df: pd.DataFrame, data_path: Path) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = data_path.with_suffix(data_path.suffix + ".tmp")
+        frame = df if isinstance(df.index, pd.RangeIndex) else df.reset_index(drop=True)
+        if self.use_arrow:
+            feather.write_feather(frame, tmp_path, compression="uncompressed")
+        else:
+            frame.to_pickle(tmp_path)
+        tmp_path.replace(data_path)
+
+    @staticmethod
+    def _restore_dtypes(df: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+        # Arrow → pandas 변환 시 string[pyarrow] 가 기본 string 으로 돌아오므로 원래 저장 방식으로 복원
+        restore = {
+            column: dtype for column, dtype in dtypes.items()
+            if dtype.startswith("string") and column in df.columns and _dtype_name(df[column].dtype) != dtype
+        }
+        return df.astype(restore) if restore else df
+
+    @staticmethod
+    def _read_meta(meta_path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    @staticmethod
+    def _write_meta(meta_path: Path, meta: Dict[str, Any]) -> None:
+        tmp_path = meta_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp_path.replace(meta_path)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def read(self, source: PathLike, reader: Callable[[Path], pd.DataFrame], variant: str = "") -> pd.DataFrame:
+        """
+        캐시가 유효하면 캐시 파일을, 아니면 reader(source) 결과를 캐시에 저장한 뒤 반환
+
+        Args:
+            source: 원본 파일 경로
+            reader: 원본을 데이터프레임으로 읽는 함수 (같은 입력에 항상 같은 결과여야 함)
+            variant: 읽기 옵션을 구분하는 문자열 (옵션이 바뀌면 별도 캐시)
+        """
+        source = Path(source)
+        if not source.exists():
+            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {source}")
+        key, data_path, meta_path = self._paths(source, variant)
+
+        with self._lock_for(key):
+            stat = source.stat()
+            meta = self._read_meta(meta_path) if data_path.exists() else None
+            if meta is not None:
+                same_stat = meta.get("mtime_ns") == stat.st_mtime_ns and meta.get("size") == stat.st_size
+                if not same_stat and meta.get("size") == stat.st_size and meta.get("sha1") == _sha1(source):
+                    # 내용은 같고 mtime 만 바뀐 경우: 메타만 갱신
+                    meta["mtime_ns"] = stat.st_mtime_ns
+                    self._write_meta(meta_path, meta)
+                    same_stat = True
+                if same_stat:
+                    try:
+                        df = self._restore_dtypes(self._load(data_path), meta.get("dtypes", {}))
+                        self.hits += 1
+                        return df
+                    except Exception as e:
+                        logger.warning(f"데이터셋 캐시 읽기 실패, 원본에서 다시 생성합니다: {data_path} ({e})")
+
+            self.misses += 1
+            started = time.perf_counter()
+            df = reader(source)
+            try:
+                self._store(df, data_path)
+                self._write_meta(meta_path, {
+                    "source": str(source),
+                    "variant": variant,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "sha1": _sha1(source),
+                    "rows": int(len(df)),
+                    "columns": [str(c) for c in df.columns],
+                    "dtypes": {str(c): _dtype_name(t) for c, t in df.dtypes.items()},
+                    "format": self.suffix.lstrip("."),
+                    "parse_seconds": round(time.perf_counter() - started, 4),
+                    "created_at": datetime.now().isoformat(timespec="seconds"),
+                })
+            except Exception as e:
+                # 캐시 저장 실패는 조회 결과에 영향을 주지 않음
+                self.errors += 1
+                logger.warning(f"데이터셋 캐시 저장 실패: {source} ({e})")
+            return df
+
+    def read_csv(self, source: PathLike, **kwargs) -> pd.DataFrame:
+        """pd.read_csv(source, **kwargs) 의 캐시 버전"""
+        return self.read(source, lambda p: pd.read_csv(p, **kwargs), variant=f"csv:{sorted(kwargs.items())!r}")
+
+    def read_excel(self, source: PathLike, **kwargs) -> pd.DataFrame:
+        """pd.read_excel(source, **kwargs) 의 캐시 버전"""
+        return self.read(source, lambda p: pd.read_excel(p, **kwargs), variant=f"excel:{sorted(kwargs.items())!r}")
+
+    # ------------------------------------------------------------------
+    # 관리
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        entries = []
+        if self.cache_dir.exists():
+            for meta_path in sorted(self.cache_dir.glob("*.json")):
+                meta = self._read_meta(meta_path)
+                if meta is None:
+                    continue
+                data_path = meta_path.with_suffix(self.suffix)
+                entries.append({
+                    "source": meta.get("source"),
+                    "variant": meta.get("variant"),
+                    "rows": meta.get("rows"),
+                    "format": meta.get("format"),
+                    "parse_seconds": meta.get("parse_seconds"),
+                    "cache_bytes": data_path.stat().st_size if data_path.exists() else None,
+                    "created_at": meta.get("created_at"),
+                })
+        return {
+            "cache_dir": str(self.cache_dir),
+            "format": self.suffix.lstrip("."),
+            "memory_mapped": self.use_arrow,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "entries": entries,
+        }
+
+    def clear(self) -> int:
+        """캐시 파일 전체 삭제 (삭제한 파일 수 반환)"""
+        removed = 0
+        if self.cache_dir.exists():
+            for file_path in self.cache_dir.iterdir():
+                if file_path.is_file():
+                    file_path.unlink(missing_ok=True)
+                    removed += 1
+        return removed
+
+
+_dataset_cache: Optional[DatasetCache] = None
+_dataset_cache_lock = threading.Lock()
+
+
+def get_dataset_cache() -> DatasetCache:
+    """공용 데이터셋 캐시 싱글톤 인스턴스 반환"""
+    global _dataset_cache
+    with _dataset_cache_lock:
+        if _dataset_cache is None:
+            _dataset_cache = DatasetCache()
+        return _dataset_cache
@@ -0,0 +1,257 @@
+"""
+Executor Layer
+블로킹 작업(pandas, sklearn, WordCloud)을 이벤트 루프 밖에서 실행하는 공통 실행기
+
+- 스레드 풀: 파일 읽기/pandas 처리처럼 I/O 비중이 있거나 GIL 을 자주 놓는 작업
+- 프로세스 풀: 모델 학습, 워드클라우드 렌더링처럼 CPU 를 오래 쓰는 작업
+- I/O 풀: 비동기 코드 중간의 짧은 블로킹 I/O(to_thread) 전용 작은 스레드 풀
+  (스레드 풀 작업 안에서 asyncio.run 으로 돌린 코드가 to_thread 를 써도 같은 풀을 기다리며 막히지 않음)
+- 엔드포인트별 동시 실행 제한(세마포어)과 대기열/실행 중 개수 메트릭 제공
+"""
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# 엔드포인트별 동시 실행 상한 (없으면 DEFAULT_ENDPOINT_LIMIT)
+ENDPOINT_LIMITS: Dict[str, int] = {
+    "titanic.preprocess": 2,
+    "titanic.evaluating": 2,
+    "titanic.submit": 4,
+    "titanic.predict": 16,
+    "aifix.model": 2,
+    "aifix.predict": 16,
+    "koica.cube": 1,
+    "seoul.data": 8,
+    "seoul.merge": 1,
+    "nlp.emma": 2,
+    "nlp.corpus": 2,
+    "usa.map": 2,
+}
+DEFAULT_ENDPOINT_LIMIT = int(os.getenv("MLS_DEFAULT_ENDPOINT_LIMIT", "8"))
+
+
+class _EndpointStats:
+    """엔드포인트 하나의 실행 통계"""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queued = 0
+        self.total_seconds = 0.0
+        self.total_wait_seconds = 0.0
+        self.semaphore: Optional[asyncio.Semaphore] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        finished = self.completed + self.failed
+        return {
+            "limit": self.limit,
+            "queued": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "max_queued": self.max_queued,
+            "avg_seconds": round(self.total_seconds / finished, 4) if finished else None,
+            "avg_wait_seconds": round(self.total_wait_seconds / finished, 4) if finished else None,
+        }
+
+
+class ExecutorLayer:
+    """
+    스레드 풀 / 프로세스 풀 공용 실행기
+
+    라우터에서는 `await executor.run_in_thread("seoul.data", fn, ...)` 처럼
+    엔드포인트 이름과 함께 호출하면 해당 엔드포인트의 동시 실행 상한을 넘는 요청은
+    이벤트 루프를 막지 않고 대기열에서 기다립니다.
+    """
+
+    def __init__(self, thread_workers: Optional[int] = None, process_workers: Optional[int] = None) -> None:
+        cpu_count = os.cpu_count() or 1
+        self.thread_workers = thread_workers or int(os.getenv("MLS_THREAD_WORKERS", min(32, cpu_count + 4)))
+        self.process_workers = process_workers or int(os.getenv("MLS_PROCESS_WORKERS", cpu_count))
+        self.io_workers = int(os.getenv("MLS_IO_WORKERS", "4"))
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _EndpointStats] = {}
+        self._process_pending = 0
+
+    # ------------------------------------------------------------------
+    # 풀 관리
+    # ------------------------------------------------------------------
+    @property
+    def thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.thread_workers, thread_name_prefix="mls-worker"
+                )
+            return self._thread_pool
+
+    @property
+    def io_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="mls-io")
+            return self._io_pool
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._process_pool is None:
+                # 멀티스레드 서버 프로세스에서 fork 하지 않도록 spawn 사용
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._process_pool
+
+    def shutdown(self) -> None:
+        """풀 종료 (서버 종료 시 호출)"""
+        with self._lock:
+            thread_pool, self._thread_pool = self._thread_pool, None
+            io_pool, self._io_pool = self._io_pool, None
+            process_pool, self._process_pool = self._process_pool, None
+        for pool in (thread_pool, io_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        if process_pool is not None:
+            process_pool.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # 엔드포인트별 제한
+    # ------------------------------------------------------------------
+    def set_limit(self, endpoint: str, limit: int) -> None:
+        """엔드포인트 동시 실행 상한 변경 (이후 생성되는 세마포어부터 적용)"""
+        ENDPOINT_LIMITS[endpoint] = limit
+        with self._lock:
+            self._stats.pop(endpoint, None)
+
+    def _get_stats(self, endpoint: str) -> _EndpointStats:
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = _EndpointStats(ENDPOINT_LIMITS.get(endpoint, DEFAULT_ENDPOINT_LIMIT))
+                self._stats[endpoint] = stats
+            return stats
+
+    async def _run_limited(self, endpoint: str, submit: Callable[[], "asyncio.Future"]) -> Any:
+        stats = self._get_stats(endpoint)
+        if stats.semaphore is None:
+            stats.semaphore = asyncio.Semaphore(stats.limit)
+
+        queued_at = time.perf_counter()
+        stats.queued += 1
+        stats.max_queued = max(stats.max_queued, stats.queued)
+        try:
+            await stats.semaphore.acquire()
+        finally:
+            stats.queued -= 1
+
+        started = time.perf_counter()
+        stats.total_wait_seconds += started - queued_at
+        stats.running += 1
+        try:
+            result = await submit()
+            stats.completed += 1
+            return result
+        except BaseException:
+            stats.failed += 1
+            raise
+        finally:
+            stats.running -= 1
+            stats.total_seconds += time.perf_counter() - started
+            stats.semaphore.release()
+
+    # ------------------------------------------------------------------
+    # 실행 API
+    # ------------------------------------------------------------------
+    async def run_in_thread(self, endpoint: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        스레드 풀에서 fn 실행 (contextvars 는 호출한 요청의 컨텍스트를 그대로 전달)
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, fn, *args, **kwargs)
+        return await self._run_limited(endpoint, lambda: loop.run_in_executor(self.thread_pool, call))
+
+    async def to_thread(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        엔드포인트 제한 없이 I/O 풀에서 fn 실행
+        비동기 코드 중간의 짧은 블로킹 I/O(CSV 읽기, SQLite 캐시)용 - 어느 이벤트 루프에서든 사용 가능
+        (스레드 풀 작업이 asyncio.run 으로 띄운 루프에서 호출해도 스레드 풀이 아닌 I/O 풀을 기다림)
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self.io_pool, functools.partial(context.run, fn, *args, **kwargs))
+
+    async def run_in_process(self, endpoint: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        프로세스 풀에서 fn 실행 (fn 과 인자는 pickle 가능해야 함 - 모듈 레벨 함수 사용)
+        """
+        async def submit():
+            return await asyncio.wrap_future(self.submit_process(fn, *args, **kwargs))
+        return await self._run_limited(endpoint, submit)
+
+    def submit_process(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        동기 코드(서비스 레이어)에서 프로세스 풀에 작업 제출
+        여러 작업을 동시에 던진 뒤 concurrent.futures 로 모을 때 사용
+        """
+        with self._lock:
+            self._process_pending += 1
+        future = self.process_pool.submit(fn, *args, **kwargs)
+
+        def _done(_):
+            with self._lock:
+                self._process_pending -= 1
+        future.add_done_callback(_done)
+        return future
+
+    def metrics(self) -> Dict[str, Any]:
+        """풀 상태와 엔드포인트별 대기열/실행 메트릭"""
+        with self._lock:
+            endpoints = {name: stats.to_dict() for name, stats in self._stats.items()}
+            process_pending = self._process_pending
+            thread_queue = self._thread_pool._work_queue.qsize() if self._thread_pool else 0
+            io_queue = self._io_pool._work_queue.qsize() if self._io_pool else 0
+        return {
+            "thread_pool": {
+                "max_workers": self.thread_workers,
+                "started": self._thread_pool is not None,
+                "queue_depth": thread_queue,
+            },
+            "io_pool": {
+                "max_workers": self.io_workers,
+                "started": self._io_pool is not None,
+                "queue_depth": io_queue,
+            },
+            "process_pool": {
+                "max_workers": self.process_workers,
+                "started": self._process_pool is not None,
+                "pending": process_pending,
+            },
+            "endpoints": endpoints,
+        }
+
+
+_executor: Optional[ExecutorLayer] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ExecutorLayer:
+    """공용 실행기 싱글톤 인스턴스 반환"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ExecutorLayer()
+        return _executor
@@ -0,0 +1,123 @@
+"""
+Export
+데이터프레임 청크 → NDJSON / CSV 스트리밍 다운로드 응답
+
+- 원본은 데이터프레임 청크 이터레이터 (pd.read_csv(chunksize=...) 또는 iter_frame_chunks)
+  → 한 번에 한 청크만 메모리에 올리므로 테이블 크기와 무관하게 메모리 사용량 일정
+- NDJSON 은 공용 직렬화기(serializer)와 같은 규칙으로 NaN/inf/빈 값 → null
+- CSV 는 첫 청크에서만 헤더 출력
+- 클라이언트가 Accept-Encoding 으로 gzip 을 허용하면(q>0) 청크 단위로 gzip 압축하여 전송
+  (zlib 스트림 압축, 전체 본문을 모으지 않음)
+"""
+import zlib
+from typing import Callable, Iterable, Iterator, Optional, Sequence
+
+import pandas as pd
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from .serializer import NDJSON_MEDIA_TYPE, dumps, frame_to_records
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_CHUNK_ROWS = 5000
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+GZIP_LEVEL = 6
+
+FrameChunks = Iterable[pd.DataFrame]
+
+
+def iter_frame_chunks(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """메모리에 있는 프레임을 chunk_rows 행 단위 뷰로 나눔 (복사 없음)"""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def iter_ndjson_rows(chunks: FrameChunks, blank_as_null: bool = False,
+                     null_tokens: Sequence[str] = ()) -> Iterator[bytes]:
+    """청크마다 NDJSON bytes 한 덩어리"""
+    for chunk in chunks:
+        records = frame_to_records(chunk, blank_as_null, null_tokens)
+        if records:
+            yield b"".join(dumps(record) + b"\n" for record in records)
+
+
+def iter_csv_rows(chunks: FrameChunks, bom: bool = False) -> Iterator[bytes]:
+    """청크마다 CSV bytes 한 덩어리 (헤더는 첫 청크에만)"""
+    header = True
+    if bom:
+        # 엑셀에서 한글이 깨지지 않도록 UTF-8 BOM
+        yield "\ufeff".encode("utf-8")
+    for chunk in chunks:
+        if header or len(chunk):
+            yield chunk.to_csv(index=False, header=header, lineterminator="\n").encode("utf-8")
+            header = False
+
+
+def gzip_stream(body: Iterable[bytes], level: int = GZIP_LEVEL) -> Iterator[bytes]:
+    """bytes 이터레이터를 gzip 스트림으로 압축 (청크마다 flush 하여 바로 전송)"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for part in body:
+        data = compressor.compress(part) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def accepts_gzip(request: Request) -> bool:
+    """
+    Accept-Encoding 협상: gzip 항목(없으면 *)의 q 값이 0 보다 크면 True
+    (gzip;q=0 또는 gzip 항목 없이 *;q=0 이면 거부, 잘못된 q 값은 0 으로 취급)
+    """
+    qualities = {}
+    for item in request.headers.get("accept-encoding", "").split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def export_response(request: Request, chunks: Callable[[], FrameChunks], format: str, filename: str,
+                    compress: bool = True, blank_as_null: bool = False,
+                    null_tokens: Sequence[str] = (), csv_bom: bool = False,
+                    headers: Optional[dict] = None) -> StreamingResponse:
+    """
+    스트리밍 다운로드 응답 생성
+
+    Args:
+        request: gzip 협상용 요청 (Accept-Encoding)
+        chunks: 데이터프레임 청크 이터레이터를 만드는 함수 (스트리밍이 시작될 때 호출)
+        format: ndjson 또는 csv
+        filename: 확장자를 제외한 다운로드 파일 이름
+        compress: False 이면 클라이언트가 gzip 을 받아도 압축하지 않음
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {format} (지원: {', '.join(EXPORT_FORMATS)})")
+
+    def body() -> Iterator[bytes]:
+        # 원본 열기(chunks 호출)도 스트리밍이 시작된 뒤 스레드 풀에서 수행
+        if format == "csv":
+            yield from iter_csv_rows(chunks(), bom=csv_bom)
+        else:
+            yield from iter_ndjson_rows(chunks(), blank_as_null, null_tokens)
+
+    response_headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{format}"',
+        "Vary": "Accept-Encoding",
+        **(headers or {}),
+    }
+    stream = body()
+    if compress and accepts_gzip(request):
+        stream = gzip_stream(stream)
+        response_headers["Content-Encoding"] = "gzip"
+    media_type = CSV_MEDIA_TYPE if format == "csv" else NDJSON_MEDIA_TYPE
+    # 동기 제너레이터는 StreamingResponse 가 스레드 풀에서 순회하므로 이벤트 루프를 막지 않음
+    return StreamingResponse(stream, media_type=media_type, headers=response_headers)
@@ -0,0 +1,120 @@
+"""
+Frame Cache
+프로세스 내 데이터프레임 LRU 캐시
+
+- 키: (원본 경로, 읽기 옵션, mtime, 크기) → 원본 파일이 바뀌면 자동으로 다시 로드
+- 호출자에게는 캐시된 프레임의 복사본(df.copy())을 반환 → 호출자가 숫자/문자열/확장 타입 컬럼을
+  제자리 수정해도 캐시된 원본은 바뀌지 않음 (절약되는 것은 파싱 비용, 복사 비용은 매번 발생)
+- 경로별 적중/미스/파싱 횟수를 기록하여 파일이 변경당 한 번만 파싱되는지 확인 가능
+"""
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import pandas as pd
+
+PathLike = Union[str, Path]
+DEFAULT_MAXSIZE = 16
+
+
+class FrameCache:
+    """경로 + mtime 기준 데이터프레임 LRU 캐시"""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        self._frames: "OrderedDict[Tuple, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._per_source: Dict[str, Dict[str, Any]] = {}
+
+    def _source_stats(self, source: Path) -> Dict[str, Any]:
+        return self._per_source.setdefault(str(source), {
+            "hits": 0, "misses": 0, "parses": 0, "last_mtime_ns": None, "last_load_seconds": None,
+        })
+
+    def get(self, source: PathLike, loader: Callable[[Path], pd.DataFrame], variant: str = "") -> pd.DataFrame:
+        """
+        캐시된 프레임의 복사본 반환 (없거나 원본이 바뀌었으면 loader(source) 로 로드)
+
+        Args:
+            source: 원본 파일 경로
+            loader: 원본을 데이터프레임으로 읽는 함수
+            variant: 같은 파일을 다른 방식으로 읽을 때 구분하는 문자열
+        """
+        source = Path(source)
+        stat = source.stat()
+        key = (str(source.resolve()), variant, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            stats = self._source_stats(source)
+            df = self._frames.get(key)
+            if df is not None:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                stats["hits"] += 1
+                return df.copy()
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # 같은 키를 동시에 요청하면 한 번만 로드
+        with key_lock:
+            with self._lock:
+                df = self._frames.get(key)
+                if df is not None:
+                    self._frames.move_to_end(key)
+                    self.hits += 1
+                    stats["hits"] += 1
+                    return df.copy()
+
+            started = time.perf_counter()
+            df = loader(source)
+            elapsed = time.perf_counter() - started
+
+            with self._lock:
+                self.misses += 1
+                stats["misses"] += 1
+                stats["parses"] += 1
+                stats["last_mtime_ns"] = stat.st_mtime_ns
+                stats["last_load_seconds"] = round(elapsed, 4)
+                # 같은 원본/옵션의 이전 버전(mtime 이 다른 항목)은 즉시 제거
+                for stale in [k for k in self._frames if k[:2] == key[:2]]:
+                    del self._frames[stale]
+                self._frames[key] = df
+                while len(self._frames) > self.maxsize:
+                    self._frames.popitem(last=False)
+                    self.evictions += 1
+                self._key_locks.pop(key, None)
+            return df.copy()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "maxsize": self.maxsize,
+                "size": len(self._frames),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": int(sum(df.memory_usage(deep=False).sum() for df in self._frames.values())),
+                "sources": {source: dict(stats) for source, stats in self._per_source.items()},
+            }
+
+
+_frame_cache: Optional[FrameCache] = None
+_frame_cache_lock = threading.Lock()
+
+
+def get_frame_cache() -> FrameCache:
+    """공용 프레임 캐시 싱글톤 인스턴스 반환"""
+    global _frame_cache
+    with _frame_cache_lock:
+        if _frame_cache is None:
+            _frame_cache = FrameCache()
+        return _frame_cache
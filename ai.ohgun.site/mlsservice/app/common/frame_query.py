@@ -0,0 +1,179 @@
+"""
+Frame Query
+캐시된 데이터프레임에 대한 범용 조회 (컬럼 선택, 조건, 정렬, 페이지네이션)
+
+- 모든 조건/정렬은 pandas 벡터 연산으로 수행 (행 단위 파이썬 루프 없음)
+- 조건 문법: "컬럼:연산자:값" (예: "CCTV_소계:gt:1000", "관서명:in:강남서,서초서")
+  연산자: eq, ne, gt, ge, lt, le, in, contains, startswith, isnull, notnull
+- 정렬 문법: "컬럼" 오름차순, "-컬럼" 내림차순, 쉼표로 여러 개
+- 페이지네이션: limit/offset 또는 이전 응답의 next_cursor
+  (커서에는 데이터 버전이 들어 있어 데이터가 바뀌면 만료)
+"""
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .serializer import to_json_records  # noqa: F401 (기존 import 경로 호환)
+
+OPERATORS = ("eq", "ne", "gt", "ge", "lt", "le", "in", "contains", "startswith", "isnull", "notnull")
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+
+Predicate = Tuple[str, str, Optional[str]]
+
+
+class QueryError(ValueError):
+    """잘못된 조회 조건"""
+
+
+class CursorExpired(QueryError):
+    """커서 발급 이후 데이터 버전이 바뀜"""
+
+
+# ----------------------------------------------------------------------
+# 파싱
+# ----------------------------------------------------------------------
+def parse_predicate(text: str) -> Predicate:
+    """"컬럼:연산자:값" → (컬럼, 연산자, 값)"""
+    parts = text.split(":", 2)
+    if len(parts) < 2:
+        raise QueryError(f"조건 형식이 잘못되었습니다 (컬럼:연산자:값): {text}")
+    column, op = parts[0].strip(), parts[1].strip().lower()
+    if op not in OPERATORS:
+        raise QueryError(f"지원하지 않는 연산자입니다: {op} (지원: {', '.join(OPERATORS)})")
+    value = parts[2] if len(parts) == 3 else None
+    if value is None and op not in ("isnull", "notnull"):
+        raise QueryError(f"조건 값이 없습니다: {text}")
+    return column, op, value
+
+
+def parse_sort(text: Optional[str]) -> List[Tuple[str, bool]]:
+    """"-CCTV_소계,관서명" → [("CCTV_소계", False), ("관서명", True)]"""
+    if not text:
+        return []
+    keys = []
+    for item in text.split(","):
+        item = item.strip()
+        if item:
+            keys.append((item[1:], False) if item.startswith("-") else (item, True))
+    return keys
+
+
+def parse_columns(text: Optional[str]) -> Optional[List[str]]:
+    if not text:
+        return None
+    return [c.strip() for c in text.split(",") if c.strip()]
+
+
+def encode_cursor(offset: int, version: str) -> str:
+    raw = json.dumps({"o": offset, "v": version}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, version: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset = int(data["o"])
+    except Exception:
+        raise QueryError("커서 형식이 잘못되었습니다.")
+    if data.get("v") != version:
+        raise CursorExpired("데이터가 변경되어 커서가 만료되었습니다. 처음부터 다시 조회하세요.")
+    return offset
+
+
+# ----------------------------------------------------------------------
+# 실행
+# ----------------------------------------------------------------------
+def _numeric(series: pd.Series) -> pd.Series:
+    """숫자 비교용 변환 (천 단위 쉼표가 있는 문자열 컬럼 포함)"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    return pd.to_numeric(series.astype("string").str.replace(",", "", regex=False), errors="coerce")
+
+
+def _coerce_value(series: pd.Series, value: str) -> Any:
+    if pd.api.types.is_numeric_dtype(series):
+        try:
+            return float(value)
+        except ValueError:
+            raise QueryError(f"숫자 컬럼 {series.name} 에 숫자가 아닌 값을 비교할 수 없습니다: {value}")
+    return value
+
+
+def _mask(df: pd.DataFrame, column: str, op: str, value: Optional[str]) -> pd.Series:
+    series = df[column]
+    if op == "isnull":
+        return series.isna()
+    if op == "notnull":
+        return series.notna()
+    if op == "in":
+        values = [v.strip() for v in value.split(",")]
+        if pd.api.types.is_numeric_dtype(series):
+            return series.isin([_coerce_value(series, v) for v in values])
+        return series.astype("string").str.strip().isin(values).fillna(False)
+    if op in ("contains", "startswith"):
+        text = series.astype("string")
+        matched = text.str.contains(value, regex=False) if op == "contains" else text.str.startswith(value)
+        return matched.fillna(False).astype(bool)
+    if op in ("gt", "ge", "lt", "le"):
+        numbers = _numeric(series)
+        try:
+            target = float(value)
+        except ValueError:
+            raise QueryError(f"{op} 비교 값은 숫자여야 합니다: {value}")
+        return getattr(numbers, op)(target).fillna(False).astype(bool)
+    # eq / ne
+    if pd.api.types.is_numeric_dtype(series):
+        matched = series.eq(_coerce_value(series, value))
+    else:
+        matched = series.astype("string").str.strip().eq(value.strip()).fillna(False).astype(bool)
+    return ~matched if op == "ne" else matched
+
+
+def run_query(df: pd.DataFrame,
+              columns: Optional[Sequence[str]] = None,
+              where: Sequence[Predicate] = (),
+              sort: Sequence[Tuple[str, bool]] = (),
+              limit: int = DEFAULT_LIMIT,
+              offset: int = 0) -> Tuple[pd.DataFrame, int]:
+    """
+    조건 → 정렬 → 페이지 → 컬럼 선택 순으로 조회
+
+    Returns:
+        (결과 페이지 데이터프레임, 조건에 맞는 전체 행 수)
+    """
+    unknown = [c for c in list(columns or []) + [p[0] for p in where] + [s[0] for s in sort] if c not in df.columns]
+    if unknown:
+        raise QueryError(f"존재하지 않는 컬럼입니다: {', '.join(dict.fromkeys(unknown))}")
+    if limit < 1 or limit > MAX_LIMIT:
+        raise QueryError(f"limit 은 1~{MAX_LIMIT} 사이여야 합니다.")
+    if offset < 0:
+        raise QueryError("offset 은 0 이상이어야 합니다.")
+
+    if where:
+        mask = np.ones(len(df), dtype=bool)
+        for column, op, value in where:
+            mask &= _mask(df, column, op, value).to_numpy(dtype=bool)
+        df = df[mask]
+    total = len(df)
+
+    if sort:
+        # 숫자처럼 보이는 문자열 컬럼("1,395")은 숫자로 정렬
+        sort_keys = {}
+        for i, (column, _) in enumerate(sort):
+            numbers = _numeric(df[column])
+            sort_keys[f"__sort{i}"] = numbers if numbers.notna().any() else df[column]
+        sort_frame = pd.DataFrame(sort_keys, index=df.index)
+        order = sort_frame.sort_values(
+            list(sort_frame.columns), ascending=[asc for _, asc in sort], kind="stable", na_position="last"
+        ).index
+        df = df.loc[order]
+
+    page = df.iloc[offset:offset + limit]
+    if columns:
+        page = page[list(columns)]
+    return page, total
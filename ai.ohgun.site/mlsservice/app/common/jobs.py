@@ -0,0 +1,406 @@
+"""
+Background Jobs
+오래 걸리는 전처리/평가/머지/렌더링 작업을 비동기 잡으로 실행하는 모듈
+
+- 제출 → 잡 ID 반환 → 상태 조회(폴링/SSE) → 결과 조회
+- 프로세스 내부 asyncio 큐와 워커로 실행 (실제 연산은 공용 실행기에서 수행)
+- 잡 상태/결과는 교체 가능한 저장소(메모리, 로컬 JSON 파일)에 보관
+- 같은 종류/파라미터의 잡이 이미 대기/실행 중이면 새로 만들지 않고 기존 잡을 반환
+  (파라미터는 실행 함수의 기본값을 채워 비교하므로 {"cv": null} 과 {} 는 같은 잡)
+- 잡 상태 저장(파일 쓰기)은 이벤트 루프가 아닌 실행기 I/O 풀에서 수행
+"""
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .executor import get_executor
+from .log_capture import capture_logs
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATES = (SUCCEEDED, FAILED)
+
+JOB_DIR = Path(__file__).resolve().parent / "save" / "jobs"
+DEFAULT_JOB_WORKERS = int(os.getenv("MLS_JOB_WORKERS", "2"))
+DEFAULT_MAX_JOBS = int(os.getenv("MLS_MAX_JOBS", "500"))
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="milliseconds")
+
+
+class Job:
+    """잡 하나의 상태"""
+
+    def __init__(self, kind: str, params: Dict[str, Any], dedup_key: str,
+                 job_id: Optional[str] = None) -> None:
+        self.id = job_id or uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.dedup_key = dedup_key
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = _now()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.elapsed_seconds: Optional[float] = None
+        self.logs: List[str] = []
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_seconds": self.elapsed_seconds,
+            "dedup_key": self.dedup_key,
+        }
+        if include_result:
+            data["result"] = self.result
+            data["logs"] = self.logs
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        job = cls(data["kind"], data.get("params") or {}, data.get("dedup_key", ""), job_id=data["job_id"])
+        job.status = data.get("status", QUEUED)
+        job.result = data.get("result")
+        job.error = data.get("error")
+        job.created_at = data.get("created_at") or job.created_at
+        job.started_at = data.get("started_at")
+        job.finished_at = data.get("finished_at")
+        job.elapsed_seconds = data.get("elapsed_seconds")
+        job.logs = data.get("logs") or []
+        return job
+
+
+# ----------------------------------------------------------------------
+# 저장소
+# ----------------------------------------------------------------------
+class MemoryJobStore:
+    """메모리 저장소 (서버 재시작 시 사라짐)"""
+
+    def __init__(self, max_jobs: int = DEFAULT_MAX_JOBS) -> None:
+        self.max_jobs = max_jobs
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+        if job.finished:
+            self.prune()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def prune(self) -> None:
+        """보관 개수를 넘으면 오래된 완료 잡부터 삭제"""
+        jobs = self.list()
+        finished = [job for job in jobs if job.finished]
+        for job in finished[max(0, self.max_jobs - (len(jobs) - len(finished))):]:
+            self.delete(job.id)
+
+
+class FileJobStore(MemoryJobStore):
+    """
+    로컬 JSON 파일 저장소
+    잡마다 {job_id}.json 을 기록하여 재시작 후에도 완료된 잡의 결과를 조회할 수 있음
+    """
+
+    def __init__(self, directory: Path = JOB_DIR, max_jobs: int = DEFAULT_MAX_JOBS) -> None:
+        super().__init__(max_jobs)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        for file_path in self.directory.glob("*.json"):
+            try:
+                job = Job.from_dict(json.loads(file_path.read_text(encoding="utf-8")))
+            except Exception:
+                continue
+            if not job.finished:
+                # 이전 프로세스에서 실행 중이던 잡은 이어서 실행할 수 없음
+                job.status = FAILED
+                job.error = "서버 재시작으로 잡이 중단되었습니다."
+                job.finished_at = _now()
+                self._write(job)
+            self._jobs[job.id] = job
+
+    def _write(self, job: Job) -> None:
+        file_path = self.directory / f"{job.id}.json"
+        tmp_path = file_path.with_suffix(".json.tmp")
+        tmp_path.write_text(
+            json.dumps(job.to_dict(include_result=True), ensure_ascii=False, default=str),
+            encoding="utf-8"
+        )
+        tmp_path.replace(file_path)
+
+    def save(self, job: Job) -> None:
+        self._write(job)
+        super().save(job)
+
+    def delete(self, job_id: str) -> None:
+        super().delete(job_id)
+        (self.directory / f"{job_id}.json").unlink(missing_ok=True)
+
+
+def create_store(kind: Optional[str] = None):
+    """MLS_JOB_STORE 환경변수(memory | file)에 따라 저장소 생성"""
+    kind = (kind or os.getenv("MLS_JOB_STORE", "file")).lower()
+    if kind == "memory":
+        return MemoryJobStore()
+    if kind == "file":
+        return FileJobStore(Path(os.getenv("MLS_JOB_DIR", str(JOB_DIR))))
+    raise ValueError(f"지원하지 않는 잡 저장소입니다: {kind} (memory | file)")
+
+
+# ----------------------------------------------------------------------
+# 잡 매니저
+# ----------------------------------------------------------------------
+class JobManager:
+    """
+    잡 종류 등록, 제출, 실행, 상태 알림을 담당
+
+    도메인 라우터는 모듈 로드 시 `get_job_manager().register("titanic.evaluating", fn)` 처럼
+    실행 함수를 등록합니다. 동기 함수는 공용 실행기 스레드에서, async 함수는 이벤트 루프에서 실행되며,
+    반환값은 JSON 직렬화 가능해야 합니다.
+    """
+
+    def __init__(self, store=None, workers: int = DEFAULT_JOB_WORKERS) -> None:
+        self._store = store
+        self.workers = workers
+        self._kinds: Dict[str, Dict[str, Any]] = {}
+        # 중복 제거 키 → 대기/실행 중인 잡 (저장이 끝나기 전에 들어온 같은 요청도 합치도록 객체로 보관)
+        self._inflight: Dict[str, Job] = {}
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = create_store()
+        return self._store
+
+    # ------------------------------------------------------------------
+    # 등록
+    # ------------------------------------------------------------------
+    def register(self, kind: str, fn: Callable[..., Any], endpoint: Optional[str] = None,
+                 description: str = "") -> None:
+        """
+        잡 종류 등록
+
+        Args:
+            kind: 잡 종류 이름 (예: "titanic.evaluating")
+            fn: 실행 함수 (params 가 키워드 인자로 전달됨)
+            endpoint: 실행기 동시 실행 제한에 사용할 엔드포인트 이름 (기본: kind)
+            description: /jobs/kinds 에 표시할 설명
+        """
+        self._kinds[kind] = {
+            "fn": fn,
+            "endpoint": endpoint or kind,
+            "description": description,
+            "signature": inspect.signature(fn),
+        }
+
+    def kinds(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "kind": kind,
+                "description": info["description"],
+                "params": [name for name in info["signature"].parameters],
+            }
+            for kind, info in sorted(self._kinds.items())
+        ]
+
+    # ------------------------------------------------------------------
+    # 제출 / 조회
+    # ------------------------------------------------------------------
+    def make_key(self, kind: str, params: Dict[str, Any]) -> str:
+        """중복 제거 키 (등록된 실행 함수의 기본값을 채운 파라미터 기준)"""
+        info = self._kinds.get(kind)
+        if info is not None:
+            bound = info["signature"].bind(**params)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+        key = json.dumps({"kind": kind, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._queue is not None:
+            return
+        # 이벤트 루프가 바뀌었으면(테스트 클라이언트 재생성 등) 큐와 워커를 새로 생성
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._changed = {}
+        self._worker_tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def submit(self, kind: str, params: Optional[Dict[str, Any]] = None):
+        """
+        잡 제출
+
+        Returns:
+            (Job, deduplicated) - 같은 잡이 이미 대기/실행 중이면 기존 잡과 True
+
+        Raises:
+            KeyError: 등록되지 않은 잡 종류
+            TypeError: 실행 함수가 받지 않는 파라미터
+        """
+        if kind not in self._kinds:
+            raise KeyError(kind)
+        params = dict(params or {})
+        self._kinds[kind]["signature"].bind(**params)
+
+        self._ensure_workers()
+        dedup_key = self.make_key(kind, params)
+        existing = self._inflight.get(dedup_key)
+        if existing is not None and not existing.finished:
+            return existing, True
+
+        job = Job(kind, params, dedup_key)
+        self._inflight[dedup_key] = job
+        await self._save(job)
+        await self._queue.put(job.id)
+        return job, False
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.store.get(job_id)
+
+    def list(self, kind: Optional[str] = None, status: Optional[str] = None) -> List[Job]:
+        return [
+            job for job in self.store.list()
+            if (kind is None or job.kind == kind) and (status is None or job.status == status)
+        ]
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def wait_for_change(self, job_id: str, timeout: float) -> bool:
+        """잡 상태가 바뀔 때까지 대기 (timeout 이 지나면 False)"""
+        event = self._changed.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _save(self, job: Job) -> None:
+        # FileJobStore 는 파일을 쓰므로 이벤트 루프 밖에서 저장
+        store = self.store
+        await get_executor().to_thread(store.save, job)
+
+    async def _notify(self, job: Job) -> None:
+        await self._save(job)
+        event = self._changed.pop(job.id, None)
+        if event is not None:
+            event.set()
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self.store.get(job_id)
+                if job is not None and job.status == QUEUED:
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        info = self._kinds[job.kind]
+        job.status = RUNNING
+        job.started_at = _now()
+        await self._notify(job)
+
+        started = time.perf_counter()
+        # 잡 실행 중 남긴 로그는 잡 결과와 함께 보관
+        with capture_logs() as job_log:
+            try:
+                fn = info["fn"]
+                if inspect.iscoroutinefunction(fn):
+                    result = await fn(**job.params)
+                else:
+                    result = await get_executor().run_in_thread(info["endpoint"], fn, **job.params)
+                job.result = result
+                job.status = SUCCEEDED
+            except Exception as e:
+                logger.error(f"잡 실행 실패 ({job.kind}, {job.id}): {e}\n{traceback.format_exc()}")
+                job.error = str(e)
+                job.status = FAILED
+            finally:
+                job.logs = job_log.lines()
+                job.elapsed_seconds = round(time.perf_counter() - started, 4)
+                job.finished_at = _now()
+                if self._inflight.get(job.dedup_key) is job:
+                    self._inflight.pop(job.dedup_key, None)
+                await self._notify(job)
+
+    async def shutdown(self) -> None:
+        """워커 태스크 종료 (서버 종료 시 호출)"""
+        for task in self._worker_tasks:
+            task.cancel()
+        self._worker_tasks = []
+        self._queue = None
+        self._loop = None
+
+    def metrics(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self.store.list():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue_depth(),
+            "inflight": len(self._inflight),
+            "by_status": counts,
+        }
+
+
+_job_manager: Optional[JobManager] = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """잡 매니저 싱글톤 인스턴스 반환"""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager()
+        return _job_manager
@@ -0,0 +1,142 @@
+"""
+Jobs Router
+백그라운드 잡 제출/조회 API 라우터
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from .jobs import FAILED, SUCCEEDED, get_job_manager
+
+# APIRouter 생성 (prefix와 tags 설정)
+jobs_router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# SSE 연결 유지용 주기 (초)
+EVENT_KEEPALIVE_SECONDS = 15.0
+
+
+class JobRequest(BaseModel):
+    """잡 제출 요청 모델"""
+    kind: str = Field(..., description="잡 종류 (예: titanic.evaluating, seoul.merge_all, nlp.emma)")
+    params: Dict[str, Any] = Field(default_factory=dict, description="잡 실행 파라미터")
+
+
+def _get_job_or_404(job_id: str):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"잡을 찾을 수 없습니다: {job_id}")
+    return job
+
+
+@jobs_router.post("", status_code=202)
+@jobs_router.post("/", status_code=202, include_in_schema=False)
+async def submit_job(request: JobRequest):
+    """
+    잡 제출
+
+    같은 종류/파라미터의 잡이 이미 대기 또는 실행 중이면 새로 실행하지 않고
+    기존 잡 ID 를 반환합니다 (deduplicated=true).
+    """
+    manager = get_job_manager()
+    try:
+        job, deduplicated = await manager.submit(request.kind, request.params)
+    except KeyError:
+        kinds = ", ".join(k["kind"] for k in manager.kinds())
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 잡 종류입니다: {request.kind} (지원: {kinds})")
+    except TypeError as e:
+        raise HTTPException(status_code=400, detail=f"잘못된 잡 파라미터: {str(e)}")
+    return {
+        "success": True,
+        "deduplicated": deduplicated,
+        "job": job.to_dict(),
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events",
+        "result_url": f"/jobs/{job.id}/result",
+    }
+
+
+@jobs_router.get("")
+@jobs_router.get("/", include_in_schema=False)
+async def list_jobs(
+    kind: Optional[str] = Query(None, description="잡 종류 필터"),
+    status: Optional[str] = Query(None, description="상태 필터 (queued, running, succeeded, failed)"),
+    limit: int = Query(50, ge=1, le=500, description="최대 개수")
+):
+    """잡 목록 조회 (최신순)"""
+    manager = get_job_manager()
+    jobs = manager.list(kind=kind, status=status)[:limit]
+    return {
+        "success": True,
+        "count": len(jobs),
+        "metrics": manager.metrics(),
+        "jobs": [job.to_dict() for job in jobs],
+    }
+
+
+@jobs_router.get("/kinds")
+async def list_job_kinds():
+    """등록된 잡 종류와 파라미터 목록"""
+    return {"success": True, "kinds": get_job_manager().kinds()}
+
+
+@jobs_router.get("/{job_id}")
+async def get_job(job_id: str):
+    """잡 상태 조회 (폴링용)"""
+    return {"success": True, "job": _get_job_or_404(job_id).to_dict()}
+
+
+@jobs_router.get("/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    잡 상태 스트리밍 (Server-Sent Events)
+
+    상태가 바뀔 때마다 `event: status` 를 보내고, 완료/실패 시 `event: done` 후 연결을 닫습니다.
+    """
+    _get_job_or_404(job_id)
+    manager = get_job_manager()
+
+    async def events():
+        last_status = None
+        while True:
+            job = manager.get(job_id)
+            if job is None:
+                break
+            if job.status != last_status:
+                last_status = job.status
+                payload = json.dumps(job.to_dict(), ensure_ascii=False, default=str)
+                yield f"event: status\ndata: {payload}\n\n"
+            if job.finished:
+                yield f"event: done\ndata: {json.dumps({'status': job.status})}\n\n"
+                break
+            changed = await manager.wait_for_change(job_id, EVENT_KEEPALIVE_SECONDS)
+            if not changed:
+                yield ": keepalive\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@jobs_router.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    """
+    잡 결과 조회
+
+    아직 끝나지 않은 잡은 409, 실패한 잡은 500 과 오류 메시지를 반환합니다.
+    """
+    job = _get_job_or_404(job_id)
+    if job.status == SUCCEEDED:
+        return {"success": True, "job": job.to_dict(), "result": job.result, "logs": job.logs}
+    if job.status == FAILED:
+        return JSONResponse(
+            status_code=500,
+            content={"success": False, "job": job.to_dict(), "error": job.error, "logs": job.logs},
+        )
+    raise HTTPException(status_code=409, detail=f"잡이 아직 완료되지 않았습니다 (status={job.status})")
@@ -0,0 +1,176 @@
+"""
+Request Log Capture
+요청 단위 로그 수집기
+
+- sys.stdout/sys.stderr 를 바꾸지 않고 logging 레코드를 contextvar 에 묶인 수집기로 모음
+  (실행기 스레드는 contextvars 를 복사하므로 스레드에서 남긴 로그도 같은 요청에 수집됨)
+- 컨테이너 로그 출력은 QueueHandler → 배치 writer 스레드로 넘겨 여러 줄을 한 번에 write/flush
+- 서비스 모듈의 print()/ic() 는 make_print()/make_ic() 로 logging 에 연결
+"""
+import atexit
+import contextvars
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+BATCH_MAX_RECORDS = 256
+BATCH_MAX_DELAY = 0.2  # 초
+
+
+class RequestLog:
+    """요청 하나에서 발생한 구조화된 로그 이벤트 목록"""
+
+    def __init__(self) -> None:
+        self.events: List[Dict[str, Any]] = []
+
+    def add(self, record: logging.LogRecord) -> None:
+        self.events.append({
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        })
+
+    def lines(self) -> List[str]:
+        """메시지를 줄 단위로 펼친 목록 (빈 줄 제외, 기존 응답의 logs 형식)"""
+        return [
+            line
+            for event in self.events
+            for line in event["message"].split("\n")
+            if line.strip()
+        ]
+
+
+_current_log: contextvars.ContextVar[Optional[RequestLog]] = contextvars.ContextVar(
+    "mls_request_log", default=None
+)
+
+
+@contextmanager
+def capture_logs() -> Iterator[RequestLog]:
+    """
+    with 블록(과 그 안에서 실행기에 넘긴 작업)에서 남긴 로그만 수집
+
+    사용 예:
+        with capture_logs() as request_log:
+            await get_executor().run_in_thread("titanic.preprocess", service.preprogress)
+        return {"logs": request_log.lines()}
+    """
+    request_log = RequestLog()
+    token = _current_log.set(request_log)
+    try:
+        yield request_log
+    finally:
+        _current_log.reset(token)
+
+
+class ContextLogHandler(logging.Handler):
+    """현재 컨텍스트에 수집기가 있을 때만 레코드를 추가하는 핸들러"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        request_log = _current_log.get()
+        if request_log is not None:
+            try:
+                request_log.add(record)
+            except Exception:
+                self.handleError(record)
+
+
+class BatchLogWriter(threading.Thread):
+    """
+    QueueHandler 가 넣은 레코드를 모아 스트림에 한 번에 쓰는 writer 스레드
+    (레코드마다 write/flush 시스템 콜을 하지 않도록 최대 BATCH_MAX_RECORDS 개 또는
+    BATCH_MAX_DELAY 초 단위로 묶어서 출력)
+    """
+
+    def __init__(self, log_queue: queue.Queue, stream=None, formatter: Optional[logging.Formatter] = None) -> None:
+        super().__init__(name="mls-log-writer", daemon=True)
+        self.queue = log_queue
+        self.stream = stream or sys.stdout
+        self.formatter = formatter or logging.Formatter(LOG_FORMAT)
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not (self._stopped.is_set() and self.queue.empty()):
+            try:
+                record = self.queue.get(timeout=BATCH_MAX_DELAY)
+            except queue.Empty:
+                continue
+            batch = [record]
+            deadline = time.monotonic() + BATCH_MAX_DELAY
+            while len(batch) < BATCH_MAX_RECORDS and time.monotonic() < deadline:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    if self._stopped.is_set():
+                        break
+                    time.sleep(0.01)
+            self._write(batch)
+
+    def _write(self, batch: List[logging.LogRecord]) -> None:
+        try:
+            self.stream.write("".join(self.formatter.format(r) + "\n" for r in batch))
+            self.stream.flush()
+        except Exception:
+            pass  # 로그 출력 실패가 요청 처리에 영향을 주지 않도록 함
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join(timeout=2)
+
+
+_setup_lock = threading.Lock()
+_writer: Optional[BatchLogWriter] = None
+
+
+def setup_logging(level: int = logging.INFO, stream=None) -> None:
+    """
+    루트 로거를 요청 수집 핸들러 + 배치 출력 핸들러로 구성 (여러 번 호출해도 한 번만 적용)
+
+    basicConfig 로 붙은 기존 StreamHandler 는 제거하여 같은 로그가 두 번 출력되지 않도록 합니다.
+    """
+    global _writer
+    with _setup_lock:
+        if _writer is not None:
+            return
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if type(handler) is logging.StreamHandler:
+                root.removeHandler(handler)
+
+        log_queue: queue.Queue = queue.Queue(-1)
+        _writer = BatchLogWriter(log_queue, stream=stream)
+        _writer.start()
+        atexit.register(_writer.stop)
+
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        root.addHandler(ContextLogHandler())
+        root.setLevel(level)
+
+
+# ----------------------------------------------------------------------
+# 서비스 모듈의 print()/ic() 대체
+# ----------------------------------------------------------------------
+def make_print(logger: logging.Logger) -> Callable[..., None]:
+    """
+    print() 와 같은 시그니처로 logger 에 기록하는 함수 생성
+    (file=sys.stderr 로 출력하던 메시지는 WARNING 레벨)
+    """
+    def log_print(*args, sep: str = " ", end: str = "\n", file=None, flush: bool = False) -> None:
+        message = sep.join(str(arg) for arg in args)
+        level = logging.WARNING if file is sys.stderr else logging.INFO
+        logger.log(level, message)
+
+    return log_print
+
+
+def make_ic(logger: logging.Logger):
+    """icecream ic() 출력을 색상 코드 없이 logger 로 보내는 디버거 생성"""
+    from icecream import IceCreamDebugger
+    return IceCreamDebugger(outputFunction=logger.info)
@@ -0,0 +1,191 @@
+"""
+Serializer
+데이터프레임 → JSON / NDJSON / Arrow IPC 공용 직렬화기
+
+- 컬럼 단위 마스킹: NaN/inf/None(옵션: 빈 문자열, '#REF!' 같은 토큰)을 None 으로 바꿈
+  (셀마다 파이썬 루프를 돌지 않고 컬럼별 numpy 마스크 + tolist() 로 처리)
+- JSON 인코딩은 orjson 사용 (없으면 표준 json 으로 대체)
+- NDJSON 은 청크 단위 바이트 제너레이터로 제공 (StreamingResponse 용)
+- Arrow IPC 스트림 출력 (pyarrow 필요)
+"""
+import json
+import math
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+try:
+    import pyarrow as pa
+    HAS_PYARROW = True
+except ImportError:
+    pa = None
+    HAS_PYARROW = False
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+FORMATS = ("json", "ndjson", "arrow")
+NDJSON_CHUNK_ROWS = 10_000
+
+
+# ----------------------------------------------------------------------
+# 인코딩
+# ----------------------------------------------------------------------
+def _default(obj: Any) -> Any:
+    """orjson/json 이 기본으로 처리하지 못하는 값 변환"""
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        return None if isinstance(value, float) and not math.isfinite(value) else value
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (datetime, date, pd.Timestamp)):
+        return obj.isoformat()
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    return str(obj)
+
+
+if HAS_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """JSON bytes 로 인코딩 (NaN/inf 는 null)"""
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+else:
+    def _finite(obj: Any) -> Any:
+        if isinstance(obj, float) and not math.isfinite(obj):
+            return None
+        if isinstance(obj, dict):
+            return {k: _finite(v) for k, v in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [_finite(v) for v in obj]
+        return obj
+
+    def dumps(obj: Any) -> bytes:
+        """JSON bytes 로 인코딩 (NaN/inf 는 null)"""
+        try:
+            text = json.dumps(obj, ensure_ascii=False, allow_nan=False, default=_default, separators=(",", ":"))
+        except ValueError:
+            text = json.dumps(_finite(obj), ensure_ascii=False, default=_default, separators=(",", ":"))
+        return text.encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 으로 렌더링하는 JSONResponse (앱 기본 응답 클래스)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# ----------------------------------------------------------------------
+# 컬럼 단위 정리
+# ----------------------------------------------------------------------
+def _null_mask(series: pd.Series, blank_as_null: bool, null_tokens: Sequence[str]) -> np.ndarray:
+    mask = series.isna().to_numpy(dtype=bool)
+    if (blank_as_null or null_tokens) and (series.dtype == object or isinstance(series.dtype, pd.StringDtype)):
+        text = series.astype("string").str.strip()
+        if blank_as_null:
+            mask |= text.eq("").fillna(False).to_numpy(dtype=bool)
+        if null_tokens:
+            mask |= text.isin(list(null_tokens)).fillna(False).to_numpy(dtype=bool)
+    return mask
+
+
+def column_values(series: pd.Series, blank_as_null: bool = False,
+                  null_tokens: Sequence[str] = ()) -> List[Any]:
+    """
+    컬럼을 JSON 직렬화 가능한 파이썬 값 목록으로 변환 (결측/inf/지정 토큰은 None)
+    """
+    dtype = series.dtype
+    if pd.api.types.is_float_dtype(dtype) and not isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        values_array = series.to_numpy()
+        mask = ~np.isfinite(values_array)
+    elif (pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)) \
+            and not isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        return series.tolist()
+    else:
+        values_array = series.to_numpy(dtype=object)
+        mask = _null_mask(series, blank_as_null, null_tokens)
+        if pd.api.types.is_float_dtype(dtype):  # Float32/Float64 nullable
+            numbers = series.to_numpy(dtype="float64", na_value=np.nan)
+            mask |= ~np.isfinite(numbers)
+    values = values_array.tolist()
+    for index in np.flatnonzero(mask):
+        values[index] = None
+    return values
+
+
+def frame_to_records(df: pd.DataFrame, blank_as_null: bool = False,
+                     null_tokens: Sequence[str] = ()) -> List[Dict[str, Any]]:
+    """
+    데이터프레임 → 레코드(dict) 목록 (NaN/inf → None)
+
+    Args:
+        df: 원본 데이터프레임
+        blank_as_null: True 이면 공백뿐인 문자열도 None
+        null_tokens: None 으로 바꿀 문자열 값 (예: ['#REF!'])
+    """
+    names = [str(c) for c in df.columns]
+    columns = [column_values(df.iloc[:, i], blank_as_null, null_tokens) for i in range(df.shape[1])]
+    return [dict(zip(names, row)) for row in zip(*columns)] if columns else [{} for _ in range(len(df))]
+
+
+# 기존 호출부 호환 이름
+to_json_records = frame_to_records
+
+
+def frame_to_json(df: pd.DataFrame, blank_as_null: bool = False, null_tokens: Sequence[str] = ()) -> bytes:
+    """데이터프레임 → JSON 배열 bytes"""
+    return dumps(frame_to_records(df, blank_as_null, null_tokens))
+
+
+def iter_ndjson(df: pd.DataFrame, chunk_rows: int = NDJSON_CHUNK_ROWS, blank_as_null: bool = False,
+                null_tokens: Sequence[str] = ()) -> Iterator[bytes]:
+    """데이터프레임 → NDJSON 청크 bytes 제너레이터 (청크마다 chunk_rows 행)"""
+    for start in range(0, len(df), chunk_rows):
+        records = frame_to_records(df.iloc[start:start + chunk_rows], blank_as_null, null_tokens)
+        yield b"".join(dumps(record) + b"\n" for record in records)
+
+
+def frame_to_ndjson(df: pd.DataFrame, blank_as_null: bool = False, null_tokens: Sequence[str] = ()) -> bytes:
+    """데이터프레임 → NDJSON bytes"""
+    return b"".join(iter_ndjson(df, blank_as_null=blank_as_null, null_tokens=null_tokens))
+
+
+def frame_to_arrow(df: pd.DataFrame) -> bytes:
+    """데이터프레임 → Arrow IPC 스트림 bytes (dtype 보존, pyarrow 필요)"""
+    if not HAS_PYARROW:
+        raise ImportError("Arrow 출력에는 pyarrow 가 필요합니다.")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def frame_response(df: pd.DataFrame, format: str = "json", envelope: Optional[Dict[str, Any]] = None,
+                   blank_as_null: bool = False, null_tokens: Sequence[str] = ()) -> Response:
+    """
+    요청 형식에 맞는 응답 생성
+
+    - json: {**envelope, "count": n, "data": [...]} (기존 응답 형식)
+    - ndjson: 한 줄에 한 레코드
+    - arrow: Arrow IPC 스트림
+    """
+    if format == "ndjson":
+        return Response(frame_to_ndjson(df, blank_as_null, null_tokens), media_type=NDJSON_MEDIA_TYPE)
+    if format == "arrow":
+        return Response(frame_to_arrow(df), media_type=ARROW_MEDIA_TYPE)
+    if format != "json":
+        raise ValueError(f"지원하지 않는 형식입니다: {format} (지원: {', '.join(FORMATS)})")
+    records = frame_to_records(df, blank_as_null, null_tokens)
+    return FastJSONResponse({**(envelope or {}), "count": len(records), "data": records})
@@ -1,20 +1,185 @@
+"""
+KOICA Method
+사업 표 → 집계 큐브 (국가 × 분야 × 기관 × 연도)
 
+- 사실 테이블: 사업 × 대상 국가 × 진행 연도 (시작연도~종료연도) 한 행
+- 큐브: 차원 조합(2^4 = 16개)마다 셀별 사업 수(중복 없이)와 예산 합계를 미리 집계
+  → 대시보드 롤업은 groupby 없이 조회만으로 응답
+- 셀 값은 사업별 기여분의 합이므로, 원본 CSV 가 바뀌면 바뀐 사업의 기여분만 빼고 더해서 갱신
+  (사업 식별자 = 원본 컬럼 값 해시 → 내용이 바뀐 사업은 삭제 + 추가로 처리)
+"""
+from itertools import combinations
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
-class KoicaMethod(object): 
+import numpy as np
+import pandas as pd
 
-    def __init__(self):
-        #데이터셋 객체 생성
-        pass
+from .koica_table import BUDGET_COLUMN, SOURCE_COLUMNS, KoicaTable, explode_countries, get_koica_table
 
-    def new_model(self):
-        #koicainternational.csv 파일을 읽어와서 데이터프레임 작성
-        pass
+# 큐브 차원 (API 이름 → 사실 테이블 컬럼)
+CUBE_DIMENSIONS = {
+    "country": "국가",
+    "sector": "분야",
+    "organization": "기관",
+    "year": "연도",
+}
+MEASURES = ["projects", "budget"]
 
-    def create_train(self):
-        #레이블 값을 제거한 데이터프레임 작성
-        pass
+Grouping = FrozenSet[str]
 
-    def create_label(self):
-        #레이블 값을 거치는 답안지 데이터프레임 작성
-        pass
 
+def all_groupings(dimensions: Iterable[str] = CUBE_DIMENSIONS) -> List[Grouping]:
+    """모든 차원 조합 (빈 조합 = 전체 합계 포함)"""
+    dims = list(dimensions)
+    return [frozenset(c) for size in range(len(dims) + 1) for c in combinations(dims, size)]
+
+
+class KoicaCube:
+    """차원 조합별 미리 집계한 셀 (사업 수, 예산 합계)"""
+
+    def __init__(self, cells: Dict[Grouping, pd.DataFrame], version: str, projects: int) -> None:
+        self.cells = cells
+        self.version = version
+        self.projects = projects
+
+    @staticmethod
+    def _ordered(dims: Iterable[str]) -> List[str]:
+        return [d for d in CUBE_DIMENSIONS if d in set(dims)]
+
+    def rollup(self, by: Iterable[str] = (), filters: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        by 차원별 사업 수/예산 합계 (filters 차원 값으로 제한)
+
+        by ∪ filters 차원 조합의 미리 집계한 셀에서 조건에 맞는 행만 조회합니다.
+        """
+        filters = {k: v for k, v in (filters or {}).items() if v is not None}
+        unknown = [d for d in list(by) + list(filters) if d not in CUBE_DIMENSIONS]
+        if unknown:
+            raise KeyError(f"지원하지 않는 차원입니다: {', '.join(unknown)} (지원: {', '.join(CUBE_DIMENSIONS)})")
+        by = self._ordered(by)
+        cells = self.cells[frozenset(by) | frozenset(filters)]
+        if filters:
+            mask = np.ones(len(cells), dtype=bool)
+            for dim, value in filters.items():
+                column = cells[CUBE_DIMENSIONS[dim]]
+                value = int(value) if dim == "year" else str(value)
+                mask &= (column == value).to_numpy(dtype=bool)
+            cells = cells[mask]
+        columns = [CUBE_DIMENSIONS[d] for d in by]
+        result = cells[columns + MEASURES]
+        if not by and result.empty:
+            result = pd.DataFrame({"projects": [0], "budget": [0.0]})
+        return result.sort_values(["budget"] + columns, ascending=[False] + [True] * len(columns),
+                                  kind="stable").reset_index(drop=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "projects": self.projects,
+            "groupings": len(self.cells),
+            "cells": int(sum(len(c) for c in self.cells.values())),
+        }
+
+
+class KoicaMethod(object):
+
+    def __init__(self, table: Optional[KoicaTable] = None):
+        # 타입 지정된 사업 표 (koicainternational.csv 를 한 번만 파싱)
+        self.table = table or get_koica_table()
+
+    def new_model(self) -> pd.DataFrame:
+        # koicainternational.csv 를 읽은 데이터프레임 (타입 지정, 연번 순, 표가 보관한 프레임의 복사본)
+        return self.table.frame.copy()
+
+    @staticmethod
+    def project_ids(df: pd.DataFrame) -> np.ndarray:
+        """
+        원본 컬럼 값 해시 (내용이 같은 사업은 같은 식별자)
+        결측값은 NaN/None/pd.NA 중 무엇이든 빈 문자열로 통일
+        (새로 파싱한 표는 NaN, 데이터셋 캐시(Feather)에서 읽은 표는 None)
+        """
+        source = df[SOURCE_COLUMNS]
+        normalized = source.astype(object).where(source.notna(), "").astype(str)
+        return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+    def create_facts(self, df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        사실 테이블: 사업 × 대상 국가 × 진행 연도
+        (컬럼: project, 국가, 분야, 기관, 연도, budget)
+        """
+        df = self.new_model() if df is None else df
+        ids = self.project_ids(df)
+        countries = explode_countries(df)
+        start = df["시작연도"].to_numpy(dtype="float64", na_value=np.nan)
+        end = df["종료연도"].to_numpy(dtype="float64", na_value=np.nan)
+        years = [list(range(int(s), int(e) + 1)) if not (np.isnan(s) or np.isnan(e)) else []
+                 for s, e in zip(start, end)]
+
+        rows = countries["row"].to_numpy()
+        facts = pd.DataFrame({
+            "row": rows,
+            "project": ids[rows],
+            "국가": countries["국가"].astype(str).to_numpy(),
+            "분야": df["분야"].astype(str).to_numpy()[rows],
+            "기관": df["기관"].astype(str).to_numpy()[rows],
+            "budget": df[BUDGET_COLUMN].to_numpy(dtype="float64")[rows],
+        })
+        facts["연도"] = [years[r] for r in rows]
+        facts = facts.explode("연도").dropna(subset=["연도"])
+        facts["연도"] = facts["연도"].astype("int64")
+        return facts.drop(columns="row").reset_index(drop=True)
+
+    @staticmethod
+    def aggregate(facts: pd.DataFrame) -> Dict[Grouping, pd.DataFrame]:
+        """
+        차원 조합마다 셀별 (사업 수, 예산 합계)
+        한 셀에서 같은 사업은 한 번만 셈 (여러 연도/국가로 펼쳐진 행 중복 제거)
+        """
+        cells: Dict[Grouping, pd.DataFrame] = {}
+        for grouping in all_groupings():
+            columns = [CUBE_DIMENSIONS[d] for d in KoicaCube._ordered(grouping)]
+            distinct = facts.drop_duplicates(["project"] + columns)
+            if columns:
+                grouped = distinct.groupby(columns, sort=True).agg(projects=("project", "size"), budget=("budget", "sum"))
+                cells[grouping] = grouped.reset_index()
+            else:
+                cells[grouping] = pd.DataFrame({"projects": [len(distinct)], "budget": [float(distinct["budget"].sum())]})
+        return cells
+
+    def build_cube(self) -> KoicaCube:
+        """현재 사업 표로 큐브 전체 생성"""
+        return KoicaCube(self.aggregate(self.create_facts()), self.table.version, len(self.table))
+
+    def update_cube(self, cube: KoicaCube, previous: KoicaTable) -> Tuple[KoicaCube, Dict[str, int]]:
+        """
+        이전 표로 만든 큐브를 현재 표 기준으로 갱신 (바뀐 사업의 기여분만 빼고 더함)
+
+        Returns:
+            (갱신된 큐브, {"added": n, "removed": n, "unchanged": n})
+        """
+        old_ids = self.project_ids(previous.frame)
+        new_ids = self.project_ids(self.table.frame)
+        removed = ~np.isin(old_ids, new_ids)
+        added = ~np.isin(new_ids, old_ids)
+        delta = {"added": int(added.sum()), "removed": int(removed.sum()), "unchanged": int((~added).sum())}
+
+        cells = dict(cube.cells)
+        for frame, sign in ((previous.frame[removed], -1), (self.table.frame[added], 1)):
+            if frame.empty:
+                continue
+            for grouping, part in self.aggregate(self.create_facts(frame.reset_index(drop=True))).items():
+                cells[grouping] = self._apply(cells[grouping], part, grouping, sign)
+        return KoicaCube(cells, self.table.version, len(self.table)), delta
+
+    @staticmethod
+    def _apply(cells: pd.DataFrame, part: pd.DataFrame, grouping: Grouping, sign: int) -> pd.DataFrame:
+        """셀에 기여분을 더하거나(sign=1) 빼고(sign=-1) 사업 수가 0 인 셀 제거"""
+        columns = [CUBE_DIMENSIONS[d] for d in KoicaCube._ordered(grouping)]
+        if not columns:
+            return (cells[MEASURES] + sign * part[MEASURES]).reset_index(drop=True)
+        base = cells.set_index(columns)[MEASURES]
+        change = part.set_index(columns)[MEASURES] * sign
+        merged = base.add(change, fill_value=0)
+        merged = merged[merged["projects"] > 0]
+        merged["projects"] = merged["projects"].round().astype("int64")
+        return merged.sort_index().reset_index()
@@ -3,12 +3,16 @@ KOICA Router
 KOICA 국제기구사업 데이터 관련 API 라우터
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional, Dict, Any
 import pandas as pd
 import os
 from pathlib import Path
+from app.common.executor import get_executor
+from app.common.serializer import frame_response
+from .koica_method import CUBE_DIMENSIONS, KoicaCube
 from .koica_service import KoicaService
+from .koica_table import DIMENSIONS, KoicaTable, get_koica_table, peek_koica_table
 
 # APIRouter 생성 (prefix와 tags 설정)
 koica_router = APIRouter(prefix="/koica", tags=["koica"])
@@ -24,6 +28,23 @@ def get_service() -> KoicaService:
     return _service_instance
 
 
+async def _koica_table() -> KoicaTable:
+    """최신 사업 표 (이미 있으면 바로 반환, 없거나 파일이 바뀌었으면 실행기에서 파싱)"""
+    table = peek_koica_table()
+    if table is None:
+        table = await get_executor().run_in_thread("koica.data", get_koica_table)
+    return table
+
+
+async def _koica_cube() -> KoicaCube:
+    """최신 집계 큐브 (최신이면 바로 반환, 없거나 CSV 가 바뀌었으면 실행기에서 생성/증분 갱신)"""
+    service = get_service()
+    cube = service.peek_cube()
+    if cube is None:
+        cube = await get_executor().run_in_thread("koica.cube", service.get_cube)
+    return cube
+
+
 @koica_router.get("/")
 async def koica_root():
     """KOICA 서비스 상태 확인"""
@@ -37,65 +58,87 @@ async def koica_root():
 
 @koica_router.post("/preprocess")
 async def preprocess():
-    """데이터 전처리 실행"""
+    """데이터 전처리 실행 (사업 표 파싱 결과 요약)"""
     service = get_service()
-    service.preprogress()
+    try:
+        result = await get_executor().run_in_thread("koica.data", service.preprogress)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     return {
         "message": "전처리 완료",
-        "status": "success"
+        "status": "success",
+        "result": result
     }
 
 
 @koica_router.post("/modeling")
 async def modeling():
-    """모델링 실행"""
+    """모델링 실행 (집계 큐브 생성, CSV 가 바뀌었으면 증분 갱신)"""
     service = get_service()
-    service.modeling()
+    try:
+        result = await get_executor().run_in_thread("koica.cube", service.modeling)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     return {
         "message": "모델링 완료",
-        "status": "success"
+        "status": "success",
+        "result": result
     }
 
 
 @koica_router.post("/learning")
 async def learning():
-    """학습 실행"""
+    """학습 실행 (집계 큐브 전체 재생성)"""
     service = get_service()
-    service.learning()
+    try:
+        result = await get_executor().run_in_thread("koica.cube", service.learning)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     return {
         "message": "학습 완료",
-        "status": "success"
+        "status": "success",
+        "result": result
     }
 
 
 @koica_router.post("/evaluating")
 async def evaluating():
-    """평가 실행"""
+    """평가 실행 (큐브 셀과 직접 집계 결과 비교)"""
     service = get_service()
-    service.evaluating()
+    try:
+        result = await get_executor().run_in_thread("koica.cube", service.evaluating)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     return {
         "message": "평가 완료",
-        "status": "success"
+        "status": "success",
+        "result": result
     }
 
 
 @koica_router.post("/submit")
 async def submit():
-    """제출 실행"""
+    """제출 실행 (가장 세분화된 큐브 셀을 save/koica_cube.csv 로 저장)"""
     service = get_service()
-    service.submit()
+    try:
+        result = await get_executor().run_in_thread("koica.cube", service.submit)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     return {
         "message": "제출 완료",
-        "status": "success"
+        "status": "success",
+        "result": result
     }
 
 
 @koica_router.get("/projects/top10")
-async def get_top_10_projects():
+async def get_top_10_projects(
+    format: str = Query("json", pattern="^(json|ndjson|arrow)$", description="응답 형식 (json, ndjson, arrow)")
+):
     """
     koicainternational.csv 파일에서 상위 10개 사업 목록을 조회합니다.
     
-    연번 기준으로 정렬하여 상위 10개를 반환합니다.
+    연번 기준 상위 10개를 반환합니다 (파싱/정렬은 파일이 바뀔 때만 수행).
     
     Returns:
         {
@@ -105,69 +148,20 @@ async def get_top_10_projects():
         }
     """
     try:
-        # CSV 파일 경로 설정
-        current_dir = Path(__file__).parent
-        csv_path = current_dir / "koicainternational.csv"
-        
-        # 파일 존재 확인
-        if not csv_path.exists():
-            raise HTTPException(
-                status_code=404, 
-                detail=f"koicainternational.csv 파일을 찾을 수 없습니다: {csv_path}"
-            )
-        
-        # CSV 파일 읽기 (UTF-8 BOM 인코딩 지원, 첫 3줄 스킵)
-        # 4번째 줄이 헤더, 5번째 줄부터 데이터
-        df = pd.read_csv(csv_path, encoding='utf-8-sig', skiprows=3)
-        
-        # 첫 번째 빈 컬럼 제거 (Unnamed: 0 같은 컬럼)
-        df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
-        
-        # 빈 컬럼 및 행 제거
-        df = df.dropna(axis=1, how='all')  # 모든 값이 NaN인 컬럼 제거
-        df = df.dropna(axis=0, how='all')  # 모든 값이 NaN인 행 제거
-        
-        # 연번 컬럼이 있는지 확인하고 정렬
-        if '연번' in df.columns:
-            # 연번을 숫자로 변환 (NaN이 아닌 경우만)
-            df['연번'] = pd.to_numeric(df['연번'], errors='coerce')
-            # 연번 기준으로 오름차순 정렬 (작은 번호가 먼저)
-            df = df.sort_values('연번', ascending=True, na_position='last')
-        
-        # 상위 10개 선택
-        top_10 = df.head(10)
+        # 한 번 파싱해 둔 타입 지정 표 사용 (파일이 바뀔 때만 다시 파싱, 연번 순 정렬 완료)
+        table = await _koica_table()
         
-        # NaN, inf 값을 None으로 변환하여 JSON 직렬화 가능하게 함
-        top_10 = top_10.replace([float('inf'), float('-inf')], None)
-        top_10 = top_10.where(pd.notna(top_10), None)
+        # 상위 10개 선택 (원본 컬럼)
+        top_10 = table.top(10)
         
-        # DataFrame을 딕셔너리 리스트로 변환
-        projects_list = top_10.to_dict(orient='records')
-        
-        # 딕셔너리 내부의 모든 값도 확인하여 inf, nan, 빈 문자열 처리
-        for project in projects_list:
-            for key, value in project.items():
-                # NaN, inf 값 처리
-                if pd.isna(value) or (isinstance(value, float) and (value == float('inf') or value == float('-inf'))):
-                    project[key] = None
-                # 빈 문자열 처리
-                elif isinstance(value, str) and value.strip() == '':
-                    project[key] = None
-                # #REF! 같은 특수 값 처리
-                elif isinstance(value, str) and value.strip() == '#REF!':
-                    project[key] = None
-        
-        if len(projects_list) == 0:
+        if len(top_10) == 0:
             raise HTTPException(
                 status_code=400,
                 detail="CSV 파일에 데이터가 없습니다."
             )
         
-        return {
-            "success": True,
-            "count": len(projects_list),
-            "data": projects_list
-        }
+        # NaN/inf/빈 문자열/#REF! 를 컬럼 단위로 None 처리하여 요청 형식(json/ndjson/arrow)으로 직렬화
+        return frame_response(top_10, format, {"success": True}, blank_as_null=True, null_tokens=("#REF!",))
         
     except HTTPException:
         # HTTPException은 그대로 전달
@@ -186,3 +180,125 @@ async def get_top_10_projects():
         )
 
 
+@koica_router.get("/projects")
+async def query_projects(
+    country: Optional[str] = Query(None, description="대상 국가 (다국가 사업의 대상 국가 포함)"),
+    sector: Optional[str] = Query(None, description="분야 (사업명 키워드 기반)"),
+    organization: Optional[str] = Query(None, description="기관 약칭 (예: UNDP) 또는 수행기관명"),
+    year: Optional[int] = Query(None, description="해당 연도에 진행 중인 사업"),
+    min_budget: Optional[float] = Query(None, ge=0, description="최소 예산 (USD)"),
+    max_budget: Optional[float] = Query(None, ge=0, description="최대 예산 (USD)"),
+    limit: int = Query(50, ge=1, le=1000, description="페이지 크기"),
+    offset: int = Query(0, ge=0, description="시작 위치"),
+    format: str = Query("json", pattern="^(json|ndjson|arrow)$", description="응답 형식 (json, ndjson, arrow)")
+):
+    """
+    국가/분야/기관/연도/예산 범위로 사업 조회 (연번 순)
+    
+    캐시된 타입 지정 표에 벡터 연산으로 조건을 적용합니다.
+    응답 행에는 원본 컬럼 외에 예산(USD), 사업기간(년), 기관, 분야가 포함됩니다.
+    """
+    try:
+        table = await _koica_table()
+        matched = table.query(country=country, sector=sector, organization=organization,
+                              year=year, min_budget=min_budget, max_budget=max_budget)
+        return frame_response(
+            matched.iloc[offset:offset + limit], format,
+            {"success": True, "total": len(matched), "offset": offset, "limit": limit},
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"데이터 조회 중 오류 발생: {str(e)}"
+        )
+
+
+@koica_router.get("/projects/summary")
+async def summarize_projects(
+    by: str = Query("country", description=f"집계 기준 ({', '.join(DIMENSIONS)})"),
+    country: Optional[str] = Query(None, description="대상 국가"),
+    sector: Optional[str] = Query(None, description="분야"),
+    organization: Optional[str] = Query(None, description="기관 약칭 또는 수행기관명"),
+    year: Optional[int] = Query(None, description="해당 연도에 진행 중인 사업"),
+    min_budget: Optional[float] = Query(None, ge=0, description="최소 예산 (USD)"),
+    max_budget: Optional[float] = Query(None, ge=0, description="최대 예산 (USD)")
+):
+    """
+    조건에 맞는 사업의 기준별 사업 수/예산 합계/평균 (예산 합계 내림차순)
+    
+    국가 기준 집계는 다국가 사업을 대상 국가마다 한 번씩 셉니다.
+    """
+    try:
+        table = await _koica_table()
+        result = table.summarize(by, country=country, sector=sector, organization=organization,
+                                 year=year, min_budget=min_budget, max_budget=max_budget)
+        return frame_response(result, envelope={"success": True, "by": by})
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=e.args[0])
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"데이터 집계 중 오류 발생: {str(e)}"
+        )
+
+
+@koica_router.get("/projects/dimensions")
+async def get_project_dimensions():
+    """필터/집계에 쓸 수 있는 국가, 분야, 기관, 시작연도 값 목록과 표 정보"""
+    try:
+        table = await _koica_table()
+        return {"success": True, "values": table.dimension_values(), "table": table.stats()}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@koica_router.get("/cube")
+async def get_cube_rollup(
+    by: Optional[str] = Query(None, description=f"롤업 차원 (쉼표 구분: {', '.join(CUBE_DIMENSIONS)}), 비우면 전체 합계"),
+    country: Optional[str] = Query(None, description="대상 국가"),
+    sector: Optional[str] = Query(None, description="분야"),
+    organization: Optional[str] = Query(None, description="기관 약칭"),
+    year: Optional[int] = Query(None, description="진행 연도"),
+    limit: Optional[int] = Query(None, ge=1, le=10000, description="최대 행 수 (예산 합계 내림차순)"),
+    format: str = Query("json", pattern="^(json|ndjson|arrow)$", description="응답 형식 (json, ndjson, arrow)")
+):
+    """
+    국가 × 분야 × 기관 × 연도 집계 큐브 롤업 (사업 수, 예산 합계)
+    
+    미리 집계해 둔 셀을 조회만 하므로 요청마다 groupby 하지 않습니다.
+    사업 수는 셀마다 중복 없이 세며, 연도 차원은 해당 연도에 진행 중인 사업 기준입니다.
+    국가 차원은 다국가 사업을 대상 국가마다 한 번씩 셉니다.
+    """
+    dims = [d.strip() for d in by.split(",") if d.strip()] if by else []
+    try:
+        cube = await _koica_cube()
+        result = cube.rollup(dims, {"country": country, "sector": sector,
+                                    "organization": organization, "year": year})
+        total = len(result)
+        if limit is not None:
+            result = result.head(limit)
+        return frame_response(result, format, {"success": True, "by": dims, "total": total,
+                                               "version": cube.version})
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=e.args[0])
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"큐브 조회 중 오류 발생: {str(e)}"
+        )
+
+
+@koica_router.get("/cube/stats")
+async def get_cube_stats():
+    """집계 큐브 상태 (셀 수, 전체 생성/증분 갱신 횟수, 마지막 갱신 내역)"""
+    try:
+        await _koica_cube()
+        return {"success": True, **get_service().stats()}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
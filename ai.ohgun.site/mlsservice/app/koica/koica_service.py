@@ -1,47 +1,156 @@
 """
 KOICA 데이터 서비스
-판다스, 넘파이, 사이킷런을 사용한 데이터 처리 및 머신러닝 서비스
+판다스, 넘파이를 사용한 데이터 처리 및 집계 서비스
 """
 import sys
+import logging
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict, Optional, Any, ParamSpecArgs
+from typing import List, Dict, Optional, Any
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-from icecream import ic
+from app.common.log_capture import make_ic
+
+logger = logging.getLogger(__name__)
+
+# ic() 출력은 logging 으로 보냄
+ic = make_ic(logger)
 
 # 공통 모듈 경로 추가
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
+from .koica_method import CUBE_DIMENSIONS, KoicaCube, KoicaMethod
+from .koica_table import BUDGET_COLUMN, KoicaTable, get_koica_table, peek_koica_table
+
+SAVE_DIR = Path(__file__).parent / "save"
+
 
 class KoicaService:
     """
     KOICA 국제기구사업 데이터 CRUD 서비스 클래스
     Java 스타일의 서비스 레이어 패턴 구현
+
+    사업 표를 로드할 때 국가 × 분야 × 기관 × 연도 집계 큐브를 만들어 두고,
+    원본 CSV 가 교체되면 바뀐 사업만 반영하여 큐브를 갱신합니다.
     """
     def __init__(self):
-        pass
+        self._lock = threading.Lock()
+        self._cube: Optional[KoicaCube] = None
+        self._cube_table: Optional[KoicaTable] = None
+        self.full_builds = 0
+        self.incremental_updates = 0
+        self.last_update: Optional[Dict[str, Any]] = None
+
+    def peek_cube(self) -> Optional[KoicaCube]:
+        """파일이 그대로이고 큐브가 최신이면 바로 반환 (파싱/집계 없음), 아니면 None"""
+        table = peek_koica_table()
+        cube = self._cube
+        if table is not None and cube is not None and self._cube_table is table:
+            return cube
+        return None
+
+    def get_cube(self) -> KoicaCube:
+        """현재 사업 표 기준 큐브 (표가 바뀌었으면 증분 갱신, 처음이면 전체 생성)"""
+        table = get_koica_table()
+        with self._lock:
+            if self._cube is not None and self._cube_table is table:
+                return self._cube
+            started = time.perf_counter()
+            method = KoicaMethod(table)
+            if self._cube is None:
+                self._cube = method.build_cube()
+                self.full_builds += 1
+                self.last_update = {"mode": "full", "projects": len(table)}
+            else:
+                self._cube, delta = method.update_cube(self._cube, self._cube_table)
+                self.incremental_updates += 1
+                self.last_update = {"mode": "incremental", **delta}
+            self.last_update["seconds"] = round(time.perf_counter() - started, 4)
+            self.last_update["version"] = table.version
+            self._cube_table = table
+            logger.info(f"KOICA 집계 큐브 갱신: {self.last_update}")
+            return self._cube
+
+    def rollup(self, by: List[str], filters: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        return self.get_cube().rollup(by, filters)
 
-    def preprogress(self):
+    def preprogress(self) -> Dict[str, Any]:
+        """사업 표 파싱 결과 요약"""
         ic("😊😊 전처리 시작")
+        table = get_koica_table()
+        df = table.frame
+        summary = {
+            **table.stats(),
+            "budget_missing": int(df[BUDGET_COLUMN].isna().sum()),
+            "multi_country_projects": int((table.countries.groupby("row").size() > 1).sum()),
+        }
+        ic(f"사업 {summary['rows']}개, 국가별 행 {summary['country_rows']}개")
         ic("😊😊 전처리 완료")
+        return summary
 
-    def modeling(self):
+    def modeling(self) -> Dict[str, Any]:
+        """집계 큐브 생성/갱신"""
         ic("😊😊 모델링 시작")
+        cube = self.get_cube()
+        ic(f"큐브 셀 {cube.stats()['cells']}개")
         ic("😊😊 모델링 완료")
+        return self.stats()
 
-    def learning(self):
+    def learning(self) -> Dict[str, Any]:
+        """큐브 전체 재생성 (증분 갱신 누적 오차가 의심될 때)"""
         ic("😊😊 학습 시작")
+        table = get_koica_table()
+        with self._lock:
+            started = time.perf_counter()
+            self._cube = KoicaMethod(table).build_cube()
+            self._cube_table = table
+            self.full_builds += 1
+            self.last_update = {"mode": "full", "projects": len(table), "version": table.version,
+                                "seconds": round(time.perf_counter() - started, 4)}
         ic("😊😊 학습 완료")
+        return self.stats()
 
-    def evaluating(self):
+    def evaluating(self) -> Dict[str, Any]:
+        """큐브 롤업 결과가 사업 표를 직접 집계한 값과 같은지 검증"""
         ic("😊😊 평가 시작")
+        cube = self.get_cube()
+        table = get_koica_table()
+        expected = KoicaMethod(table).aggregate(KoicaMethod(table).create_facts())
+        mismatched = []
+        for grouping, cells in expected.items():
+            actual = cube.cells[grouping]
+            columns = [c for c in cells.columns if c not in ("projects", "budget")]
+            left = cells.sort_values(columns).reset_index(drop=True) if columns else cells
+            right = actual.sort_values(columns).reset_index(drop=True) if columns else actual
+            same = (len(left) == len(right)
+                    and left[columns].astype(str).equals(right[columns].astype(str))
+                    and np.array_equal(left["projects"].to_numpy(), right["projects"].to_numpy())
+                    and np.allclose(left["budget"].to_numpy(), right["budget"].to_numpy()))
+            if not same:
+                mismatched.append(sorted(grouping))
+        ic(f"큐브 검증: 불일치 {len(mismatched)}개")
         ic("😊😊 평가 완료")
+        return {"groupings": len(expected), "mismatched": mismatched, "valid": not mismatched}
 
-    def submit(self):
+    def submit(self) -> Dict[str, Any]:
+        """
+        가장 세분화된 큐브 셀(국가 × 분야 × 기관 × 연도)을 CSV 로 저장
+        출력: save/koica_cube.csv
+        """
         ic("😊😊 제출 시작")
+        cells = self.rollup(list(CUBE_DIMENSIONS))
+        SAVE_DIR.mkdir(parents=True, exist_ok=True)
+        output_path = SAVE_DIR / "koica_cube.csv"
+        cells.to_csv(output_path, index=False, encoding="utf-8-sig")
+        ic(f"제출 파일 생성 완료: {output_path}")
         ic("😊😊 제출 완료")
+        return {"output_file": str(output_path), "cells": len(cells)}
 
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cube": self._cube.stats() if self._cube is not None else None,
+            "full_builds": self.full_builds,
+            "incremental_updates": self.incremental_updates,
+            "last_update": self.last_update,
+        }
@@ -0,0 +1,259 @@
+"""
+KOICA Project Table
+koicainternational.csv(국제기구사업 현황)를 한 번만 파싱하여 타입이 지정된 프레임으로 보관하는 로더
+
+- 파싱: 제목 3줄 건너뜀, Unnamed/빈 컬럼·행 제거, '#REF!'/빈 문자열 → 결측
+- 타입: 연번 Int64, 시작/종료연도 Int16, 예산총액 "6,000,000 USD" → 예산(USD) float64,
+  대상국가명/지역명/수행기관/기관/분야 category
+- 파생 컬럼
+  - 기관: 사업명 첫 단어의 기구 약칭 (FAO, UNDP, ...)
+  - 분야: 사업명 키워드로 추정한 사업 분야 (원본에 분야 컬럼이 없음)
+  - 사업기간(년): 종료연도 - 시작연도 + 1
+- 다국가 사업("일반" + 대상국가명-다국가일경우)은 국가별 행으로 펼친 표를 따로 만들어
+  국가 필터/집계에서 각 대상 국가로 잡히게 함
+- 파싱 결과는 데이터셋 캐시(Feather)에 저장하고, 파일이 바뀔 때만 다시 파싱
+"""
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.common.dataset_cache import get_dataset_cache
+
+KOICA_CSV = Path(__file__).parent / "koicainternational.csv"
+PARSER_VERSION = 1
+HEADER_SKIP_ROWS = 3
+NULL_TOKENS = ("#REF!", "")
+MULTI_COUNTRY = "일반"
+
+# 원본 CSV 컬럼 (top10 등 기존 응답 형식)
+SOURCE_COLUMNS = [
+    "연번", "사업명", "영문사업명", "시작연도", "종료연도", "예산총액(달러)",
+    "대상국가명", "대상국가명-다국가일경우", "지역명", "수행기관",
+]
+BUDGET_COLUMN = "예산(USD)"
+CATEGORY_COLUMNS = ["대상국가명", "지역명", "수행기관", "기관", "분야"]
+
+# 사업명 키워드 → 분야 (앞쪽 분야 우선)
+SECTOR_KEYWORDS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("보건", ("보건", "의료", "질병", "정신건강", "성생식")),
+    ("농업·식량", ("농업", "식량", "영세농", "소농", "급식", "농산물", "농촌")),
+    ("평화·거버넌스", ("평화", "분쟁", "거버넌스", "부패", "공공행정", "지뢰", "안정화")),
+    ("난민·이주", ("난민", "이주", "귀환", "실향민", "피난민")),
+    ("기후·환경", ("기후", "녹색", "친환경", "재난", "재해", "홍수")),
+    ("젠더·아동", ("여성", "성평등", "양성평등", "젠더", "아동", "청소년", "청년")),
+    ("경제·일자리", ("일자리", "고용", "무역", "소득", "생계", "경제")),
+]
+OTHER_SECTOR = "기타"
+
+# 조회/집계에서 쓰는 차원 이름 → 컬럼
+DIMENSIONS = {
+    "country": "국가",
+    "sector": "분야",
+    "organization": "기관",
+    "start_year": "시작연도",
+}
+
+
+def classify_sector(name: Any) -> str:
+    """사업명 키워드로 분야 추정"""
+    text = str(name or "")
+    for sector, keywords in SECTOR_KEYWORDS:
+        if any(keyword in text for keyword in keywords):
+            return sector
+    return OTHER_SECTOR
+
+
+def _organization(name: Any) -> Optional[str]:
+    """사업명 첫 단어(기구 약칭) → 기관 (UN-HABITAT → UNHABITAT)"""
+    match = re.match(r"\s*([A-Za-z][A-Za-z\-]*)", str(name or ""))
+    return match.group(1).replace("-", "").upper() if match else None
+
+
+def parse_budget(values: pd.Series) -> pd.Series:
+    """"6,000,000 USD" → 6000000.0 (숫자가 아니면 NaN)"""
+    text = values.astype("string").str.replace(r"[^0-9.\-]", "", regex=True)
+    return pd.to_numeric(text.replace("", pd.NA), errors="coerce").astype("float64")
+
+
+def parse_koica_table(path: Path) -> pd.DataFrame:
+    """koicainternational.csv → 타입이 지정된 데이터프레임 (연번 순)"""
+    df = pd.read_csv(path, encoding="utf-8-sig", skiprows=HEADER_SKIP_ROWS, dtype=str, keep_default_na=False)
+    # 첫 번째 빈 컬럼 제거 (Unnamed: 0 같은 컬럼)
+    df = df.loc[:, ~df.columns.str.contains("^Unnamed")]
+    df = df.apply(lambda s: s.str.strip())
+    df = df.mask(df.isin(NULL_TOKENS))
+    # 빈 컬럼 및 행 제거 (지역명처럼 전부 '#REF!' 인 컬럼은 결측 컬럼으로 유지)
+    df = df.dropna(axis=0, how="all")
+    df = df[[c for c in df.columns if c in SOURCE_COLUMNS or df[c].notna().any()]]
+    for column in SOURCE_COLUMNS:
+        if column not in df.columns:
+            df[column] = np.nan
+
+    df["연번"] = pd.to_numeric(df["연번"], errors="coerce").astype("Int64")
+    for column in ("시작연도", "종료연도"):
+        df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int16")
+    df[BUDGET_COLUMN] = parse_budget(df["예산총액(달러)"])
+    df["사업기간(년)"] = (df["종료연도"] - df["시작연도"] + 1).astype("Int16")
+    df["기관"] = df["사업명"].map(_organization)
+    df["분야"] = df["사업명"].map(classify_sector)
+    for column in ("사업명", "영문사업명", "예산총액(달러)", "대상국가명-다국가일경우"):
+        df[column] = df[column].astype(object)
+    for column in CATEGORY_COLUMNS:
+        df[column] = df[column].astype("category")
+
+    df = df.sort_values("연번", na_position="last", kind="stable").reset_index(drop=True)
+    return df[SOURCE_COLUMNS + [c for c in df.columns if c not in SOURCE_COLUMNS]]
+
+
+def explode_countries(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    사업 × 대상 국가 표 (row: 사업 행 번호, 국가)
+    다국가 사업("일반")은 대상국가명-다국가일경우 의 국가마다 한 행
+    """
+    single = df["대상국가명"].astype(object)
+    multi = df["대상국가명-다국가일경우"].astype(object)
+    is_multi = single.eq(MULTI_COUNTRY) & multi.notna()
+    countries = single.where(~is_multi, multi).fillna("").astype(str).str.split(",")
+    long = pd.DataFrame({"row": np.arange(len(df)), "국가": countries}).explode("국가")
+    long["국가"] = long["국가"].str.strip()
+    long = long[long["국가"] != ""]
+    long["국가"] = long["국가"].astype("category")
+    return long.reset_index(drop=True)
+
+
+class KoicaTable:
+    """타입이 지정된 KOICA 사업 표와 국가별 펼친 표 (생성 후 읽기 전용)"""
+
+    def __init__(self, df: pd.DataFrame, fingerprint: Tuple[int, int] = (0, 0)) -> None:
+        started = time.perf_counter()
+        self.fingerprint = fingerprint
+        self.frame = df
+        self.countries = explode_countries(df)
+        self.build_seconds = time.perf_counter() - started
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def version(self) -> str:
+        mtime_ns, size = self.fingerprint
+        return f"{mtime_ns:x}-{size:x}"
+
+    def top(self, n: int = 10) -> pd.DataFrame:
+        """연번 순 상위 n 개 (원본 컬럼)"""
+        return self.frame[SOURCE_COLUMNS].head(n)
+
+    def mask(self, country: Optional[str] = None, sector: Optional[str] = None,
+             organization: Optional[str] = None, year: Optional[int] = None,
+             min_budget: Optional[float] = None, max_budget: Optional[float] = None) -> np.ndarray:
+        """
+        조건에 맞는 사업 행 마스크 (조건 간 AND, None 은 무시)
+
+        Args:
+            country: 대상 국가 (다국가 사업의 대상 국가 포함)
+            sector: 분야
+            organization: 기관 약칭 (대소문자 무시) 또는 수행기관명
+            year: 해당 연도에 진행 중인 사업 (시작연도 <= year <= 종료연도)
+            min_budget / max_budget: 예산(USD) 범위
+        """
+        df = self.frame
+        mask = np.ones(len(df), dtype=bool)
+        if country:
+            rows = self.countries.loc[self.countries["국가"] == country.strip(), "row"].to_numpy()
+            selected = np.zeros(len(df), dtype=bool)
+            selected[rows] = True
+            mask &= selected
+        if sector:
+            mask &= (df["분야"] == sector.strip()).to_numpy(dtype=bool)
+        if organization:
+            key = organization.strip()
+            mask &= ((df["기관"] == key.upper()) | (df["수행기관"] == key)).to_numpy(dtype=bool)
+        if year is not None:
+            active = (df["시작연도"] <= year) & (df["종료연도"] >= year)
+            mask &= active.fillna(False).to_numpy(dtype=bool)
+        budget = df[BUDGET_COLUMN]
+        if min_budget is not None:
+            mask &= (budget >= min_budget).to_numpy(dtype=bool)
+        if max_budget is not None:
+            mask &= (budget <= max_budget).to_numpy(dtype=bool)
+        return mask
+
+    def query(self, **filters: Any) -> pd.DataFrame:
+        """조건에 맞는 사업 (연번 순)"""
+        return self.frame[self.mask(**filters)]
+
+    def summarize(self, by: str, **filters: Any) -> pd.DataFrame:
+        """
+        조건에 맞는 사업을 차원(by)별로 집계 (사업 수, 예산 합계/평균)
+        국가 차원은 다국가 사업을 대상 국가마다 한 번씩 셈
+        """
+        if by not in DIMENSIONS:
+            raise KeyError(f"지원하지 않는 집계 기준입니다: {by} (지원: {', '.join(DIMENSIONS)})")
+        mask = self.mask(**filters)
+        column = DIMENSIONS[by]
+        if by == "country":
+            rows = self.countries[mask[self.countries["row"].to_numpy()]]
+            keys = rows["국가"]
+            budget = self.frame[BUDGET_COLUMN].to_numpy()[rows["row"].to_numpy()]
+        else:
+            keys = self.frame.loc[mask, column]
+            budget = self.frame.loc[mask, BUDGET_COLUMN].to_numpy()
+        grouped = pd.DataFrame({column: keys.to_numpy(), "budget": budget}).groupby(column, observed=True, dropna=True)
+        result = grouped["budget"].agg(projects="size", total_budget="sum", mean_budget="mean").reset_index()
+        return result.sort_values(["total_budget", column], ascending=[False, True], kind="stable").reset_index(drop=True)
+
+    def dimension_values(self) -> Dict[str, List[Any]]:
+        """필터에 쓸 수 있는 값 목록"""
+        return {
+            "country": sorted(self.countries["국가"].cat.categories.tolist()),
+            "sector": sorted(self.frame["분야"].cat.categories.tolist()),
+            "organization": sorted(self.frame["기관"].cat.categories.tolist()),
+            "start_year": sorted(int(y) for y in self.frame["시작연도"].dropna().unique()),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rows": len(self.frame),
+            "country_rows": len(self.countries),
+            "version": self.version,
+            "build_seconds": round(self.build_seconds, 4),
+            "dtypes": {str(c): str(t) for c, t in self.frame.dtypes.items()},
+        }
+
+
+_table: Optional[KoicaTable] = None
+_table_lock = threading.Lock()
+
+
+def _fingerprint(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def peek_koica_table(path: Path = KOICA_CSV) -> Optional[KoicaTable]:
+    """
+    최신 표가 이미 있으면 반환, 파일이 바뀌었거나 아직 없으면 None
+    (파일 stat 만 하므로 이벤트 루프에서 호출해도 됨)
+    """
+    table = _table
+    if table is not None and path.exists() and table.fingerprint == _fingerprint(path):
+        return table
+    return None
+
+
+def get_koica_table(path: Path = KOICA_CSV) -> KoicaTable:
+    """KOICA 사업 표 싱글톤 반환 (koicainternational.csv 가 바뀌었으면 다시 파싱)"""
+    global _table
+    with _table_lock:
+        if not path.exists():
+            raise FileNotFoundError(f"koicainternational.csv 파일을 찾을 수 없습니다: {path}")
+        fingerprint = _fingerprint(path)
+        if _table is None or _table.fingerprint != fingerprint:
+            df = get_dataset_cache().read(path, parse_koica_table, variant=f"koica-table:v{PARSER_VERSION}")
+            _table = KoicaTable(df, fingerprint)
+        return _table
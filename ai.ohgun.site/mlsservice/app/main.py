@@ -16,6 +16,22 @@ from app.seoul_crime.seoul_router import seoul_router
 from app.nlp.nlp_router import nlp_router
 # USA Unemployment 라우터 import
 from app.us_unemployment.router import usa_router
+# 공용 실행기 (스레드/프로세스 풀)
+from app.common.executor import get_executor
+# 백그라운드 잡 라우터 import
+from app.common.jobs import get_job_manager
+from app.common.jobs_router import jobs_router
+# 요청 단위 로그 수집 + 배치 로그 출력
+from app.common.log_capture import setup_logging
+# 카카오 비동기 지오코더 (종료 시 커넥션 풀 정리)
+from app.seoul_crime.kakao_async import peek_async_geocoder
+# CSV/XLS 컬럼형 캐시
+from app.common.dataset_cache import get_dataset_cache
+# orjson 기반 공용 JSON 응답 (NaN/inf → null)
+from app.common.serializer import FastJSONResponse
+
+# 루트 로거 구성 (서비스 모듈의 basicConfig 핸들러를 대체)
+setup_logging()
 
 app = FastAPI(
     title="ML Service API",
@@ -40,6 +56,7 @@ app = FastAPI(
     3. **OpenAPI JSON**: `/openapi.json` 엔드포인트에서 스키마 다운로드
     """,
     version="1.0.0",
+    default_response_class=FastJSONResponse,
     contact={
         "name": "ML Service Team",
         "email": "mlservice@example.com",
@@ -98,6 +115,10 @@ app = FastAPI(
                 "url": "https://www.nltk.org",
             },
         },
+        {
+            "name": "jobs",
+            "description": "오래 걸리는 작업(전처리, 평가, 머지, 워드클라우드)의 백그라운드 잡 API",
+        },
     ]
 )
 
@@ -113,6 +134,8 @@ app.include_router(seoul_router)
 app.include_router(nlp_router)
 # USA 실업률 라우터 등록
 app.include_router(usa_router)
+# 백그라운드 잡 라우터 등록
+app.include_router(jobs_router)
 
 # 루트 엔드포인트
 @app.get("/")
@@ -134,6 +157,39 @@ async def health():
     return {"status": "healthy"}
 
 
+# 실행기 메트릭 엔드포인트
+@app.get("/metrics/executor", tags=["health"])
+async def executor_metrics():
+    """
+    공용 실행기 상태 조회
+    
+    스레드/프로세스 풀 대기열 길이와 엔드포인트별 실행 중/대기 중 요청 수를 반환합니다.
+    """
+    metrics = get_executor().metrics()
+    metrics["jobs"] = get_job_manager().metrics()
+    return metrics
+
+
+@app.get("/metrics/datasets", tags=["health"])
+async def dataset_cache_metrics():
+    """
+    데이터셋 캐시 상태 조회
+    
+    CSV/XLS 원본별 컬럼형 캐시 파일, 적중/미스 횟수, 최초 파싱 시간을 반환합니다.
+    """
+    return get_dataset_cache().stats()
+
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    """서버 종료 시 잡 워커, 카카오 커넥션 풀, 실행기 풀 정리"""
+    await get_job_manager().shutdown()
+    geocoder = peek_async_geocoder()
+    if geocoder is not None:
+        await geocoder.aclose()
+    get_executor().shutdown()
+
+
 # Swagger 커스터마이징
 def custom_openapi():
     if app.openapi_schema:
@@ -158,7 +214,7 @@ if __name__ == "__main__":
     # train.csv 파일에서 상위 10명 출력
     try:
         # CSV 파일 경로 설정
-        csv_path = os.path.join(os.path.dirname(__file__), "titanic", "train.csv")
+        csv_path = os.path.join(os.path.dirname(__file__), "titanic", "data", "train.csv")
         
         # CSV 파일 읽기
         df = pd.read_csv(csv_path)
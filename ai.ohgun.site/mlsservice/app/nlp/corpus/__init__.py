@@ -0,0 +1,7 @@
+"""
+ML Service Application
+머신러닝 서비스 애플리케이션
+"""
+
+__version__ = "1.0.0"
+
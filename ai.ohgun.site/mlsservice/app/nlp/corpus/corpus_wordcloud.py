@@ -0,0 +1,291 @@
+"""
+Corpus WordCloud
+업로드한 임의의 문서(영어/한국어)로 워드클라우드 빈도 표를 만드는 스트리밍 처리기
+
+- 바이트 스트림을 CHUNK_BYTES 단위로 읽어 점진적 디코딩 (청크 경계에서 글자/단어가 잘리지 않도록 처리)
+- 첫 청크로 인코딩(utf-8/utf-16/cp949)과 언어(한글 비율)를 판별하여 언어별 파이프라인 선택
+  - en: 정규식 단어 토큰 → 소문자 → 불용어 제거
+  - ko: 어절별 Okt 명사 추출 (공용 NounExtractor - 어절 캐시/배치/병렬,
+        konlpy 가 없으면 한글 어절에서 조사를 뗀 정규식 토큰) → 일반 한국어 불용어 제거
+        (data/stopwords.txt 는 삼성 보고서 전용 목록이라 업로드 문서에는 쓰지 않음)
+- 빈도 표는 단어 수 상한(max_terms)을 넘으면 빈도가 낮은 단어부터 정리 (Misra-Gries 방식)
+  → 입력 크기와 관계없이 메모리는 청크 하나 + 빈도 표 상한으로 제한
+"""
+import codecs
+import logging
+import os
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+FONT_PATH = DATA_DIR / "D2Coding.ttf"
+
+CHUNK_BYTES = 1 << 20
+DEFAULT_MAX_TERMS = int(os.getenv("MLS_NLP_CORPUS_MAX_TERMS", "200000"))
+LANGUAGES = ("en", "ko")
+ENCODINGS = ("utf-8", "utf-16", "cp949")
+
+# nltk stopwords 말뭉치가 없을 때 쓰는 기본 영어 불용어
+ENGLISH_STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her
+here hers herself him himself his how i if in into is it its itself just me more most my myself no nor not
+now of off on once only or other our ours ourselves out over own same she should so some such than that
+the their theirs them themselves then there these they this those through to too under until up very was
+we were what when where which while who whom why will with would you your yours yourself yourselves
+mr mrs miss said one would could upon shall may might must also
+""".split())
+
+# 업로드 문서용 일반 한국어 불용어 (대명사, 의존 명사, 접속/지시 표현 등 기능어 - 내용 명사는 넣지 않음)
+# 한 글자 단어는 파이프라인에서 따로 제외
+KOREAN_STOPWORDS = frozenset("""
+그리고 그러나 그런데 그러면 그래서 그러므로 따라서 하지만 또한 또는 혹은 및 즉 단 만약 비록 게다가 아울러
+우리 저희 너희 당신 자신 그녀 그들 이것 그것 저것 이거 그거 저거 여기 거기 저기 이곳 그곳 저곳 무엇 누구 어디
+언제 어떻게 왜 어느 어떤 이런 그런 저런 이러한 그러한 저러한 이와 같은 같이 모든 각각 각종 여러 다른 다양한
+것들 수도 때문 때문에 경우 정도 관련 대한 대해 위한 위해 통한 통해 따른 따라 의한 의해 관한 인한 인해 비해
+이후 이전 이상 이하 이내 미만 초과 가운데 사이 동안 부분 가지 하나 둘째 셋째 첫째 그중 이중 여부 자체
+현재 지금 당시 오늘 내일 어제 항상 계속 다시 이미 아직 모두 함께 매우 가장 더욱 아주 너무 정말 특히 바로
+있음 없음 있다 없다 하다 되다 이다 아니다 같다 한다 된다 있는 없는 하는 되는 했다 됐다 였다 이며 이고
+등등 등의 등을 등이 통하여 위하여 대하여 의하여 관하여 있어 있으며 있고 없이 하여 되어
+""".split())
+HANGUL_RE = re.compile(r"[가-힣]")
+LATIN_RE = re.compile(r"[A-Za-z]")
+# 정규식 대체 경로에서 명사가 아닌 어절로 보는 어미/관용 표현
+PREDICATE_ENDINGS = ("니다", "습니다", "있는", "하는", "되는", "있다", "한다", "된다", "했다", "하여", "하고",
+                     "이다", "었다", "였다", "으며", "하며", "해야", "하기", "되어", "위해", "통해", "따라", "도록")
+PREDICATE_WORDS = frozenset("위한 대한 같은 있는 없는 많은 모든 이를 또한 그리고 하지만 통한 관한 위해 통해 따라".split())
+# 어절 끝 조사 (긴 것부터 제거)
+JOSA_SUFFIXES = tuple(sorted(
+    "은 는 이 가 을 를 의 에 에서 에게 으로 로 과 와 도 만 까지 부터 보다 처럼 이며 이고 에는 으로는 로는 에서는 과의 와의".split(),
+    key=len, reverse=True,
+))
+
+
+class CorpusTooLargeError(ValueError):
+    """업로드 크기 상한 초과"""
+
+
+def detect_encoding(sample: bytes) -> str:
+    """첫 청크로 인코딩 판별 (BOM → utf-8 → cp949 순서, 모두 실패하면 utf-8 + 대체 문자)"""
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    for encoding in ("utf-8", "cp949"):
+        try:
+            # 청크 끝에서 잘린 멀티바이트 문자는 무시 (final=False)
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "utf-8"
+
+
+def detect_language(text: str) -> str:
+    """한글 음절 수가 라틴 문자 수의 1/4 이상이면 ko, 아니면 en (음절 하나가 영어 글자 여러 개에 해당)"""
+    hangul = len(HANGUL_RE.findall(text))
+    latin = len(LATIN_RE.findall(text))
+    return "ko" if hangul and hangul * 4 >= latin else "en"
+
+
+class BoundedCounter:
+    """
+    단어 수 상한이 있는 빈도 표
+
+    단어 수가 capacity 를 넘으면 상위 capacity // 2 개만 남기고 정리합니다.
+    정리된 단어의 최대 빈도(error_bound)보다 많이 나온 단어의 순위는 유지되며,
+    정리가 한 번도 없으면 빈도는 정확합니다.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_MAX_TERMS) -> None:
+        if capacity < 2:
+            raise ValueError("capacity 는 2 이상이어야 합니다.")
+        self.capacity = capacity
+        self.counts: Counter = Counter()
+        self.total = 0
+        self.prunes = 0
+        self.pruned_terms = 0
+        self.error_bound = 0
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def update(self, tokens: Iterable[str]) -> None:
+        tokens = list(tokens)
+        self.counts.update(tokens)
+        self.total += len(tokens)
+        if len(self.counts) > self.capacity:
+            self._prune()
+
+    def _prune(self) -> None:
+        keep = self.counts.most_common(self.capacity // 2)
+        threshold = keep[-1][1] if keep else 0
+        dropped = len(self.counts) - len(keep)
+        self.error_bound = max(self.error_bound, threshold)
+        self.counts = Counter(dict(keep))
+        self.prunes += 1
+        self.pruned_terms += dropped
+
+    def most_common(self, n: Optional[int] = None):
+        return self.counts.most_common(n)
+
+    @property
+    def exact(self) -> bool:
+        return self.prunes == 0
+
+
+class EnglishPipeline:
+    """영어: 정규식 단어 토큰 → 소문자 → 불용어 제거"""
+    language = "en"
+    font_path: Optional[str] = None
+    TOKEN_RE = re.compile(r"[a-z][a-z']*[a-z]")
+
+    def __init__(self, stopwords: Optional[Iterable[str]] = None) -> None:
+        self.stopwords = frozenset(stopwords) if stopwords is not None else self._default_stopwords()
+
+    @staticmethod
+    def _default_stopwords() -> frozenset:
+        try:
+            from nltk.corpus import stopwords
+            return frozenset(stopwords.words("english")) | ENGLISH_STOPWORDS
+        except LookupError:
+            return ENGLISH_STOPWORDS
+
+    def tokens(self, text: str) -> List[str]:
+        stopwords = self.stopwords
+        # 청크 전체를 한 번에 소문자로 바꾼 뒤 토큰화 (단어마다 lower 호출하지 않음)
+        words = (w[:-2] if w.endswith("'s") else w for w in self.TOKEN_RE.findall(text.lower()))
+        return [w for w in words if w not in stopwords]
+
+
+class KoreanPipeline:
+    """한국어: 어절별 Okt 명사 추출 (konlpy 가 없으면 조사를 뗀 한글 어절) → 불용어 제거"""
+    language = "ko"
+    font_path: Optional[str] = str(FONT_PATH) if FONT_PATH.exists() else None
+    WORD_RE = re.compile(r"[가-힣]+")
+
+    def __init__(self, stopwords: Optional[Iterable[str]] = None, use_okt: bool = True) -> None:
+        self.stopwords = frozenset(stopwords) if stopwords is not None else self._default_stopwords()
+        self.extractor = self._load_extractor() if use_okt else None
+
+    @staticmethod
+    def _default_stopwords() -> frozenset:
+        return KOREAN_STOPWORDS
+
+    @staticmethod
+    def _load_extractor():
+        try:
+            from app.nlp.samsung.noun_extractor import get_noun_extractor
+            extractor = get_noun_extractor()
+            # Okt(JVM) 를 만들 수 있는지 미리 확인
+            extractor.okt
+            return extractor
+        except Exception as e:
+            logger.warning(f"konlpy(Okt)를 사용할 수 없어 정규식 어절 토큰으로 대체합니다: {e}")
+            return None
+
+    @property
+    def analyzer(self) -> str:
+        return "okt" if self.extractor is not None else "regex"
+
+    @staticmethod
+    def strip_josa(word: str) -> str:
+        for suffix in JOSA_SUFFIXES:
+            if len(word) > len(suffix) + 1 and word.endswith(suffix):
+                return word[:-len(suffix)]
+        return word
+
+    def tokens(self, text: str) -> List[str]:
+        stopwords = self.stopwords
+        if self.extractor is not None:
+            nouns = self.extractor.extract(self.WORD_RE.findall(text))
+        else:
+            nouns = [self.strip_josa(w) for w in self.WORD_RE.findall(text)
+                     if w not in PREDICATE_WORDS and not w.endswith(PREDICATE_ENDINGS)
+                     and not (len(w) > 2 and w.endswith("한"))]
+        return [n for n in nouns if len(n) > 1 and n not in stopwords]
+
+
+def create_pipeline(language: str):
+    """언어 코드 → 파이프라인"""
+    if language == "en":
+        return EnglishPipeline()
+    if language == "ko":
+        return KoreanPipeline()
+    raise ValueError(f"지원하지 않는 언어입니다: {language} (지원: {', '.join(LANGUAGES)})")
+
+
+class CorpusWordCloud:
+    """
+    업로드 문서 → 단어 빈도 표
+
+    사용 예:
+        counts = CorpusWordCloud().count_stream(upload.file)
+    """
+
+    def __init__(self, language: str = "auto", encoding: str = "auto",
+                 max_terms: int = DEFAULT_MAX_TERMS, chunk_bytes: int = CHUNK_BYTES,
+                 max_bytes: Optional[int] = None) -> None:
+        self.language = language
+        self.encoding = encoding
+        self.max_terms = max_terms
+        self.chunk_bytes = chunk_bytes
+        self.max_bytes = max_bytes
+
+    def count_stream(self, stream: BinaryIO) -> Dict[str, Any]:
+        """
+        바이너리 스트림을 청크 단위로 읽어 단어 빈도 계산 (블로킹 - 실행기 스레드에서 호출)
+
+        Returns:
+            {"language", "encoding", "analyzer", "bytes", "chunks", "counter": BoundedCounter, "seconds"}
+        """
+        started = time.perf_counter()
+        first = stream.read(self.chunk_bytes)
+        encoding = detect_encoding(first) if self.encoding == "auto" else self.encoding
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+        pipeline = None
+        counter = BoundedCounter(self.max_terms)
+        carry = ""
+        total_bytes, chunks = 0, 0
+        chunk = first
+        while True:
+            final = not chunk
+            total_bytes += len(chunk)
+            if self.max_bytes is not None and total_bytes > self.max_bytes:
+                raise CorpusTooLargeError(f"업로드 크기 상한({self.max_bytes} bytes)을 넘었습니다.")
+            text = carry + decoder.decode(chunk, final=final)
+            if pipeline is None:
+                language = detect_language(text) if self.language == "auto" else self.language
+                pipeline = create_pipeline(language)
+            if final:
+                body, carry = text, ""
+            else:
+                # 마지막 공백 이후는 단어가 잘렸을 수 있으므로 다음 청크와 합쳐 처리
+                # (공백 없이 긴 입력은 청크 크기를 넘으면 그대로 처리하여 carry 가 커지지 않도록 함)
+                cut = max(text.rfind(" "), text.rfind("\n"))
+                if cut < 0 and len(text) > self.chunk_bytes:
+                    cut = len(text)
+                body, carry = (text[:cut], text[cut:]) if cut >= 0 else ("", text)
+            if body:
+                counter.update(pipeline.tokens(body))
+                chunks += 1
+            if final:
+                break
+            chunk = stream.read(self.chunk_bytes)
+
+        return {
+            "language": pipeline.language,
+            "encoding": encoding,
+            "analyzer": getattr(pipeline, "analyzer", "regex"),
+            "font_path": pipeline.font_path,
+            "bytes": total_bytes,
+            "chunks": chunks,
+            "counter": counter,
+            "seconds": round(time.perf_counter() - started, 4),
+        }
@@ -0,0 +1,235 @@
+"""
+Emma Analysis Cache
+말뭉치 토큰화 + 품사 태깅 결과와 고유명사 빈도를 디스크에 보관하는 캐시
+
+- 캐시 키: 말뭉치 이름 + 태거 버전(NLTK 버전, 태거 리소스, 토큰화 규칙)
+- 태깅 결과: token(문자열) / tag(category) 두 컬럼 Feather (lz4 압축), pyarrow 가 없으면 pickle
+- 고유명사(NNP) 빈도: 메타 JSON 에 첫 등장 순서대로 저장 (불용어는 읽을 때 제외)
+- 처음 사용할 때만 디스크에서 읽고, 캐시가 없거나 키가 다르면 태깅 후 저장
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import nltk
+import pandas as pd
+from nltk import FreqDist
+
+try:
+    import pyarrow.feather as feather
+    HAS_PYARROW = True
+except ImportError:
+    feather = None
+    HAS_PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+# mlsservice/.cache/nlp
+CACHE_DIR = Path(os.getenv(
+    "MLS_NLP_CACHE_DIR",
+    str(Path(__file__).resolve().parent.parent.parent.parent / ".cache" / "nlp")
+))
+# 태깅/빈도 계산 방식이 바뀌면 올림
+ANALYSIS_VERSION = 1
+NAME_TAG = "NNP"
+
+TaggedTokens = List[Tuple[str, str]]
+
+
+def tagger_version(token_pattern: str) -> str:
+    """현재 환경의 태거 버전 문자열 (NLTK 버전 + 사용 가능한 태거 리소스 + 토큰화 규칙)"""
+    resource = "unknown"
+    for name in ("averaged_perceptron_tagger_eng", "averaged_perceptron_tagger"):
+        try:
+            nltk.data.find(f"taggers/{name}")
+            resource = name
+            break
+        except LookupError:
+            continue
+    return f"nltk-{nltk.__version__}/{resource}/{token_pattern}/v{ANALYSIS_VERSION}"
+
+
+class EmmaAnalysis:
+    """캐시에서 읽은(또는 새로 만든) 말뭉치 분석 결과"""
+
+    def __init__(self, corpus_name: str, version: str, tagged: pd.DataFrame,
+                 name_counts: Dict[str, int], source: str) -> None:
+        self.corpus_name = corpus_name
+        self.version = version
+        # token / tag 컬럼 (원문 순서)
+        self.tagged = tagged
+        # 고유명사 빈도 (첫 등장 순서)
+        self.name_counts = name_counts
+        # "disk" (캐시 파일) 또는 "tagged" (이번에 태깅)
+        self.source = source
+        self._tagged_tokens: Optional[TaggedTokens] = None
+
+    def __len__(self) -> int:
+        return len(self.tagged)
+
+    def tokens(self) -> List[str]:
+        return self.tagged["token"].tolist()
+
+    def tagged_tokens(self) -> TaggedTokens:
+        """(단어, 품사) 튜플 리스트 (처음 요청할 때 한 번만 만듦)"""
+        if self._tagged_tokens is None:
+            self._tagged_tokens = list(zip(self.tagged["token"].tolist(), self.tagged["tag"].astype(str).tolist()))
+        return self._tagged_tokens
+
+    def names_freq_dist(self, stopwords: Iterable[str] = ()) -> FreqDist:
+        """불용어를 뺀 고유명사 빈도 분포 (FreqDist(names_list) 와 같은 내용/순서)"""
+        excluded = set(stopwords)
+        return FreqDist({word: count for word, count in self.name_counts.items() if word not in excluded})
+
+
+def count_names(tagged: TaggedTokens) -> Dict[str, int]:
+    """고유명사(NNP) 첫 등장 순서 빈도"""
+    return dict(Counter(word for word, tag in tagged if tag == NAME_TAG))
+
+
+class EmmaAnalysisCache:
+    """
+    말뭉치 분석 결과 디스크 캐시
+
+    사용 예:
+        analysis = get_emma_analysis_cache().load("austen-emma.txt", version, lambda: pos_tag(tokens))
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, use_arrow: bool = HAS_PYARROW) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.use_arrow = use_arrow and HAS_PYARROW
+        self.suffix = ".feather" if self.use_arrow else ".pkl"
+        self._lock = threading.Lock()
+        self._loaded: Dict[Tuple[str, str], EmmaAnalysis] = {}
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _paths(self, corpus_name: str, version: str):
+        key = hashlib.sha1(f"{corpus_name}|{version}".encode("utf-8")).hexdigest()[:12]
+        stem = f"{Path(corpus_name).stem}-tagged-{key}"
+        return self.cache_dir / f"{stem}{self.suffix}", self.cache_dir / f"{stem}.json"
+
+    def _read(self, corpus_name: str, version: str) -> Optional[EmmaAnalysis]:
+        data_path, meta_path = self._paths(corpus_name, version)
+        if not (data_path.exists() and meta_path.exists()):
+            return None
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta.get("corpus") != corpus_name or meta.get("version") != version:
+                return None
+            if self.use_arrow:
+                tagged = feather.read_feather(data_path)
+            else:
+                tagged = pd.read_pickle(data_path)
+            if len(tagged) != meta.get("tokens"):
+                return None
+            return EmmaAnalysis(corpus_name, version, tagged, meta["name_counts"], source="disk")
+        except Exception as e:
+            logger.warning(f"Emma 분석 캐시 읽기 실패, 다시 태깅합니다: {data_path} ({e})")
+            return None
+
+    def _write(self, analysis: EmmaAnalysis, tag_seconds: float) -> None:
+        data_path, meta_path = self._paths(analysis.corpus_name, analysis.version)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_data = data_path.with_suffix(data_path.suffix + ".tmp")
+        if self.use_arrow:
+            feather.write_feather(analysis.tagged, tmp_data, compression="lz4")
+        else:
+            analysis.tagged.to_pickle(tmp_data)
+        tmp_meta = meta_path.with_suffix(".json.tmp")
+        tmp_meta.write_text(json.dumps({
+            "corpus": analysis.corpus_name,
+            "version": analysis.version,
+            "tokens": len(analysis.tagged),
+            "tags": int(analysis.tagged["tag"].nunique()),
+            "format": self.suffix.lstrip("."),
+            "tag_seconds": round(tag_seconds, 4),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "name_counts": analysis.name_counts,
+        }, ensure_ascii=False), encoding="utf-8")
+        # 데이터 파일을 먼저 교체해야 메타만 새 버전인 상태가 생기지 않음
+        tmp_data.replace(data_path)
+        tmp_meta.replace(meta_path)
+
+    def load(self, corpus_name: str, version: str, tag: Callable[[], TaggedTokens]) -> EmmaAnalysis:
+        """
+        분석 결과 반환 (메모리 → 디스크 → tag() 순서)
+
+        Args:
+            corpus_name: 말뭉치 이름
+            version: 태거 버전 문자열 (tagger_version)
+            tag: 캐시가 없을 때 호출할 태깅 함수 ((단어, 품사) 리스트 반환)
+        """
+        key = (corpus_name, version)
+        with self._lock:
+            analysis = self._loaded.get(key)
+            if analysis is not None:
+                return analysis
+            analysis = self._read(corpus_name, version)
+            if analysis is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                started = time.perf_counter()
+                tagged_tokens = tag()
+                tagged = pd.DataFrame(tagged_tokens, columns=["token", "tag"])
+                tagged["tag"] = tagged["tag"].astype("category")
+                analysis = EmmaAnalysis(corpus_name, version, tagged, count_names(tagged_tokens), source="tagged")
+                analysis._tagged_tokens = list(tagged_tokens)
+                try:
+                    self._write(analysis, time.perf_counter() - started)
+                except Exception as e:
+                    # 캐시 저장 실패는 분석 결과에 영향을 주지 않음
+                    self.errors += 1
+                    logger.warning(f"Emma 분석 캐시 저장 실패: {corpus_name} ({e})")
+            self._loaded[key] = analysis
+            return analysis
+
+    def stats(self) -> Dict[str, Any]:
+        entries = []
+        if self.cache_dir.exists():
+            for meta_path in sorted(self.cache_dir.glob("*-tagged-*.json")):
+                try:
+                    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                except Exception:
+                    continue
+                data_path = meta_path.with_suffix(self.suffix)
+                entries.append({
+                    "corpus": meta.get("corpus"),
+                    "version": meta.get("version"),
+                    "tokens": meta.get("tokens"),
+                    "names": len(meta.get("name_counts", {})),
+                    "tag_seconds": meta.get("tag_seconds"),
+                    "cache_bytes": data_path.stat().st_size if data_path.exists() else None,
+                    "created_at": meta.get("created_at"),
+                })
+        return {
+            "cache_dir": str(self.cache_dir),
+            "format": self.suffix.lstrip("."),
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "loaded": [f"{corpus}@{version}" for corpus, version in self._loaded],
+            "entries": entries,
+        }
+
+
+_analysis_cache: Optional[EmmaAnalysisCache] = None
+_analysis_cache_lock = threading.Lock()
+
+
+def get_emma_analysis_cache() -> EmmaAnalysisCache:
+    """Emma 분석 캐시 싱글톤 인스턴스 반환"""
+    global _analysis_cache
+    with _analysis_cache_lock:
+        if _analysis_cache is None:
+            _analysis_cache = EmmaAnalysisCache()
+        return _analysis_cache
@@ -22,6 +22,41 @@ from wordcloud import WordCloud
 import matplotlib
 matplotlib.use('Agg')  # GUI 백엔드 사용 안 함 (서버 환경)
 import matplotlib.pyplot as plt
+import io
+
+from .emma_cache import get_emma_analysis_cache, tagger_version
+
+# 단어 토큰화 규칙 (태깅 캐시 키에 포함)
+TOKEN_PATTERN = r"[\w]+"
+
+
+def render_wordcloud_png(frequencies, width=1000, height=600, background_color="white",
+                         random_state=0, font_path=None):
+    """
+    빈도 사전으로 워드클라우드를 그려 PNG bytes 로 반환
+
+    프로세스 풀 워커에서 실행할 수 있도록 모듈 레벨 함수로 두고,
+    인자와 반환값은 모두 pickle 가능한 기본 타입만 사용합니다.
+
+    Args:
+        frequencies: {단어: 빈도} 사전
+        width, height, background_color, random_state: WordCloud 옵션
+        font_path: 한글 등 비ASCII 단어용 폰트 경로 (None이면 기본 폰트)
+
+    Returns:
+        PNG 이미지 bytes
+    """
+    wc = WordCloud(
+        width=width,
+        height=height,
+        background_color=background_color,
+        random_state=random_state,
+        font_path=font_path
+    )
+    wc.generate_from_frequencies(frequencies)
+    buffer = io.BytesIO()
+    wc.to_image().save(buffer, format='PNG')
+    return buffer.getvalue()
 
 
 class EmmaWordCloud:
@@ -43,9 +78,9 @@ class EmmaWordCloud:
         # NLTK 데이터 다운로드
         self._ensure_nltk_data()
         
-        # 말뭉치 로드
+        # 말뭉치 (원문은 처음 필요할 때 로드)
         self.corpus_name = corpus_name
-        self.raw_text = nltk.corpus.gutenberg.raw(corpus_name)
+        self._raw_text = None
         
         # 기본 stopwords 설정
         if stopwords is None:
@@ -54,7 +89,7 @@ class EmmaWordCloud:
             self.stopwords = stopwords
         
         # 토크나이저 초기화
-        self.regex_tokenizer = RegexpTokenizer("[\w]+")
+        self.regex_tokenizer = RegexpTokenizer(TOKEN_PATTERN)
         
         # 형태소 분석기 초기화
         self.porter_stemmer = PorterStemmer()
@@ -66,6 +101,14 @@ class EmmaWordCloud:
         self.tagged_tokens = None
         self.text = None
         self.freq_dist = None
+        self.analysis = None
+    
+    @property
+    def raw_text(self):
+        """말뭉치 원문 (태깅 캐시만 쓰는 경우에는 읽지 않음)"""
+        if self._raw_text is None:
+            self._raw_text = nltk.corpus.gutenberg.raw(self.corpus_name)
+        return self._raw_text
     
     def get_raw_text(self, length=None):
         """
@@ -232,11 +275,21 @@ class EmmaWordCloud:
         품사 태깅
         
         Args:
-            tokens: 태깅할 토큰 리스트 (None이면 전체 텍스트 사용)
+            tokens: 태깅할 토큰 리스트 (None이면 전체 텍스트 사용, 태깅 캐시 재사용)
             
         Returns:
             (단어, 품사) 튜플 리스트
         """
+        if tokens is None:
+            # 전체 텍스트 태깅은 디스크 캐시 사용 (말뭉치 + 태거 버전별로 한 번만 태깅)
+            self.tagged_tokens = self.load_analysis().tagged_tokens()
+            return self.tagged_tokens
+        self._ensure_tagger()
+        self.tagged_tokens = pos_tag(tokens)
+        return self.tagged_tokens
+    
+    def _ensure_tagger(self):
+        """품사 태거 리소스 확인 (없으면 다운로드)"""
         # 필요한 NLTK 데이터 확인 및 다운로드
         self._ensure_nltk_data()
         
@@ -255,11 +308,23 @@ class EmmaWordCloud:
                         nltk.download('averaged_perceptron_tagger', quiet=False)
                     except Exception as e:
                         raise RuntimeError(f"NLTK tagger 리소스를 다운로드할 수 없습니다: {e}")
+    
+    def _tag_corpus(self):
+        """전체 말뭉치 토큰화 + 품사 태깅 (캐시가 없을 때만 호출됨)"""
+        self._ensure_tagger()
+        return pos_tag(self.regex_tokenizer.tokenize(self.raw_text))
+    
+    def load_analysis(self):
+        """
+        전체 말뭉치 태깅 결과와 고유명사 빈도 (EmmaAnalysis)
         
-        if tokens is None:
-            tokens = self.regex_tokenizer.tokenize(self.raw_text)
-        self.tagged_tokens = pos_tag(tokens)
-        return self.tagged_tokens
+        처음 사용할 때 디스크 캐시(.cache/nlp)에서 읽고, 없으면 태깅 후 저장합니다.
+        """
+        if self.analysis is None:
+            self.analysis = get_emma_analysis_cache().load(
+                self.corpus_name, tagger_version(TOKEN_PATTERN), self._tag_corpus
+            )
+        return self.analysis
     
     def get_nouns(self, tagged_list=None):
         """
@@ -398,7 +463,9 @@ class EmmaWordCloud:
             FreqDist 객체
         """
         if self.tagged_tokens is None:
-            self.pos_tagging()
+            # 태깅 캐시에 저장된 고유명사 빈도 사용 (토큰 리스트를 만들지 않음)
+            self.freq_dist = self.load_analysis().names_freq_dist(self.stopwords)
+            return self.freq_dist
         
         names_list = [
             t[0] for t in self.tagged_tokens 
@@ -479,17 +546,16 @@ class EmmaWordCloud:
         Returns:
             분석 결과 딕셔너리
         """
-        # 토큰화
-        self.tokens = self.regex_tokenizer.tokenize(self.raw_text)
-        
-        # 품사 태깅
-        self.pos_tagging(self.tokens)
+        # 토큰화 + 품사 태깅 (디스크 캐시)
+        analysis = self.load_analysis()
+        self.tokens = analysis.tokens()
+        self.tagged_tokens = analysis.tagged_tokens()
         
         # Text 객체 생성
-        self.create_text_object()
+        self.text = Text(self.tokens, name="Emma")
         
         # 빈도 분포 생성
-        self.create_freq_dist_from_names()
+        self.freq_dist = analysis.names_freq_dist(self.stopwords)
         
         return {
             'total_tokens': len(self.tokens),
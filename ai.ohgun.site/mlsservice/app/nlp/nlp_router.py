@@ -3,13 +3,15 @@ NLP Router
 자연어 처리 관련 API 라우터
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi import APIRouter, HTTPException, Query, Request, UploadFile, File
+from fastapi.responses import JSONResponse, FileResponse, Response
 from typing import Optional, List
 from pydantic import BaseModel
 import base64
 import io
+import logging
 import os
+import threading
 from pathlib import Path
 from datetime import datetime
 from PIL import Image
@@ -17,20 +19,66 @@ import matplotlib
 matplotlib.use('Agg')  # GUI 백엔드 사용 안 함 (서버 환경)
 import matplotlib.pyplot as plt
 
-from .emma.emma_wordcloud import EmmaWordCloud
+from app.common.executor import get_executor
+from app.common.jobs import get_job_manager
+from .corpus.corpus_wordcloud import CorpusTooLargeError, CorpusWordCloud
+from .emma.emma_cache import get_emma_analysis_cache
+from .emma.emma_wordcloud import EmmaWordCloud, render_wordcloud_png
+from .render_cache import IMAGE_MEDIA_TYPES, RenderEntry, frequency_hash, get_render_cache, image_etag, render_key
+
+logger = logging.getLogger(__name__)
+
+# 이미지 URL (게이트웨이 경로 기준)
+EMMA_IMAGE_URL = "/api/ml/nlp/emma/image"
+CORPUS_IMAGE_URL = "/api/ml/nlp/corpus/image"
+SAVE_PREFIX = "emma_wordcloud"
+CORPUS_SAVE_PREFIX = "corpus_wordcloud"
+# 업로드 문서 크기 상한 (기본 1GB)
+MAX_UPLOAD_BYTES = int(os.getenv("MLS_NLP_MAX_UPLOAD_BYTES", str(1 << 30)))
+# 워드클라우드에 넘기는 상위 단어 수
+CORPUS_RENDER_WORDS = 1000
+# 옵션으로 요청한 이미지는 말뭉치/태거가 바뀌면 내용이 달라질 수 있으므로 짧게, 해시 URL 은 불변
+PARAM_CACHE_CONTROL = "public, max-age=3600"
+HASH_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
 # APIRouter 생성 (prefix와 tags 설정)
 nlp_router = APIRouter(prefix="/nlp", tags=["nlp"])
 
 # 서비스 인스턴스 생성
 _emma_instance: Optional[EmmaWordCloud] = None
+_emma_lock = threading.Lock()
 
 def get_emma_instance() -> EmmaWordCloud:
-    """EmmaWordCloud 싱글톤 인스턴스 반환"""
+    """EmmaWordCloud 싱글톤 인스턴스 반환 (실행기 스레드에서 동시에 호출될 수 있음)"""
     global _emma_instance
-    if _emma_instance is None:
-        _emma_instance = EmmaWordCloud()
-    return _emma_instance
+    with _emma_lock:
+        if _emma_instance is None:
+            _emma_instance = EmmaWordCloud()
+        return _emma_instance
+
+
+_emma_frequencies: Optional[dict] = None
+_emma_frequency_hash: Optional[str] = None
+
+
+def _get_emma_frequencies() -> dict:
+    """
+    Emma 고유명사 빈도 사전 반환
+    품사 태깅 결과와 빈도는 디스크 캐시(.cache/nlp)에서 처음 한 번만 읽고,
+    이후 렌더링은 메모리의 빈도 사전만 사용 (재시작 후에도 다시 태깅하지 않음)
+    """
+    global _emma_frequencies, _emma_frequency_hash
+    if _emma_frequencies is not None:
+        return _emma_frequencies
+    emma = get_emma_instance()
+    with _emma_lock:
+        if _emma_frequencies is None:
+            if emma.freq_dist is None:
+                emma.create_freq_dist_from_names()
+            frequencies = dict(emma.freq_dist)
+            _emma_frequency_hash = frequency_hash(frequencies)
+            _emma_frequencies = frequencies
+        return _emma_frequencies
 
 
 class WordCloudRequest(BaseModel):
@@ -51,9 +99,39 @@ async def nlp_root():
     }
 
 
-def _create_wordcloud_response(request: WordCloudRequest) -> dict:
+async def _emma_render_key(request: WordCloudRequest):
+    """요청 옵션의 렌더 키와 옵션 사전 (빈도 해시는 처음 한 번만 계산)"""
+    await get_executor().run_in_thread("nlp.emma", _get_emma_frequencies)
+    params = {
+        "width": request.width,
+        "height": request.height,
+        "background_color": request.background_color,
+        "random_state": request.random_state,
+    }
+    return render_key(_emma_frequency_hash, **params), params
+
+
+async def _render_emma(request: WordCloudRequest):
     """
-    워드클라우드 생성 공통 로직
+    Emma 워드클라우드 렌더링 결과 (RenderEntry, cached)
+    
+    품사 태깅/빈도 계산은 실행기 스레드에서, 렌더링은 프로세스 풀에서 수행하고
+    결과는 (빈도 해시 + 옵션) 키로 메모리에 캐시하여 같은 요청은 다시 그리지 않습니다.
+    """
+    executor = get_executor()
+    key, params = await _emma_render_key(request)
+    frequencies = _emma_frequencies
+    
+    async def render() -> bytes:
+        # 워드클라우드 렌더링 (PNG bytes)
+        return await executor.run_in_process("nlp.emma", render_wordcloud_png, frequencies, **params)
+    
+    return await get_render_cache().get_or_render(key, render, params, SAVE_PREFIX)
+
+
+async def _create_wordcloud_response(request: WordCloudRequest) -> dict:
+    """
+    워드클라우드 생성 공통 로직 (base64 JSON 응답)
     
     Args:
         request: WordCloudRequest 객체
@@ -61,57 +139,22 @@ def _create_wordcloud_response(request: WordCloudRequest) -> dict:
     Returns:
         응답 딕셔너리
     """
-    # EmmaWordCloud 인스턴스 가져오기
-    emma = get_emma_instance()
+    executor = get_executor()
+    cache = get_render_cache()
+    entry, cached = await _render_emma(request)
     
-    # 워드클라우드 생성 (show=False로 설정하여 화면에 표시하지 않음)
-    wc = emma.generate_wordcloud(
-        width=request.width,
-        height=request.height,
-        background_color=request.background_color,
-        random_state=request.random_state,
-        show=False
-    )
-    
-    # WordCloud 객체를 이미지로 변환
-    img = wc.to_image()
-    
-    # PIL Image를 bytes로 변환
-    img_buffer = io.BytesIO()
-    img.save(img_buffer, format='PNG')
-    img_bytes = img_buffer.getvalue()
-    
-    # base64로 인코딩
-    img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-    
-    # save 폴더에 이미지 저장
-    save_dir = Path(__file__).resolve().parent / "save"
-    save_dir.mkdir(exist_ok=True)  # 폴더가 없으면 생성
-    
-    # 파일명 생성 (타임스탬프 기반)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"emma_wordcloud_{timestamp}.png"
-    filepath = save_dir / filename
-    # 보기 좋은 상대 경로도 함께 반환 (프로젝트 루트 기준)
-    saved_path_relative = str(Path("app") / "nlp" / "save" / filename)
+    # base64로 인코딩 (렌더 결과당 한 번만 인코딩하여 캐시)
+    img_base64 = cache.variant(entry, "base64").decode('ascii')
     
-    # 이미지 저장
+    # save 폴더에 이미지 저장 (렌더 키 기반 파일명 - 같은 이미지는 한 번만 저장, 파일 수 상한 유지)
     try:
-        img.save(filepath, format='PNG')
-        # 저장 확인
-        if not filepath.exists():
-            raise Exception(f"파일 저장 실패: {filepath}")
+        filepath = await executor.run_in_thread("nlp.emma", cache.save, entry, SAVE_PREFIX)
     except Exception as e:
-        # 저장 실패 시 에러 로깅
-        import sys
-        print(f"이미지 저장 오류: {e}", file=sys.stderr)
-        print(f"저장 시도 경로: {filepath}", file=sys.stderr)
-        print(f"저장 디렉토리 존재 여부: {save_dir.exists()}", file=sys.stderr)
-        print(f"저장 디렉토리 경로: {save_dir}", file=sys.stderr)
+        logger.error(f"이미지 저장 오류: {e} (저장 디렉토리: {cache.save_dir})")
         raise
-    
-    # matplotlib figure 정리
-    plt.close('all')
+    filename = filepath.name
+    # 보기 좋은 상대 경로도 함께 반환 (프로젝트 루트 기준)
+    saved_path_relative = str(Path("app") / "nlp" / "save" / filename)
     
     return {
         "success": True,
@@ -123,10 +166,26 @@ def _create_wordcloud_response(request: WordCloudRequest) -> dict:
         "background_color": request.background_color,
         "saved_path": str(filepath),
         "saved_path_relative": saved_path_relative,
-        "filename": filename
+        "filename": filename,
+        "image_hash": entry.key,
+        "cached": cached
     }
 
 
+async def _emma_job(width: int = 1000, height: int = 600, background_color: str = "white",
+                   random_state: int = 0) -> dict:
+    request = WordCloudRequest(
+        width=width,
+        height=height,
+        background_color=background_color,
+        random_state=random_state
+    )
+    return await _create_wordcloud_response(request)
+
+
+get_job_manager().register("nlp.emma", _emma_job, description="Emma 워드클라우드 생성")
+
+
 @nlp_router.get("/emma")
 async def generate_emma_wordcloud(
     width: Optional[int] = Query(1000, description="워드클라우드 너비 (기본값: 1000)"),
@@ -138,6 +197,8 @@ async def generate_emma_wordcloud(
     Emma 소설 워드클라우드 생성
     
     GET 요청으로 쿼리 파라미터를 사용하여 워드클라우드를 생성합니다.
+    이미지만 필요하면 base64 가 없는 /nlp/emma/image (PNG/WebP, ETag) 또는
+    /nlp/emma/meta (해시 URL 참조) 를 사용하세요.
     
     Args:
         width: 워드클라우드 너비 (기본값: 1000)
@@ -161,7 +222,7 @@ async def generate_emma_wordcloud(
             background_color=background_color,
             random_state=random_state
         )
-        result = _create_wordcloud_response(request)
+        result = await _create_wordcloud_response(request)
         return JSONResponse(status_code=200, content=result)
     except Exception as e:
         plt.close('all')
@@ -171,6 +232,261 @@ async def generate_emma_wordcloud(
         )
 
 
+def _if_none_match(request: Request, etag: str) -> bool:
+    """If-None-Match 가 ETag 와 일치하는지 (* 포함)"""
+    if_none_match = request.headers.get("if-none-match", "")
+    return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+
+def _negotiate_format(request: Request, format: str) -> str:
+    """format=auto 이면 Accept 헤더에 image/webp 가 있을 때 webp, 아니면 png"""
+    if format != "auto":
+        return format
+    return "webp" if "image/webp" in request.headers.get("accept", "") else "png"
+
+
+async def _image_response(request: Request, entry: RenderEntry, format: str, cache_control: str,
+                          vary_accept: bool = False) -> Response:
+    """렌더 결과를 PNG/WebP 바이너리로 응답 (ETag 가 일치하면 304)"""
+    headers = {
+        "ETag": entry.etag(format),
+        "Cache-Control": cache_control,
+        "X-Image-Hash": entry.key,
+    }
+    if vary_accept:
+        headers["Vary"] = "Accept"
+    if _if_none_match(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    cache = get_render_cache()
+    if format == "png":
+        body = entry.png
+    else:
+        body = await get_executor().run_in_thread("nlp.emma", cache.variant, entry, format)
+    return Response(content=body, media_type=IMAGE_MEDIA_TYPES[format], headers=headers)
+
+
+@nlp_router.get("/emma/image")
+async def get_emma_wordcloud_image(
+    request: Request,
+    width: Optional[int] = Query(1000, description="워드클라우드 너비 (기본값: 1000)"),
+    height: Optional[int] = Query(600, description="워드클라우드 높이 (기본값: 600)"),
+    background_color: Optional[str] = Query("white", description="배경색 (기본값: white)"),
+    random_state: Optional[int] = Query(0, description="랜덤 시드 (기본값: 0)"),
+    format: str = Query("png", pattern="^(png|webp|auto)$", description="이미지 형식 (png, webp, auto - Accept 헤더 기준)")
+):
+    """
+    Emma 워드클라우드 이미지를 바이너리(image/png, image/webp)로 반환
+    
+    base64 JSON 대신 이미지를 그대로 보내며, 렌더 키 기반 강한 ETag 를 붙입니다.
+    If-None-Match 가 일치하면 렌더링 없이 304 를 반환합니다.
+    """
+    try:
+        wordcloud_request = WordCloudRequest(width=width, height=height,
+                                             background_color=background_color, random_state=random_state)
+        fmt = _negotiate_format(request, format)
+        key, _ = await _emma_render_key(wordcloud_request)
+        etag = image_etag(key, fmt)
+        if _if_none_match(request, etag):
+            headers = {"ETag": etag, "Cache-Control": PARAM_CACHE_CONTROL, "X-Image-Hash": key}
+            if format == "auto":
+                headers["Vary"] = "Accept"
+            return Response(status_code=304, headers=headers)
+        entry, _ = await _render_emma(wordcloud_request)
+        return await _image_response(request, entry, fmt, PARAM_CACHE_CONTROL, vary_accept=format == "auto")
+    except Exception as e:
+        plt.close('all')
+        raise HTTPException(
+            status_code=500,
+            detail=f"워드클라우드 생성 중 오류 발생: {str(e)}"
+        )
+
+
+async def _hash_image_response(request: Request, image_name: str, prefix: str) -> Response:
+    """
+    렌더 키로 이미지 응답 ({image_hash}.png / {image_hash}.webp, immutable 캐시)
+    메모리 캐시에서 빠진 이미지는 save 폴더에 남아 있으면 복원합니다.
+    렌더 캐시는 emma/corpus 가 함께 쓰므로 prefix 가 같은 항목만 반환합니다.
+    """
+    image_hash, _, ext = image_name.partition(".")
+    fmt = ext.lower() or "png"
+    if fmt not in IMAGE_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 이미지 형식입니다: {ext} (지원: png, webp)")
+    if len(image_hash) != 64 or any(c not in "0123456789abcdef" for c in image_hash):
+        raise HTTPException(status_code=400, detail="잘못된 이미지 해시입니다.")
+
+    etag = image_etag(image_hash, fmt)
+    if _if_none_match(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": HASH_CACHE_CONTROL,
+                                                  "X-Image-Hash": image_hash})
+    cache = get_render_cache()
+    entry = cache.get(image_hash)
+    if entry is not None and entry.prefix != prefix:
+        entry = None
+    if entry is None:
+        entry = await get_executor().run_in_thread("nlp.emma", cache.load_saved, image_hash, prefix)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"이미지를 찾을 수 없습니다: {image_hash}")
+    return await _image_response(request, entry, fmt, HASH_CACHE_CONTROL)
+
+
+@nlp_router.get("/emma/image/{image_name}")
+async def get_emma_wordcloud_image_by_hash(request: Request, image_name: str):
+    """
+    렌더 키(image_hash)로 워드클라우드 이미지 조회 (예: {image_hash}.png, {image_hash}.webp)
+    
+    같은 해시는 항상 같은 이미지이므로 immutable 로 캐시할 수 있습니다.
+    """
+    return await _hash_image_response(request, image_name, SAVE_PREFIX)
+
+
+@nlp_router.get("/emma/meta")
+async def get_emma_wordcloud_meta(
+    width: Optional[int] = Query(1000, description="워드클라우드 너비 (기본값: 1000)"),
+    height: Optional[int] = Query(600, description="워드클라우드 높이 (기본값: 600)"),
+    background_color: Optional[str] = Query("white", description="배경색 (기본값: white)"),
+    random_state: Optional[int] = Query(0, description="랜덤 시드 (기본값: 0)")
+):
+    """
+    Emma 워드클라우드 메타데이터 (이미지는 해시 URL 로 참조)
+    
+    Returns:
+        {
+            "success": bool,
+            "image_hash": str - 렌더 키,
+            "images": {"png": {"url", "etag", "size"}, "webp": {"url", "etag"}},
+            "width", "height", "background_color", "random_state", "cached"
+        }
+    """
+    try:
+        wordcloud_request = WordCloudRequest(width=width, height=height,
+                                             background_color=background_color, random_state=random_state)
+        entry, cached = await _render_emma(wordcloud_request)
+        # 해시 URL 로 조회할 때 메모리에서 빠져 있어도 복원할 수 있도록 저장
+        await get_executor().run_in_thread("nlp.emma", get_render_cache().save, entry, SAVE_PREFIX)
+        images = {}
+        for fmt in IMAGE_MEDIA_TYPES:
+            images[fmt] = {
+                "url": f"{EMMA_IMAGE_URL}/{entry.key}.{fmt}",
+                "media_type": IMAGE_MEDIA_TYPES[fmt],
+                "etag": entry.etag(fmt),
+                "size": len(entry.png) if fmt == "png" else (len(entry.variants[fmt]) if fmt in entry.variants else None),
+            }
+        return {
+            "success": True,
+            "image_hash": entry.key,
+            "images": images,
+            **wordcloud_request.model_dump(),
+            "cached": cached,
+        }
+    except Exception as e:
+        plt.close('all')
+        raise HTTPException(
+            status_code=500,
+            detail=f"워드클라우드 생성 중 오류 발생: {str(e)}"
+        )
+
+
+@nlp_router.post("/corpus/wordcloud")
+async def generate_corpus_wordcloud(
+    request: Request,
+    file: UploadFile = File(..., description="텍스트 문서 (영어/한국어, utf-8/utf-16/cp949)"),
+    language: str = Query("auto", pattern="^(auto|en|ko)$", description="언어 (auto - 한글 비율로 판별)"),
+    encoding: str = Query("auto", pattern="^(auto|utf-8|utf-8-sig|utf-16|cp949|euc-kr)$", description="문자 인코딩 (auto - BOM/디코딩으로 판별)"),
+    width: int = Query(1000, ge=100, le=4000, description="워드클라우드 너비"),
+    height: int = Query(600, ge=100, le=4000, description="워드클라우드 높이"),
+    background_color: str = Query("white", description="배경색"),
+    random_state: int = Query(0, description="랜덤 시드"),
+    top: int = Query(20, ge=0, le=1000, description="응답에 포함할 상위 단어 수"),
+    format: str = Query("json", pattern="^(json|png|webp)$", description="응답 형식 (json - 메타데이터 + 이미지 해시 URL, png/webp - 이미지)")
+):
+    """
+    업로드한 문서로 워드클라우드 생성
+    
+    문서를 1MB 청크 단위로 읽으면서 디코딩/토큰화하여 빈도 표에 누적하므로
+    100MB 이상의 문서도 청크 하나와 빈도 표 상한(MLS_NLP_CORPUS_MAX_TERMS)만큼의 메모리만 사용합니다.
+    언어는 첫 청크의 한글 비율로 판별하여 영어(정규식 토큰 + 불용어)/한국어(Okt 명사 + 불용어) 파이프라인을 고릅니다.
+    렌더링 결과는 (빈도 해시 + 옵션) 키로 캐시되며 이미지는 /nlp/corpus/image/{image_hash}.png 로 조회합니다.
+    """
+    executor = get_executor()
+    try:
+        counter = CorpusWordCloud(language=language, encoding=encoding, max_bytes=MAX_UPLOAD_BYTES)
+        counted = await executor.run_in_thread("nlp.corpus", counter.count_stream, file.file)
+        frequencies = dict(counted["counter"].most_common(CORPUS_RENDER_WORDS))
+        if not frequencies:
+            raise HTTPException(status_code=400, detail="문서에서 단어를 찾을 수 없습니다.")
+
+        params = {
+            "width": width,
+            "height": height,
+            "background_color": background_color,
+            "random_state": random_state,
+            "font_path": counted["font_path"],
+        }
+
+        async def render() -> bytes:
+            return await executor.run_in_process("nlp.corpus", render_wordcloud_png, frequencies, **params)
+
+        cache = get_render_cache()
+        entry, cached = await cache.get_or_render(render_key(frequency_hash(frequencies), **params), render, params,
+                                                  CORPUS_SAVE_PREFIX)
+        if format != "json":
+            return await _image_response(request, entry, format, HASH_CACHE_CONTROL)
+        # 해시 URL 로 조회할 때 메모리에서 빠져 있어도 복원할 수 있도록 저장
+        await executor.run_in_thread("nlp.corpus", cache.save, entry, CORPUS_SAVE_PREFIX)
+
+        bounded = counted["counter"]
+        return {
+            "success": True,
+            "filename": file.filename,
+            "language": counted["language"],
+            "encoding": counted["encoding"],
+            "analyzer": counted["analyzer"],
+            "bytes": counted["bytes"],
+            "chunks": counted["chunks"],
+            "count_seconds": counted["seconds"],
+            "tokens": bounded.total,
+            "unique_terms": len(bounded),
+            "exact": bounded.exact,
+            "error_bound": bounded.error_bound,
+            "top_words": [{"word": w, "count": c} for w, c in bounded.most_common(top)],
+            "image_hash": entry.key,
+            "images": {fmt: {"url": f"{CORPUS_IMAGE_URL}/{entry.key}.{fmt}", "etag": entry.etag(fmt)}
+                       for fmt in IMAGE_MEDIA_TYPES},
+            "cached": cached,
+        }
+    except HTTPException:
+        raise
+    except CorpusTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except (LookupError, ValueError) as e:
+        # 잘못된 인코딩/언어 지정
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        plt.close('all')
+        raise HTTPException(
+            status_code=500,
+            detail=f"워드클라우드 생성 중 오류 발생: {str(e)}"
+        )
+    finally:
+        await file.close()
+
+
+@nlp_router.get("/corpus/image/{image_name}")
+async def get_corpus_wordcloud_image(request: Request, image_name: str):
+    """업로드 문서 워드클라우드 이미지 조회 ({image_hash}.png, {image_hash}.webp)"""
+    return await _hash_image_response(request, image_name, CORPUS_SAVE_PREFIX)
+
+
+@nlp_router.get("/emma/cache")
+async def get_emma_cache_stats():
+    """워드클라우드 렌더 캐시(메모리 LRU)와 Emma 태깅 캐시(디스크) 상태"""
+    return {
+        "success": True,
+        "render_cache": get_render_cache().stats(),
+        "analysis_cache": get_emma_analysis_cache().stats(),
+    }
+
+
 @nlp_router.get("/emma/saved")
 async def get_saved_wordclouds():
     """
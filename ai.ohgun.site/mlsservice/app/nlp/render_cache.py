@@ -0,0 +1,262 @@
+"""
+Render Cache
+워드클라우드 렌더링 결과(PNG bytes) 메모리 캐시
+
+- 캐시 키: 빈도 사전 해시 + 렌더 옵션(width, height, background_color, random_state, font ...)
+  → 같은 입력이면 같은 키 (내용 주소 방식), 키가 같으면 이미지도 같음
+- 바이트 크기 기준 LRU: 전체 PNG 크기가 상한을 넘으면 가장 오래 안 쓴 항목부터 제거
+- 같은 키를 동시에 요청하면 한 번만 렌더링하고 나머지는 결과를 기다림
+- save 폴더에는 {prefix}_{전체 키}.png 로 한 번만 저장하고, 파일 수 상한을 넘으면 오래된 파일부터 삭제
+- 항목마다 만든 쪽(save prefix: emma/corpus)을 기록하여 해시 URL 은 자기 쪽 이미지만 반환
+- WebP/base64 같은 파생 인코딩도 항목에 함께 보관 (크기는 LRU 바이트에 포함)
+"""
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = int(os.getenv("MLS_NLP_RENDER_CACHE_BYTES", str(64 * 1024 * 1024)))
+DEFAULT_SAVE_MAX_FILES = int(os.getenv("MLS_NLP_SAVE_MAX_FILES", "200"))
+SAVE_DIR = Path(__file__).resolve().parent / "save"
+
+# 이미지 응답 형식 → 미디어 타입
+IMAGE_MEDIA_TYPES = {
+    "png": "image/png",
+    "webp": "image/webp",
+}
+
+
+def encode_variant(png: bytes, name: str) -> bytes:
+    """PNG bytes → 파생 인코딩 (webp: 무손실 WebP, base64: ASCII bytes)"""
+    if name == "png":
+        return png
+    if name == "base64":
+        return base64.b64encode(png)
+    if name == "webp":
+        buffer = io.BytesIO()
+        with Image.open(io.BytesIO(png)) as image:
+            image.save(buffer, format="WEBP", lossless=True, method=4)
+        return buffer.getvalue()
+    raise ValueError(f"지원하지 않는 이미지 형식입니다: {name}")
+
+
+def image_etag(key: str, name: str = "png") -> str:
+    """강한 ETag (렌더 키 + 형식 - 키가 같으면 바이트도 같음)"""
+    return f'"{key}"' if name == "png" else f'"{key}.{name}"'
+
+
+def frequency_hash(frequencies: Mapping[str, Any]) -> str:
+    """빈도 사전 해시 (항목 순서 포함 - 빈도가 같은 단어의 배치 순서에 영향을 줌)"""
+    payload = json.dumps(list(frequencies.items()), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_key(freq_hash: str, **params: Any) -> str:
+    """빈도 해시 + 렌더 옵션 → 렌더 캐시 키"""
+    payload = json.dumps({"frequencies": freq_hash, **params}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RenderEntry:
+    """렌더링된 이미지 하나"""
+
+    def __init__(self, key: str, png: bytes, params: Dict[str, Any], prefix: Optional[str] = None) -> None:
+        self.key = key
+        self.png = png
+        self.params = params
+        # 이미지를 만든 쪽 (save 파일 prefix - emma_wordcloud / corpus_wordcloud)
+        self.prefix = prefix
+        self.created_at = datetime.now().isoformat(timespec="seconds")
+        self.hits = 0
+        # 파생 인코딩 (webp, base64)
+        self.variants: Dict[str, bytes] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.png) + sum(len(v) for v in self.variants.values())
+
+    def etag(self, name: str = "png") -> str:
+        return image_etag(self.key, name)
+
+
+class RenderCache:
+    """바이트 크기 상한이 있는 PNG LRU 캐시"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, save_dir: Optional[Path] = SAVE_DIR,
+                 save_max_files: int = DEFAULT_SAVE_MAX_FILES) -> None:
+        self.max_bytes = max_bytes
+        self.save_dir = Path(save_dir) if save_dir is not None else None
+        self.save_max_files = save_max_files
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, RenderEntry]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future"] = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[RenderEntry]:
+        """캐시된 항목 반환 (최근 사용으로 갱신), 없으면 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.hits += 1
+                self.hits += 1
+            return entry
+
+    def put(self, key: str, png: bytes, params: Dict[str, Any], prefix: Optional[str] = None) -> RenderEntry:
+        """항목 추가 후 바이트 상한을 넘으면 오래 안 쓴 항목부터 제거 (상한보다 큰 이미지는 보관하지 않음)"""
+        entry = RenderEntry(key, png, params, prefix)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous.size
+            if entry.size <= self.max_bytes:
+                self._entries[key] = entry
+                self.total_bytes += entry.size
+            self._evict()
+        return entry
+
+    def variant(self, entry: RenderEntry, name: str) -> bytes:
+        """파생 인코딩 반환 (처음 요청할 때만 인코딩하고 항목에 보관)"""
+        data = entry.png if name == "png" else entry.variants.get(name)
+        if data is not None:
+            return data
+        data = encode_variant(entry.png, name)
+        with self._lock:
+            if name not in entry.variants:
+                entry.variants[name] = data
+                if self._entries.get(entry.key) is entry:
+                    self.total_bytes += len(data)
+                    self._evict()
+        return data
+
+    def _evict(self) -> None:
+        # 락 안에서 호출
+        while self.total_bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= evicted.size
+            self.evictions += 1
+
+    async def get_or_render(self, key: str, render: Callable[[], Awaitable[bytes]],
+                            params: Optional[Dict[str, Any]] = None, prefix: Optional[str] = None):
+        """
+        캐시에 있으면 바로, 없으면 render() 로 만든 뒤 캐시에 넣고 반환
+        (prefix: 이미지를 만든 쪽의 save 파일 prefix)
+
+        Returns:
+            (RenderEntry, cached 여부)
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return entry, True
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # 같은 키를 렌더링 중이면 그 결과를 기다림
+            return await asyncio.shield(inflight), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            with self._lock:
+                self.misses += 1
+            png = await render()
+            entry = self.put(key, png, params or {}, prefix)
+            future.set_result(entry)
+            return entry, False
+        except BaseException as e:
+            future.set_exception(e)
+            # 기다리는 요청이 없으면 예외를 소비하여 경고가 남지 않도록 함
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def save(self, entry: RenderEntry, prefix: str) -> Path:
+        """
+        save 폴더에 {prefix}_{전체 렌더 키}.png 로 저장 (이미 있으면 다시 쓰지 않음)
+        파일 수가 상한을 넘으면 오래된 파일부터 삭제합니다.
+        """
+        if self.save_dir is None:
+            raise RuntimeError("save 폴더가 설정되지 않았습니다.")
+        self.save_dir.mkdir(parents=True, exist_ok=True)
+        filepath = self._saved_path(entry.key, prefix)
+        if not filepath.exists():
+            tmp_path = filepath.with_suffix(".png.tmp")
+            tmp_path.write_bytes(entry.png)
+            tmp_path.replace(filepath)
+            self.prune_saved()
+        return filepath
+
+    def _saved_path(self, key: str, prefix: str) -> Path:
+        return self.save_dir / f"{prefix}_{key}.png"
+
+    def load_saved(self, key: str, prefix: str) -> Optional[RenderEntry]:
+        """
+        메모리에서 빠진 렌더 결과를 save 폴더 파일로 복원
+        파일 이름의 전체 렌더 키가 요청한 키와 같을 때만 캐시에 넣음 (없으면 None)
+        """
+        if self.save_dir is None or len(key) != 64 or any(c not in "0123456789abcdef" for c in key):
+            return None
+        filepath = self._saved_path(key, prefix)
+        if not filepath.exists():
+            return None
+        return self.put(key, filepath.read_bytes(), {}, prefix)
+
+    def prune_saved(self) -> int:
+        """save 폴더 PNG 가 save_max_files 개를 넘으면 오래된 파일부터 삭제 (삭제한 개수 반환)"""
+        if self.save_dir is None or not self.save_dir.exists():
+            return 0
+        files = sorted(self.save_dir.glob("*.png"), key=lambda f: f.stat().st_mtime, reverse=True)
+        removed = 0
+        for old in files[self.save_max_files:]:
+            try:
+                old.unlink()
+                removed += 1
+            except OSError as e:
+                logger.warning(f"오래된 워드클라우드 파일 삭제 실패: {old} ({e})")
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "rendering": len(self._inflight),
+                "save_max_files": self.save_max_files,
+            }
+
+
+_render_cache: Optional[RenderCache] = None
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> RenderCache:
+    """워드클라우드 렌더 캐시 싱글톤 인스턴스 반환"""
+    global _render_cache
+    with _render_cache_lock:
+        if _render_cache is None:
+            _render_cache = RenderCache()
+        return _render_cache
@@ -0,0 +1,205 @@
+"""
+Okt Noun Extractor
+어절 단위 명사 추출의 배치/병렬/캐시 버전
+
+SamsungWordCloud.extract_noun 은 어절마다 okt.pos 를 호출하여 어절 수만큼 Python↔JVM 왕복이 생깁니다.
+이 모듈은 같은 결과(어절별 Noun 형태소를 이어 붙인 문자열)를 다음 방식으로 만듭니다.
+
+- 캐시: 어절 → 명사 문자열. 처음 보는 어절만 분석 (보고서 텍스트는 같은 어절이 반복되는 비율이 높음)
+- 배치: 분석할 어절을 공백으로 이어 붙여 BATCH_CHARS 글자 단위로 한 번에 okt.pos 호출 후
+  형태소 표면형 길이로 어절 경계를 다시 나눔 (Okt 는 공백 단위 청크를 독립적으로 분석하므로 결과가 같음)
+  형태소가 원문과 맞지 않는 배치는 어절별 분석으로 대체하여 결과 동일성 유지
+- 병렬: 분석할 어절이 PARALLEL_MIN_TOKENS 개 이상이면 프로세스 풀 워커(워커마다 Okt 하나)에 나눠 보냄
+"""
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from app.common.executor import get_executor
+
+logger = logging.getLogger(__name__)
+
+BATCH_CHARS = int(os.getenv("MLS_OKT_BATCH_CHARS", "4000"))
+DEFAULT_CACHE_SIZE = int(os.getenv("MLS_OKT_CACHE_SIZE", "500000"))
+# 워커 JVM 시작 비용보다 분석량이 많을 때만 병렬 처리
+PARALLEL_MIN_TOKENS = int(os.getenv("MLS_OKT_PARALLEL_MIN_TOKENS", "20000"))
+NOUN_TAG = "Noun"
+
+
+def _new_okt():
+    from konlpy.tag import Okt
+    return Okt()
+
+
+def _align(morphs: Sequence, eojeols: Sequence[str]) -> Optional[List[str]]:
+    """
+    배치 분석 결과(형태소 목록)를 어절별 명사 문자열로 나눔
+    형태소 표면형이 어절 경계를 넘거나 원문과 다르면 None
+    """
+    result: List[str] = []
+    index, offset = 0, 0
+    nouns: List[str] = []
+    for surface, tag in morphs:
+        if not surface.strip():
+            continue
+        if index >= len(eojeols):
+            return None
+        eojeol = eojeols[index]
+        if eojeol[offset:offset + len(surface)] != surface:
+            return None
+        if tag == NOUN_TAG:
+            nouns.append(surface)
+        offset += len(surface)
+        if offset == len(eojeol):
+            result.append("".join(nouns))
+            nouns, index, offset = [], index + 1, 0
+    return result if index == len(eojeols) and offset == 0 else None
+
+
+def analyze_eojeols(okt, eojeols: Sequence[str], batch_chars: int = BATCH_CHARS) -> List[str]:
+    """어절 목록 → 어절별 명사 문자열 (BATCH_CHARS 글자 단위 배치로 okt.pos 호출)"""
+    result: List[str] = []
+    start = 0
+    while start < len(eojeols):
+        end, size = start, 0
+        while end < len(eojeols) and (end == start or size + len(eojeols[end]) + 1 <= batch_chars):
+            size += len(eojeols[end]) + 1
+            end += 1
+        batch = eojeols[start:end]
+        aligned = _align(okt.pos(" ".join(batch)), batch)
+        if aligned is None:
+            # 배치 분석 결과를 어절로 나눌 수 없으면 어절별 분석 (기존 방식)
+            aligned = ["".join(w for w, t in okt.pos(e) if t == NOUN_TAG) for e in batch]
+        result.extend(aligned)
+        start = end
+    return result
+
+
+# 프로세스 풀 워커마다 하나씩 만드는 Okt (JVM 은 워커가 살아 있는 동안 재사용)
+_worker_okt = None
+
+
+def analyze_eojeols_in_worker(eojeols: List[str], batch_chars: int = BATCH_CHARS) -> List[str]:
+    """프로세스 풀 워커용 (모듈 레벨 함수, 인자/반환값은 문자열 리스트)"""
+    global _worker_okt
+    if _worker_okt is None:
+        _worker_okt = _new_okt()
+    return analyze_eojeols(_worker_okt, eojeols, batch_chars)
+
+
+class NounExtractor:
+    """
+    어절 → 명사 추출기 (캐시 + 배치 + 프로세스 병렬)
+
+    사용 예:
+        nouns = get_noun_extractor().extract(tokens)   # SamsungWordCloud.extract_noun 과 같은 명사 목록
+    """
+
+    def __init__(self, okt=None, batch_chars: int = BATCH_CHARS, cache_size: int = DEFAULT_CACHE_SIZE,
+                 parallel_min_tokens: int = PARALLEL_MIN_TOKENS, workers: Optional[int] = None) -> None:
+        self._okt = okt
+        self.batch_chars = batch_chars
+        self.cache_size = cache_size
+        self.parallel_min_tokens = parallel_min_tokens
+        self.workers = workers
+        self._cache: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._okt_lock = threading.Lock()
+        self._analyze_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.batches_parallel = 0
+        self.analyzed_seconds = 0.0
+
+    @property
+    def okt(self):
+        with self._okt_lock:
+            if self._okt is None:
+                self._okt = _new_okt()
+            return self._okt
+
+    def _worker_count(self) -> int:
+        if self.workers is not None:
+            return self.workers
+        return get_executor().process_workers
+
+    def _analyze_parallel(self, eojeols: List[str], workers: int) -> List[str]:
+        size = -(-len(eojeols) // workers)
+        futures = [
+            get_executor().submit_process(analyze_eojeols_in_worker, eojeols[i:i + size], self.batch_chars)
+            for i in range(0, len(eojeols), size)
+        ]
+        self.batches_parallel += len(futures)
+        return [nouns for future in futures for nouns in future.result()]
+
+    def analyze(self, eojeols: Iterable[str]) -> Dict[str, str]:
+        """
+        어절별 명사 문자열 (캐시에 없는 어절만 중복 없이 분석)
+        """
+        unique = list(dict.fromkeys(eojeols))
+        with self._lock:
+            result = {e: self._cache[e] for e in unique if e in self._cache}
+            missing = [e for e in unique if e not in result]
+            self.hits += len(result)
+            self.misses += len(missing)
+        if not missing:
+            return result
+
+        started = time.perf_counter()
+        workers = self._worker_count()
+        if workers > 1 and len(missing) >= self.parallel_min_tokens:
+            analyzed = self._analyze_parallel(missing, workers)
+        else:
+            okt = self.okt
+            # 같은 Okt(JVM) 인스턴스는 한 스레드씩 사용
+            with self._analyze_lock:
+                analyzed = analyze_eojeols(okt, missing, self.batch_chars)
+        self.analyzed_seconds += time.perf_counter() - started
+
+        fresh = dict(zip(missing, analyzed))
+        with self._lock:
+            self._cache.update(fresh)
+            # 상한을 넘으면 먼저 들어온 어절부터 제거
+            overflow = len(self._cache) - self.cache_size
+            if overflow > 0:
+                for key in list(self._cache)[:overflow]:
+                    del self._cache[key]
+        result.update(fresh)
+        return result
+
+    def extract(self, tokens: Sequence[str]) -> List[str]:
+        """
+        어절 목록 → 명사 토큰 목록 (어절별 Noun 형태소를 이어 붙이고 2글자 이상만, 원래 순서)
+        """
+        nouns = self.analyze(tokens)
+        return [noun for noun in (nouns[t] for t in tokens) if len(noun) > 1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cached_eojeols": len(self._cache),
+                "cache_size": self.cache_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "parallel_batches": self.batches_parallel,
+                "analyzed_seconds": round(self.analyzed_seconds, 4),
+            }
+
+
+_noun_extractor: Optional[NounExtractor] = None
+_noun_extractor_lock = threading.Lock()
+
+
+def get_noun_extractor() -> NounExtractor:
+    """공용 명사 추출기 싱글톤 인스턴스 반환 (어절 캐시 공유)"""
+    global _noun_extractor
+    with _noun_extractor_lock:
+        if _noun_extractor is None:
+            _noun_extractor = NounExtractor()
+        return _noun_extractor
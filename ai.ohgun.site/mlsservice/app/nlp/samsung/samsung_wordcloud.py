@@ -8,12 +8,17 @@ from konlpy.tag import Okt
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 
+from .noun_extractor import NounExtractor
+
 logger = logging.getLogger(__name__)
 
 class SamsungWordCloud:
   
-    def __init__(self):
+    def __init__(self, batched: bool = True):
         self.okt = Okt()
+        # 어절 캐시 + 배치 분석 (batched=False 이면 어절마다 okt.pos 호출하는 기존 방식)
+        self.batched = batched
+        self.noun_extractor = NounExtractor(okt=self.okt)
     
     def text_process(self):
         """전체 텍스트 처리 파이프라인"""
@@ -58,11 +63,15 @@ class SamsungWordCloud:
         hangeul_text = self.extract_hangeul(text)
         tokens = self.change_token(hangeul_text)
         
-        for i in tokens:
-            pos_result = self.okt.pos(i)
-            temp = [j[0] for j in pos_result if j[1] == 'Noun']
-            if len(''.join(temp)) > 1:
-                noun_tokens.append(''.join(temp))
+        if self.batched:
+            # 처음 보는 어절만 배치로 분석 (분석량이 많으면 프로세스 풀 병렬)
+            noun_tokens = self.noun_extractor.extract(tokens)
+        else:
+            for i in tokens:
+                pos_result = self.okt.pos(i)
+                temp = [j[0] for j in pos_result if j[1] == 'Noun']
+                if len(''.join(temp)) > 1:
+                    noun_tokens.append(''.join(temp))
         
         texts = ' '.join(noun_tokens)
         logger.info(f"명사 추출 완료: {len(noun_tokens)}개")
@@ -0,0 +1,153 @@
+"""
+Geocode Cache
+카카오 로컬 API 응답을 SQLite 에 저장하는 영구 지오코딩 캐시
+
+- 키: (검색 종류(address/keyword), 정규화된 검색어)
+- 결과가 있는 응답은 KAKAO_GEOCODE_TTL(초, 기본 30일) 동안 재사용
+- 결과가 없는 응답(documents=[])도 KAKAO_GEOCODE_NEGATIVE_TTL(초, 기본 1일) 동안 캐시하여
+  실패하는 후보 검색어를 매번 다시 호출하지 않음
+- 네트워크/HTTP 오류는 캐시하지 않음
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+# mlsservice/.cache/geocode.sqlite3
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / ".cache" / "geocode.sqlite3"
+DEFAULT_TTL = 30 * 24 * 3600
+DEFAULT_NEGATIVE_TTL = 24 * 3600
+
+PathLike = Union[str, Path]
+
+
+def normalize_query(query: str) -> str:
+    """검색어 정규화 (NFKC, 앞뒤 공백 제거, 연속 공백 축소, 소문자)"""
+    text = unicodedata.normalize("NFKC", str(query)).strip().lower()
+    return re.sub(r"\s+", " ", text)
+
+
+class GeocodeCache:
+    """SQLite 기반 지오코딩 응답 캐시"""
+
+    def __init__(self, db_path: Optional[PathLike] = None,
+                 ttl: Optional[float] = None, negative_ttl: Optional[float] = None) -> None:
+        self.db_path = Path(db_path or os.getenv("KAKAO_GEOCODE_CACHE", str(DEFAULT_CACHE_PATH)))
+        self.ttl = float(ttl if ttl is not None else os.getenv("KAKAO_GEOCODE_TTL", DEFAULT_TTL))
+        self.negative_ttl = float(
+            negative_ttl if negative_ttl is not None else os.getenv("KAKAO_GEOCODE_NEGATIVE_TTL", DEFAULT_NEGATIVE_TTL)
+        )
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS geocode (
+                    kind TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    empty INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (kind, query)
+                )
+                """
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, kind: str, query: str) -> Optional[Dict[str, Any]]:
+        """만료되지 않은 캐시 응답 반환 (없으면 None)"""
+        key = normalize_query(query)
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT response, empty, created_at FROM geocode WHERE kind = ? AND query = ?",
+                (kind, key),
+            ).fetchone()
+            if row is not None:
+                response, empty, created_at = row
+                ttl = self.negative_ttl if empty else self.ttl
+                if time.time() - created_at < ttl:
+                    if empty:
+                        self.negative_hits += 1
+                    else:
+                        self.hits += 1
+                    return json.loads(response)
+            self.misses += 1
+            return None
+
+    def set(self, kind: str, query: str, response: Dict[str, Any]) -> None:
+        """응답 저장 (documents 가 비어 있으면 negative 항목)"""
+        empty = 0 if response.get("documents") else 1
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO geocode (kind, query, response, empty, created_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, normalize_query(query), json.dumps(response, ensure_ascii=False), empty, time.time()),
+            )
+            conn.commit()
+            self.stores += 1
+
+    def purge_expired(self) -> int:
+        """만료된 항목 삭제 (삭제한 개수 반환)"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "DELETE FROM geocode WHERE (empty = 0 AND created_at < ?) OR (empty = 1 AND created_at < ?)",
+                (now - self.ttl, now - self.negative_ttl),
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM geocode")
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, negative = 0, 0
+            if self.db_path.exists():
+                entries, negative = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(empty), 0) FROM geocode"
+                ).fetchone()
+            return {
+                "db_path": str(self.db_path),
+                "ttl_seconds": self.ttl,
+                "negative_ttl_seconds": self.negative_ttl,
+                "entries": entries,
+                "negative_entries": negative,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+            }
+
+
+_geocode_cache: Optional[GeocodeCache] = None
+_geocode_cache_lock = threading.Lock()
+
+
+def get_geocode_cache() -> GeocodeCache:
+    """지오코딩 캐시 싱글톤 인스턴스 반환"""
+    global _geocode_cache
+    with _geocode_cache_lock:
+        if _geocode_cache is None:
+            _geocode_cache = GeocodeCache()
+        return _geocode_cache
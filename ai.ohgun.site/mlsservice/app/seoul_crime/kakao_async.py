@@ -0,0 +1,250 @@
+"""
+Kakao Async Geocoder
+httpx 기반 비동기 카카오 로컬 API 클라이언트
+
+- 이벤트 루프마다 커넥션 풀을 유지하는 httpx.AsyncClient 하나를 재사용 (요청마다 TLS 핸드셰이크 없음)
+- asyncio.Semaphore 로 동시 요청 수 제한 (KAKAO_MAX_CONCURRENCY, 기본 8)
+- 토큰 버킷으로 초당 요청 수 제한 (KAKAO_RATE_PER_SECOND, 기본 10, 버스트 KAKAO_RATE_BURST)
+  버킷은 스레드/루프와 무관하게 프로세스 전체에서 공유
+- 429/5xx/네트워크 오류는 지수 백오프 + 지터로 재시도 (KAKAO_MAX_RETRIES, 기본 3, Retry-After 헤더 우선)
+- 응답은 동기 클라이언트(KakaoMapSingleton)와 같은 GeocodeCache 에 저장
+  (SQLite 캐시 읽기/쓰기는 실행기의 I/O 풀에서 실행하여 이벤트 루프를 막지 않음)
+- batch() 는 N 개 검색어를 병렬로 처리하고 입력 순서대로 결과 반환
+"""
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import httpx
+
+from app.common.executor import get_executor
+
+from .geocode_cache import GeocodeCache, get_geocode_cache
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 0.5  # 초
+BACKOFF_MAX = 8.0  # 초
+
+Query = Union[str, Tuple[str, str]]
+
+
+class TokenBucket:
+    """
+    초당 rate 개, 최대 capacity 개까지 모아 둘 수 있는 토큰 버킷
+    (threading.Lock 으로 시간만 계산하고 대기는 asyncio.sleep 으로 하므로 여러 루프에서 공유 가능)
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """토큰 하나를 예약하고 사용 가능해질 때까지 기다릴 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class AsyncKakaoGeocoder:
+    """카카오 로컬 API 비동기 클라이언트"""
+
+    def __init__(self, api_key: str, base_url: str,
+                 cache: Optional[GeocodeCache] = None,
+                 max_concurrency: Optional[int] = None,
+                 rate_per_second: Optional[float] = None,
+                 burst: Optional[float] = None,
+                 max_retries: Optional[int] = None,
+                 timeout: float = 10.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Authorization": f"KakaoAK {api_key}"}
+        self.cache = cache if cache is not None else get_geocode_cache()
+        self.max_concurrency = max_concurrency or int(os.getenv("KAKAO_MAX_CONCURRENCY", "8"))
+        rate = rate_per_second if rate_per_second is not None else float(os.getenv("KAKAO_RATE_PER_SECOND", "10"))
+        burst = burst if burst is not None else float(os.getenv("KAKAO_RATE_BURST", str(max(1.0, rate))))
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("KAKAO_MAX_RETRIES", "3"))
+        self.timeout = timeout
+        # 테스트에서 httpx.MockTransport 등으로 교체 (None 이면 기본 네트워크 전송)
+        self.transport = transport
+        # 이벤트 루프별 (클라이언트, 세마포어) — httpx/asyncio 객체는 생성된 루프에서만 사용 가능
+        self._loop_state: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.network_calls = 0
+        self.retries = 0
+
+    def _state(self) -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        state = self._loop_state.get(loop)
+        if state is None or state[0].is_closed:
+            client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=self.timeout,
+                transport=self.transport,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            state = (client, asyncio.Semaphore(self.max_concurrency))
+            self._loop_state[loop] = state
+        return state
+
+    @staticmethod
+    def _backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(BACKOFF_MAX, float(retry_after))
+            except ValueError:
+                pass
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+
+    async def search(self, kind: str, query: str) -> Dict[str, Any]:
+        """
+        검색 (kind: "address" 또는 "keyword")
+
+        캐시에 있으면 네트워크 호출 없이 반환하고, 없으면 API 호출 후 캐시에 저장합니다.
+        """
+        executor = get_executor()
+        cached = await executor.to_thread(self.cache.get, kind, query)
+        if cached is not None:
+            return cached
+
+        client, semaphore = self._state()
+        attempt = 0
+        while True:
+            async with semaphore:
+                await self.bucket.acquire()
+                self.network_calls += 1
+                try:
+                    response = await client.get(f"/search/{kind}.json", params={"query": query})
+                except httpx.TransportError as e:
+                    response, error = None, e
+                else:
+                    error = None
+                    if response.status_code not in RETRY_STATUS:
+                        break
+
+            if attempt >= self.max_retries:
+                if response is not None:
+                    break
+                raise Exception(f"카카오맵 API 호출 중 오류 발생: {str(error)}")
+            delay = self._backoff(attempt, response.headers.get("Retry-After") if response is not None else None)
+            attempt += 1
+            self.retries += 1
+            logger.warning(f"카카오맵 API 재시도 {attempt}/{self.max_retries} ({kind}: {query}) {delay:.2f}초 후")
+            await asyncio.sleep(delay)
+
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"카카오맵 API 호출 중 오류 발생: {str(e)}")
+        result = response.json()
+        await executor.to_thread(self.cache.set, kind, query, result)
+        return result
+
+    async def geocode(self, address: str) -> Dict[str, Any]:
+        """주소 → 좌표"""
+        return await self.search("address", address)
+
+    async def search_keyword(self, keyword: str) -> Dict[str, Any]:
+        """키워드 장소 검색"""
+        return await self.search("keyword", keyword)
+
+    async def first_match(self, candidates: Sequence[Tuple[str, str]]) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+        """
+        후보 (kind, query) 를 순서대로 시도하여 결과가 있는 첫 응답과 시도한 후보 목록 반환
+        """
+        tried: List[Tuple[str, str]] = []
+        result: Dict[str, Any] = {"documents": []}
+        for kind, query in candidates:
+            tried.append((kind, query))
+            result = await self.search(kind, query)
+            if result.get("documents"):
+                break
+        return result, tried
+
+    async def batch(self, queries: Sequence[Query], kind: str = "address",
+                    return_exceptions: bool = False) -> List[Any]:
+        """
+        N 개 검색어를 병렬로 처리하고 입력 순서대로 결과 반환
+
+        Args:
+            queries: 검색어 목록 (문자열이면 kind 사용, (kind, query) 튜플도 가능)
+            kind: 기본 검색 종류
+            return_exceptions: True 이면 실패한 항목 자리에 예외 객체를 넣어 반환
+        """
+        def _split(item: Query) -> Tuple[str, str]:
+            return item if isinstance(item, tuple) else (kind, item)
+
+        return await asyncio.gather(
+            *(self.search(*_split(item)) for item in queries),
+            return_exceptions=return_exceptions,
+        )
+
+    async def aclose(self) -> None:
+        """현재 루프의 커넥션 풀 종료"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        state = self._loop_state.pop(loop, None)
+        if state is not None:
+            await state[0].aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "max_concurrency": self.max_concurrency,
+            "rate_per_second": self.bucket.rate,
+            "burst": self.bucket.capacity,
+            "max_retries": self.max_retries,
+            "network_calls": self.network_calls,
+            "retries": self.retries,
+            "open_clients": len(self._loop_state),
+        }
+
+
+_async_geocoder: Optional[AsyncKakaoGeocoder] = None
+_async_geocoder_lock = threading.Lock()
+
+
+def get_async_geocoder() -> AsyncKakaoGeocoder:
+    """비동기 지오코더 싱글톤 인스턴스 반환 (API 키/기본 URL 은 KakaoMapSingleton 설정 사용)"""
+    global _async_geocoder
+    with _async_geocoder_lock:
+        if _async_geocoder is None:
+            from .kakao_map_singleton import KakaoMapSingleton
+            kakao = KakaoMapSingleton()
+            _async_geocoder = AsyncKakaoGeocoder(kakao.get_api_key(), kakao._base_url, cache=kakao._cache)
+        return _async_geocoder
+
+
+def peek_async_geocoder() -> Optional[AsyncKakaoGeocoder]:
+    """생성된 경우에만 비동기 지오코더 반환 (종료 처리/상태 조회용)"""
+    return _async_geocoder
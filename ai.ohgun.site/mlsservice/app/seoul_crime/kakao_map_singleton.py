@@ -1,10 +1,14 @@
 import os
 from pathlib import Path
 import requests
+from .geocode_cache import get_geocode_cache
+
+# 로컬 목(mock) 서버로 테스트할 때는 KAKAO_BASE_URL=http://127.0.0.1:8081/v2/local 처럼 지정
+DEFAULT_BASE_URL = "https://dapi.kakao.com/v2/local"
 
 class KakaoMapSingleton:
     _instance = None  # 싱글턴 인스턴스를 저장할 클래스 변수
-    _base_url = "https://dapi.kakao.com/v2/local"
+    _base_url = os.getenv("KAKAO_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
 
     def __new__(cls):
         if cls._instance is None:  # 인스턴스가 없으면 생성
@@ -13,6 +17,10 @@ class KakaoMapSingleton:
             cls._instance._headers = {
                 "Authorization": f"KakaoAK {cls._instance._api_key}"
             }
+            cls._instance._session = requests.Session()  # 커넥션 재사용 (요청마다 TLS 핸드셰이크 방지)
+            cls._instance._session.headers.update(cls._instance._headers)
+            cls._instance._cache = get_geocode_cache()  # 영구 지오코딩 캐시
+            cls._instance.network_calls = 0
         return cls._instance  # 기존 인스턴스 반환
 
     def _retrieve_api_key(self):
@@ -53,17 +61,7 @@ class KakaoMapSingleton:
         Returns:
             카카오맵 API 응답 데이터
         """
-        url = f"{self._base_url}/search/address.json"
-        params = {
-            "query": address
-        }
-        
-        try:
-            response = requests.get(url, headers=self._headers, params=params)
-            response.raise_for_status()  # HTTP 에러 발생 시 예외 발생
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"카카오맵 API 호출 중 오류 발생: {str(e)}")
+        return self._search("address", address)
     
     def search_keyword(self, keyword, language='ko'):
         """
@@ -77,15 +75,29 @@ class KakaoMapSingleton:
         Returns:
             카카오맵 API 응답 데이터
         """
-        url = f"{self._base_url}/search/keyword.json"
+        return self._search("keyword", keyword)
+
+    def _search(self, kind, query):
+        """
+        캐시를 먼저 확인하고, 없을 때만 카카오 로컬 API 호출 후 응답을 캐시에 저장
+        (결과 없음 응답도 negative 캐시로 저장, 오류는 저장하지 않음)
+        """
+        cached = self._cache.get(kind, query)
+        if cached is not None:
+            return cached
+
+        url = f"{self._base_url}/search/{kind}.json"
         params = {
-            "query": keyword
+            "query": query
         }
         
         try:
-            response = requests.get(url, headers=self._headers, params=params)
+            self.network_calls += 1
+            response = self._session.get(url, params=params, timeout=10)
             response.raise_for_status()  # HTTP 에러 발생 시 예외 발생
-            return response.json()
+            result = response.json()
         except requests.exceptions.RequestException as e:
             raise Exception(f"카카오맵 API 호출 중 오류 발생: {str(e)}")
-
+        
+        self._cache.set(kind, query, result)
+        return result
@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 import re
 from pathlib import Path
+from app.common.dataset_cache import get_dataset_cache
+from app.common.frame_cache import get_frame_cache
 from .seoul_dataset import DataSets
 
 class SeoulMethod(object): 
@@ -27,7 +29,8 @@ class SeoulMethod(object):
         if not cctv_path.exists():
             raise FileNotFoundError(f"CCTV 파일을 찾을 수 없습니다: {cctv_path}")
         
-        df = pd.read_csv(cctv_path)
+        # 같은 요청 안에서 여러 번 호출되므로 프레임 캐시(경로+mtime)에서 복사본을 반환
+        df = get_frame_cache().get(cctv_path, get_dataset_cache().read_csv, variant="csv")
         self.dataset.cctv = df
         return df
 
@@ -43,7 +46,7 @@ class SeoulMethod(object):
         if not crime_path.exists():
             raise FileNotFoundError(f"범죄 파일을 찾을 수 없습니다: {crime_path}")
         
-        df = pd.read_csv(crime_path)
+        df = get_frame_cache().get(crime_path, get_dataset_cache().read_csv, variant="csv")
         self.dataset.crime = df
         return df
     
@@ -58,6 +61,19 @@ class SeoulMethod(object):
         if not pop_path.exists():
             raise FileNotFoundError(f"인구 파일을 찾을 수 없습니다: {pop_path}")
         
+        # XLS 파싱과 행/컬럼 정리는 느리므로 정리된 결과를 데이터셋 캐시에 저장
+        df = get_frame_cache().get(pop_path, self._load_population_cached, variant="population")
+        
+        self.dataset.population = df
+        return df
+    
+    @classmethod
+    def _load_population_cached(cls, pop_path: Path) -> pd.DataFrame:
+        return get_dataset_cache().read(pop_path, cls._read_population, variant="population:header=2:v1")
+
+    @staticmethod
+    def _read_population(pop_path: Path) -> pd.DataFrame:
+        """pop.xls 원본을 읽어 자치구별 인구 컬럼만 남긴 데이터프레임"""
         # XLS 파일 읽기 (header=2로 헤더 위치 지정)
         df = pd.read_excel(pop_path, header=2)
         
@@ -73,8 +89,6 @@ class SeoulMethod(object):
             # 자치구부터 5개 컬럼만 선택 (자치구, 세대, 계, 남자, 여자)
             cols_to_keep = df.columns[district_idx:district_idx+5].tolist()
             df = df[cols_to_keep]
-        
-        self.dataset.population = df
         return df
     
     def df_merge(self, df1: pd.DataFrame, df2: pd.DataFrame, feature: str) -> pd.DataFrame:
@@ -3,62 +3,30 @@ Seoul Crime Router
 서울 범죄 데이터 관련 API 라우터
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
+from typing import Any, Callable, Dict, List, Optional
 import pandas as pd
 import os
 import sys
-import io
 import traceback
-from contextlib import redirect_stdout, redirect_stderr
 from pathlib import Path
+from app.common.executor import get_executor
+from app.common.export import export_response, iter_frame_chunks
+from app.common.frame_cache import get_frame_cache
+from app.common.frame_query import (
+    DEFAULT_LIMIT, MAX_LIMIT, CursorExpired, QueryError,
+    decode_cursor, encode_cursor, parse_columns, parse_predicate, parse_sort, run_query,
+)
+from app.common.serializer import to_json_records
+from app.common.jobs import get_job_manager
+from app.common.log_capture import capture_logs
+from .geocode_cache import get_geocode_cache
+from .kakao_async import peek_async_geocoder
 from .seoul_service import SeoulService
+from .seoul_store import SeoulSnapshot, get_seoul_store
 
 
-class TeeOutput:
-    """
-    출력을 버퍼와 실제 stdout/stderr 둘 다에 전달하는 클래스
-    ic() 등 모든 출력이 터미널에도 표시되도록 함
-    """
-    def __init__(self, buffer, original_stream):
-        self.buffer = buffer
-        self.original_stream = original_stream
-        # 원본 스트림의 속성들을 복사
-        self.mode = getattr(original_stream, 'mode', None)
-        self.name = getattr(original_stream, 'name', None)
-        self.encoding = getattr(original_stream, 'encoding', None)
-        self.errors = getattr(original_stream, 'errors', None)
-        self.closed = getattr(original_stream, 'closed', False)
-    
-    def write(self, text):
-        # 버퍼에 저장 (API 응답용)
-        if text:
-            self.buffer.write(text)
-            # 실제 stdout/stderr에도 출력 (터미널 로그용 - Docker 컨테이너 로그)
-            self.original_stream.write(text)
-            self.original_stream.flush()
-    
-    def flush(self):
-        self.buffer.flush()
-        if hasattr(self.original_stream, 'flush'):
-            self.original_stream.flush()
-    
-    def writable(self):
-        return True
-    
-    def readable(self):
-        return False
-    
-    def seekable(self):
-        return False
-    
-    def __getattr__(self, name):
-        """
-        다른 속성/메서드는 원본 스트림에서 가져옴
-        (ic() 등이 사용할 수 있는 모든 메서드 지원)
-        """
-        return getattr(self.original_stream, name)
-
 # APIRouter 생성 (prefix와 tags 설정)
 seoul_router = APIRouter(prefix="/seoul", tags=["seoul"])
 
@@ -93,40 +61,42 @@ async def preview_data():
     Returns:
         각 데이터의 상위 5개 행과 기본 정보
     """
-    try:
-        service = get_service()
-        log_buffer = io.StringIO()
-        
-        # stdout과 stderr를 캡처
-        with redirect_stdout(log_buffer), redirect_stderr(log_buffer):
-            try:
-                result = service.show_data_preview()
-            except Exception as inner_e:
-                # 내부 에러도 로그에 포함
-                traceback.print_exc(file=log_buffer)
-                raise inner_e
-        
-        # 캡처된 로그 가져오기
-        logs = log_buffer.getvalue()
-        
-        # 로그를 리스트로 변환 (빈 줄 제거)
-        log_lines = [line for line in logs.split('\n') if line.strip()]
-        
-        return {
-            "message": "데이터 미리보기 완료",
-            "status": "success",
-            "result": result,
-            "logs": log_lines
-        }
-    except Exception as e:
-        error_trace = traceback.format_exc()
-        return {
-            "message": "데이터 미리보기 중 오류 발생",
-            "status": "error",
-            "error": str(e),
-            "error_trace": error_trace.split('\n'),
-            "logs": []
-        }
+    # 이 요청에서 발생한 서비스 로그만 수집 (전역 stdout 은 건드리지 않음)
+    with capture_logs() as request_log:
+        try:
+            result = await get_executor().run_in_thread("seoul.data", get_service().show_data_preview)
+            return {
+                "message": "데이터 미리보기 완료",
+                "status": "success",
+                "result": result,
+                "logs": request_log.lines()
+            }
+        except Exception as e:
+            error_trace = traceback.format_exc()
+            return {
+                "message": "데이터 미리보기 중 오류 발생",
+                "status": "error",
+                "error": str(e),
+                "error_trace": error_trace.split('\n'),
+                "logs": request_log.lines()
+            }
+
+
+@seoul_router.get("/cache")
+async def get_frame_cache_stats():
+    """
+    CCTV/범죄/인구 프레임 캐시와 지오코딩 캐시 상태 조회
+    
+    파일별 hits/misses/parses 를 반환합니다. 원본 파일이 바뀌지 않았다면 parses 는 1 이어야 합니다.
+    geocode 는 카카오 API 응답 캐시(SQLite)의 항목 수와 적중 횟수입니다.
+    """
+    geocoder = peek_async_geocoder()
+    return {
+        "success": True,
+        "cache": get_frame_cache().stats(),
+        "geocode": get_geocode_cache().stats(),
+        "geocoder": geocoder.stats() if geocoder is not None else None,
+    }
 
 
 @seoul_router.get("/data/cctv")
@@ -139,23 +109,11 @@ async def get_cctv_data():
     """
     try:
         service = get_service()
-        df_cctv = service.method.load_cctv()
-        
-        # NaN, inf 값을 None으로 변환하여 JSON 직렬화 가능하게 함
-        df_cctv = df_cctv.replace([float('inf'), float('-inf')], None)
-        df_cctv = df_cctv.where(pd.notna(df_cctv), None)
-        
-        # 상위 5개 선택
-        top_5 = df_cctv.head(5)
-        
-        # DataFrame을 딕셔너리 리스트로 변환
-        cctv_list = top_5.to_dict(orient='records')
+        # 파일 로드/머지는 실행기 스레드에서 수행 (이벤트 루프 블로킹 방지)
+        df_cctv = await get_executor().run_in_thread("seoul.data", service.method.load_cctv)
         
-        # 딕셔너리 내부의 모든 값도 확인하여 inf, nan 처리
-        for record in cctv_list:
-            for key, value in record.items():
-                if pd.isna(value) or (isinstance(value, float) and (value == float('inf') or value == float('-inf'))):
-                    record[key] = None
+        # 상위 5개만 JSON 직렬화 가능한 레코드로 변환 (NaN/inf → None, 벡터 연산)
+        cctv_list = to_json_records(df_cctv.head(5))
         
         return {
             "success": True,
@@ -182,23 +140,11 @@ async def get_crime_data():
     """
     try:
         service = get_service()
-        df_crime = service.method.load_crime()
+        # 파일 로드/머지는 실행기 스레드에서 수행 (이벤트 루프 블로킹 방지)
+        df_crime = await get_executor().run_in_thread("seoul.data", service.method.load_crime)
         
-        # NaN, inf 값을 None으로 변환하여 JSON 직렬화 가능하게 함
-        df_crime = df_crime.replace([float('inf'), float('-inf')], None)
-        df_crime = df_crime.where(pd.notna(df_crime), None)
-        
-        # 상위 5개 선택
-        top_5 = df_crime.head(5)
-        
-        # DataFrame을 딕셔너리 리스트로 변환
-        crime_list = top_5.to_dict(orient='records')
-        
-        # 딕셔너리 내부의 모든 값도 확인하여 inf, nan 처리
-        for record in crime_list:
-            for key, value in record.items():
-                if pd.isna(value) or (isinstance(value, float) and (value == float('inf') or value == float('-inf'))):
-                    record[key] = None
+        # 상위 5개만 JSON 직렬화 가능한 레코드로 변환 (NaN/inf → None, 벡터 연산)
+        crime_list = to_json_records(df_crime.head(5))
         
         return {
             "success": True,
@@ -225,23 +171,11 @@ async def get_population_data():
     """
     try:
         service = get_service()
-        df_population = service.method.load_population()
-        
-        # NaN, inf 값을 None으로 변환하여 JSON 직렬화 가능하게 함
-        df_population = df_population.replace([float('inf'), float('-inf')], None)
-        df_population = df_population.where(pd.notna(df_population), None)
-        
-        # 상위 5개 선택
-        top_5 = df_population.head(5)
+        # 파일 로드/머지는 실행기 스레드에서 수행 (이벤트 루프 블로킹 방지)
+        df_population = await get_executor().run_in_thread("seoul.data", service.method.load_population)
         
-        # DataFrame을 딕셔너리 리스트로 변환
-        population_list = top_5.to_dict(orient='records')
-        
-        # 딕셔너리 내부의 모든 값도 확인하여 inf, nan 처리
-        for record in population_list:
-            for key, value in record.items():
-                if pd.isna(value) or (isinstance(value, float) and (value == float('inf') or value == float('-inf'))):
-                    record[key] = None
+        # 상위 5개만 JSON 직렬화 가능한 레코드로 변환 (NaN/inf → None, 벡터 연산)
+        population_list = to_json_records(df_population.head(5))
         
         return {
             "success": True,
@@ -258,41 +192,69 @@ async def get_population_data():
         )
 
 
+async def _current_snapshot() -> SeoulSnapshot:
+    """최신 머지 스냅샷 (입력 파일이 바뀐 경우에만 실행기 스레드에서 다시 머지)"""
+    store = get_seoul_store()
+    snapshot = store.current()
+    if snapshot is None:
+        snapshot = await get_executor().run_in_thread("seoul.data", store.snapshot)
+    return snapshot
+
+
+async def _snapshot_or_404(label: str) -> SeoulSnapshot:
+    """최신 머지 스냅샷 (입력 파일이 없으면 404, 그 밖의 머지 오류는 500)"""
+    try:
+        return await _current_snapshot()
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"{label} 조회 중 오류 발생: {str(e)}")
+
+
+def _etag_response(request: Request, snapshot: SeoulSnapshot, name: str, key: tuple,
+                   build: Callable[[], Dict[str, Any]]) -> Response:
+    """
+    스냅샷 버전 기반 ETag 응답
+    - If-None-Match 가 현재 ETag 와 같으면 본문 없이 304
+    - 아니면 스냅샷에 캐시된 JSON 본문 반환 (버전당 한 번만 직렬화)
+    """
+    etag = snapshot.etag(name)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "X-Data-Version": snapshot.version}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.payload(key, build), media_type="application/json", headers=headers)
+
+
+def _head_payload(snapshot: SeoulSnapshot, name: str) -> Callable[[], Dict[str, Any]]:
+    def build() -> Dict[str, Any]:
+        df = snapshot.frames[name]
+        records = to_json_records(df.head(5))
+        return {
+            "success": True,
+            "version": snapshot.version,
+            "count": len(records),
+            "total_rows": len(df),
+            "columns": df.columns.tolist(),
+            "data": records
+        }
+    return build
+
+
 @seoul_router.get("/data/merged")
-async def get_merged_data():
+async def get_merged_data(request: Request):
     """
     CCTV와 인구 데이터 머지 결과 조회 (상위 5개)
     
+    머지 결과는 입력 파일이 바뀔 때만 다시 계산됩니다. 응답의 ETag 를 If-None-Match 로
+    보내면 데이터가 그대로일 때 본문 없이 304 를 반환합니다.
+    
     Returns:
         머지된 데이터의 상위 5개 행
     """
     try:
-        service = get_service()
-        df_merged = service.method.merge_cctv_pop()
-        
-        # NaN, inf 값을 None으로 변환하여 JSON 직렬화 가능하게 함
-        df_merged = df_merged.replace([float('inf'), float('-inf')], None)
-        df_merged = df_merged.where(pd.notna(df_merged), None)
-        
-        # 상위 5개 선택
-        top_5 = df_merged.head(5)
-        
-        # DataFrame을 딕셔너리 리스트로 변환
-        merged_list = top_5.to_dict(orient='records')
-        
-        # 딕셔너리 내부의 모든 값도 확인하여 inf, nan 처리
-        for record in merged_list:
-            for key, value in record.items():
-                if pd.isna(value) or (isinstance(value, float) and (value == float('inf') or value == float('-inf'))):
-                    record[key] = None
-        
-        return {
-            "success": True,
-            "count": len(merged_list),
-            "total_rows": len(df_merged),
-            "columns": df_merged.columns.tolist(),
-            "data": merged_list
-        }
+        snapshot = await _current_snapshot()
+        return _etag_response(request, snapshot, "cctv_pop", ("cctv_pop", "head"), _head_payload(snapshot, "cctv_pop"))
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -303,46 +265,273 @@ async def get_merged_data():
 
 
 @seoul_router.get("/data/crime-cctv")
-async def get_crime_cctv_merged_data():
+async def get_crime_cctv_merged_data(request: Request):
     """
     범죄와 CCTV 데이터 머지 결과 조회 (상위 5개)
     
+    /data/merged 와 같이 버전 기반 ETag/304 를 지원합니다.
+    
     Returns:
         머지된 데이터의 상위 5개 행 (관서명, 기관명, CCTV_소계, 범죄 데이터...)
     """
     try:
-        service = get_service()
-        df_merged = service.method.merge_crime_cctv()
-        
-        # NaN, inf 값을 None으로 변환하여 JSON 직렬화 가능하게 함
-        df_merged = df_merged.replace([float('inf'), float('-inf')], None)
-        df_merged = df_merged.where(pd.notna(df_merged), None)
-        
-        # 상위 5개 선택
-        top_5 = df_merged.head(5)
-        
-        # DataFrame을 딕셔너리 리스트로 변환
-        merged_list = top_5.to_dict(orient='records')
-        
-        # 딕셔너리 내부의 모든 값도 확인하여 inf, nan 처리
-        for record in merged_list:
-            for key, value in record.items():
-                if pd.isna(value) or (isinstance(value, float) and (value == float('inf') or value == float('-inf'))):
-                    record[key] = None
-        
+        snapshot = await _current_snapshot()
+        return _etag_response(request, snapshot, "crime_cctv", ("crime_cctv", "head"), _head_payload(snapshot, "crime_cctv"))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"범죄-CCTV 머지 데이터 조회 중 오류 발생: {str(e)}"
+        )
+
+
+@seoul_router.get("/data/merged-all")
+async def get_merged_all_data(request: Request):
+    """
+    범죄+CCTV+인구 통합 데이터 전체 조회 (지오코딩 제외)
+    
+    버전 기반 ETag/304 를 지원하므로 대시보드 폴링에 사용할 수 있습니다.
+    """
+    try:
+        snapshot = await _current_snapshot()
+
+        def build() -> Dict[str, Any]:
+            df = snapshot.frames["merged"]
+            return {
+                "success": True,
+                "version": snapshot.version,
+                "count": len(df),
+                "columns": df.columns.tolist(),
+                "data": to_json_records(df)
+            }
+
+        return _etag_response(request, snapshot, "merged", ("merged", "all"), build)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"통합 데이터 조회 중 오류 발생: {str(e)}"
+        )
+
+
+@seoul_router.get("/data/stations/{station}")
+async def get_station_data(station: str, request: Request):
+    """
+    관서명(경찰서)으로 통합 데이터 한 행 조회 (관서명 인덱스 사용)
+    
+    Args:
+        station: 관서명 (예: 강남서)
+    """
+    snapshot = await _snapshot_or_404("관서 데이터")
+    if station not in snapshot.by_station.index:
+        raise HTTPException(status_code=404, detail=f"관서를 찾을 수 없습니다: {station}")
+
+    def build() -> Dict[str, Any]:
+        rows = snapshot.by_station.loc[[station]]
+        return {"success": True, "version": snapshot.version, "data": to_json_records(rows)[0]}
+
+    return _etag_response(request, snapshot, f"station:{station}", ("station", station), build)
+
+
+@seoul_router.get("/data/districts/{district}")
+async def get_district_data(district: str, request: Request):
+    """
+    기관명(자치구)으로 통합 데이터 조회 (기관명 인덱스 사용, 한 구에 여러 관서가 있을 수 있음)
+    
+    Args:
+        district: 기관명 (예: 강남구)
+    """
+    snapshot = await _snapshot_or_404("자치구 데이터")
+    if district not in snapshot.by_district.index:
+        raise HTTPException(status_code=404, detail=f"자치구를 찾을 수 없습니다: {district}")
+
+    def build() -> Dict[str, Any]:
+        rows = to_json_records(snapshot.by_district.loc[[district]])
+        return {"success": True, "version": snapshot.version, "count": len(rows), "data": rows}
+
+    return _etag_response(request, snapshot, f"district:{district}", ("district", district), build)
+
+
+@seoul_router.get("/data/version")
+async def get_data_version():
+    """현재 머지 스냅샷의 버전, 입력 파일 정보, 빌드 횟수"""
+    snapshot = await _snapshot_or_404("데이터 버전")
+    return {"success": True, **get_seoul_store().stats(), "version": snapshot.version}
+
+
+# 조회 가능한 데이터셋과 구/관서명 필터가 적용되는 컬럼
+QUERY_DATASETS = {
+    "cctv": {"district": "기관명", "station": None},
+    "crime": {"district": None, "station": "관서명"},
+    "population": {"district": "자치구", "station": None},
+    "cctv_pop": {"district": "구", "station": None},
+    "crime_cctv": {"district": "기관명", "station": "관서명"},
+    "merged": {"district": "기관명", "station": "관서명"},
+}
+
+
+def _query_dataset(dataset: str, columns: Optional[str], districts: Optional[List[str]],
+                   stations: Optional[List[str]], where: List[str], sort: Optional[str],
+                   limit: int, offset: int, cursor: Optional[str]) -> Dict[str, Any]:
+    """캐시된 프레임에 조회 조건을 적용 (실행기 스레드에서 실행)"""
+    spec = QUERY_DATASETS[dataset]
+    store = get_seoul_store()
+    if dataset in ("cctv", "crime", "population"):
+        loader = getattr(store.method, f"load_{dataset}")
+        df, version = loader(), store.version()
+    else:
+        snapshot = store.snapshot()
+        df, version = snapshot.frames[dataset], snapshot.version
+
+    predicates = [parse_predicate(text) for text in where]
+    for values, key, label in ((districts, "district", "구"), (stations, "station", "관서명")):
+        if values:
+            if spec[key] is None:
+                raise QueryError(f"{dataset} 데이터셋은 {label} 필터를 지원하지 않습니다.")
+            predicates.append((spec[key], "in", ",".join(values)))
+    if cursor:
+        offset = decode_cursor(cursor, version)
+
+    page, total = run_query(df, parse_columns(columns), predicates, parse_sort(sort), limit, offset)
+    next_offset = offset + len(page)
+    return {
+        "success": True,
+        "dataset": dataset,
+        "version": version,
+        "total": total,
+        "count": len(page),
+        "offset": offset,
+        "limit": limit,
+        "next_cursor": encode_cursor(next_offset, version) if next_offset < total else None,
+        "columns": page.columns.tolist(),
+        "data": to_json_records(page),
+    }
+
+
+@seoul_router.get("/query/{dataset}")
+async def query_dataset(
+    dataset: str,
+    columns: Optional[str] = Query(None, description="반환할 컬럼 (쉼표 구분, 예: 관서명,CCTV_소계)"),
+    districts: Optional[List[str]] = Query(None, alias="구", description="자치구 필터 (여러 번 지정 가능)"),
+    stations: Optional[List[str]] = Query(None, alias="관서명", description="관서명 필터 (여러 번 지정 가능)"),
+    where: List[str] = Query([], description="조건 컬럼:연산자:값 (eq, ne, gt, ge, lt, le, in, contains, startswith, isnull, notnull)"),
+    sort: Optional[str] = Query(None, description="정렬 컬럼 (쉼표 구분, - 접두사는 내림차순, 예: -CCTV_소계)"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT, description="페이지 크기"),
+    offset: int = Query(0, ge=0, description="시작 위치"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (offset 대신 사용)")
+):
+    """
+    서울 데이터셋 범용 조회 (컬럼 선택, 조건, 정렬, 페이지네이션)
+    
+    dataset: cctv, crime, population, cctv_pop, crime_cctv, merged
+    
+    예시:
+        /seoul/query/merged?구=강남구&구=서초구&columns=관서명,기관명,CCTV_소계
+        /seoul/query/crime?where=살인 발생:ge:5&sort=-절도 발생&limit=10
+    
+    캐시된 프레임에 벡터 연산으로 조건을 적용하고 요청한 페이지/컬럼만 직렬화합니다.
+    next_cursor 는 데이터 버전을 포함하므로 입력 파일이 바뀌면 409 를 반환합니다.
+    """
+    if dataset not in QUERY_DATASETS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"지원하지 않는 데이터셋입니다: {dataset} (지원: {', '.join(QUERY_DATASETS)})"
+        )
+    try:
+        return await get_executor().run_in_thread(
+            "seoul.data", _query_dataset, dataset, columns, districts, stations, where, sort, limit, offset, cursor
+        )
+    except CursorExpired as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"데이터 조회 중 오류 발생: {str(e)}"
+        )
+
+
+def _export_frame(dataset: str):
+    """내보낼 캐시 프레임과 데이터 버전 (실행기 스레드에서 실행)"""
+    store = get_seoul_store()
+    if dataset in ("cctv", "crime", "population"):
+        return getattr(store.method, f"load_{dataset}")(), store.version()
+    snapshot = store.snapshot()
+    return snapshot.frame(dataset), snapshot.version
+
+
+@seoul_router.get("/export/{dataset}")
+async def export_dataset(
+    request: Request,
+    dataset: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="출력 형식 (ndjson, csv)"),
+    compress: bool = Query(True, description="Accept-Encoding: gzip 이면 gzip 으로 전송")
+):
+    """
+    서울 데이터셋 전체 스트리밍 다운로드
+    
+    dataset: cctv, crime, population, cctv_pop, crime_cctv, merged
+    
+    캐시된 프레임을 복사하지 않고 청크 단위로 직렬화하여 내보냅니다.
+    X-Data-Version 헤더는 /seoul/data/version 의 버전과 같습니다.
+    """
+    if dataset not in QUERY_DATASETS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"지원하지 않는 데이터셋입니다: {dataset} (지원: {', '.join(QUERY_DATASETS)})"
+        )
+    try:
+        df, version = await get_executor().run_in_thread("seoul.data", _export_frame, dataset)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"데이터 조회 중 오류 발생: {str(e)}"
+        )
+    # 엑셀에서 바로 열 수 있도록 CSV 는 UTF-8 BOM 포함
+    return export_response(
+        request, lambda: iter_frame_chunks(df), format, f"seoul_{dataset}", compress=compress,
+        csv_bom=True, headers={"X-Data-Version": version},
+    )
+
+
+def _merge_all_job() -> dict:
+    return get_service().merge_all_and_save()
+
+
+get_job_manager().register("seoul.merge_all", _merge_all_job, endpoint="seoul.merge",
+                           description="CCTV/인구/범죄/지오코딩 통합 CSV 생성")
+
+
+@seoul_router.post("/merge")
+async def merge_all():
+    """
+    CCTV+인구, 범죄+CCTV, 경찰서 지오코딩을 하나로 합쳐 save 폴더에 CSV 저장
+    
+    지오코딩 호출이 포함되어 오래 걸릴 수 있으므로, 연결을 붙잡고 싶지 않다면
+    POST /jobs {"kind": "seoul.merge_all"} 로 백그라운드 잡을 제출하세요.
+    
+    Returns:
+        저장 경로와 행/열 개수, 컬럼 목록
+    """
+    try:
+        result = await get_executor().run_in_thread("seoul.merge", _merge_all_job)
         return {
             "success": True,
-            "count": len(merged_list),
-            "total_rows": len(df_merged),
-            "columns": df_merged.columns.tolist(),
-            "data": merged_list
+            **result
         }
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, 
-            detail=f"범죄-CCTV 머지 데이터 조회 중 오류 발생: {str(e)}"
+            detail=f"통합 데이터 생성 중 오류 발생: {str(e)}"
         )
 
 
@@ -358,7 +547,8 @@ async def get_police_stations_geocoding():
     """
     try:
         service = get_service()
-        result = service.get_police_stations_with_geocoding()
+        # 비동기 지오코더로 이벤트 루프에서 직접 병렬 호출 (커넥션 풀은 요청 간 재사용)
+        result = await service.geocode_police_stations()
         
         return {
             "success": True,
@@ -4,12 +4,16 @@
 """
 import sys
 import os
+import asyncio
+import hashlib
+import json
 import logging
+from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 import pandas as pd
 import numpy as np
-from icecream import ic
+from app.common.log_capture import make_print, make_ic
 from tabulate import tabulate
 
 # Windows 터미널 인코딩 설정
@@ -23,29 +27,21 @@ if sys.platform == 'win32':
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# print() 함수를 래핑하여 항상 flush되도록 함 (Docker 로그 즉시 표시)
-_original_print = print
-def print(*args, **kwargs):
-    """print() 함수 래퍼: 항상 flush하여 Docker 로그에 즉시 표시"""
-    kwargs.setdefault('flush', True)  # flush=True 기본값 설정
-    _original_print(*args, **kwargs)
-
-# ic() 함수도 래핑하여 출력이 즉시 표시되도록 함
-_original_ic = ic
-def ic(*args, **kwargs):
-    """ic() 함수 래퍼: 출력 후 flush하여 Docker 로그에 즉시 표시"""
-    result = _original_ic(*args, **kwargs)
-    # ic() 출력 후 강제 flush
-    sys.stdout.flush()
-    sys.stderr.flush()
-    return result
+# print()/ic() 출력은 logging 으로 보냄
+# (요청별 로그 수집 + 컨테이너 로그는 배치로 출력, 전역 stdout 을 건드리지 않음)
+print = make_print(logger)
+ic = make_ic(logger)
 
 # 공통 모듈 경로 추가
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
+from app.common.executor import get_executor
+
 # SeoulMethod import
 from .seoul_method import SeoulMethod
 from .kakao_map_singleton import KakaoMapSingleton
+from .kakao_async import get_async_geocoder
+from .seoul_store import get_seoul_store
 
 
 class SeoulService:
@@ -201,11 +197,51 @@ class SeoulService:
             print(f"\n❌ {error_msg}")
             raise
     
+    # 키워드 검색 실패 시 사용할 주소/정확 명칭 매핑 (fallback)
+    POLICE_FALLBACK_ADDRESSES = {
+        # 축약형 → 주소
+        "중랑서": "서울 중랑구 신내로 153",
+        "도봉서": "서울 도봉구 노해로 403",
+        "중부서": "서울 중구 수표로 27",
+        "혜화서": "서울 종로구 율곡로 42",
+        # 경찰서 풀네임 → 주소
+        "중랑경찰서": "서울 중랑구 신내로 153",
+        "도봉경찰서": "서울 도봉구 노해로 403",
+        "중부경찰서": "서울 중구 수표로 27",
+        "혜화경찰서": "서울 종로구 율곡로 42"
+    }
+    # 모든 검색이 실패했을 때 최종 좌표 하드코딩 (검증된 좌표)
+    POLICE_FALLBACK_COORDS = {
+        "중랑서": {"주소": "서울 중랑구 신내동 810", "경도": 127.10454224897, "위도": 37.6182390801576},
+        "중랑경찰서": {"주소": "서울 중랑구 신내동 810", "경도": 127.10454224897, "위도": 37.6182390801576},
+        "도봉서": {"주소": "서울 도봉구 창동 17", "경도": 127.05270598499145, "위도": 37.65339041848567},
+        "도봉경찰서": {"주소": "서울 도봉구 창동 17", "경도": 127.05270598499145, "위도": 37.65339041848567},
+    }
+
     def get_police_stations_with_geocoding(self):
+        """
+        경찰서별 지오코딩 정보 조회 (동기 호출용)
+        - 실행기 스레드/잡에서 호출되므로 새 이벤트 루프에서 비동기 지오코딩을 실행
+          (루프 안의 CSV/캐시 I/O 는 스레드 풀이 아닌 I/O 풀에서 실행되어 풀 고갈로 막히지 않음)
+        
+        Returns:
+            경찰서 개수와 지오코딩 정보
+        """
+        async def _run():
+            try:
+                return await self.geocode_police_stations()
+            finally:
+                # 이 루프 전용 커넥션 풀은 루프와 함께 정리
+                await get_async_geocoder().aclose()
+
+        return asyncio.run(_run())
+
+    async def geocode_police_stations(self):
         """
         경찰서별 지오코딩 정보 조회
         - 범죄 데이터에서 관서명 추출
-        - 카카오 로컬 API를 통해 각 경찰서의 좌표 정보 가져오기
+        - 카카오 로컬 API를 통해 각 경찰서의 좌표 정보를 병렬로 가져오기
+          (동시 요청 수/초당 요청 수 제한, 결과는 관서 순서 유지)
         
         Returns:
             경찰서 개수와 지오코딩 정보
@@ -215,132 +251,21 @@ class SeoulService:
         print("="*80)
         
         try:
-            # 범죄 데이터 로드
-            df_crime = self.method.load_crime()
+            # 범죄 데이터 로드 (CSV 읽기는 실행기 I/O 풀에서 - 이벤트 루프에서는 HTTP 호출만)
+            df_crime = await get_executor().to_thread(self.method.load_crime)
             police_stations = df_crime['관서명'].tolist()
             
             print(f"\n📍 총 {len(police_stations)}개 경찰서 발견")
             print(f"경찰서 목록: {', '.join(police_stations[:5])}...")
             
-            # 각 경찰서의 지오코딩 정보 수집
-            geocoding_results = []
-            success_count = 0
-            fail_count = 0
-            # 키워드 검색 실패 시 사용할 주소/정확 명칭 매핑 (fallback)
-            fallback_map = {
-                # 축약형 → 주소
-                "중랑서": "서울 중랑구 신내로 153",
-                "도봉서": "서울 도봉구 노해로 403",
-                "중부서": "서울 중구 수표로 27",
-                "혜화서": "서울 종로구 율곡로 42",
-                # 경찰서 풀네임 → 주소
-                "중랑경찰서": "서울 중랑구 신내로 153",
-                "도봉경찰서": "서울 도봉구 노해로 403",
-                "중부경찰서": "서울 중구 수표로 27",
-                "혜화경찰서": "서울 종로구 율곡로 42"
-            }
-            # 모든 검색이 실패했을 때 최종 좌표 하드코딩 (검증된 좌표)
-            fallback_coords = {
-                "중랑서": {"주소": "서울 중랑구 신내동 810", "경도": 127.10454224897, "위도": 37.6182390801576},
-                "중랑경찰서": {"주소": "서울 중랑구 신내동 810", "경도": 127.10454224897, "위도": 37.6182390801576},
-                "도봉서": {"주소": "서울 도봉구 창동 17", "경도": 127.05270598499145, "위도": 37.65339041848567},
-                "도봉경찰서": {"주소": "서울 도봉구 창동 17", "경도": 127.05270598499145, "위도": 37.65339041848567},
-            }
-            
-            for idx, station in enumerate(police_stations, 1):
-                print(f"\n[{idx}/{len(police_stations)}] {station} 지오코딩 중...")
-                
-                try:
-                    # 특정 관서는 바로 하드코딩 좌표 사용 (안정성 확보)
-                    if station in fallback_coords:
-                        fc = fallback_coords[station]
-                        geocoding_info = {
-                            '관서명': station,
-                            '주소': fc['주소'],
-                            '경도': fc['경도'],
-                            '위도': fc['위도'],
-                            '성공': True,
-                            'fallback': 'hardcoded'
-                        }
-                        geocoding_results.append(geocoding_info)
-                        success_count += 1
-                        print(f"✅ 성공(하드코딩 우선): {fc['주소']}")
-                        ic(f"{station} 좌표(하드코딩): ({fc['경도']}, {fc['위도']})")
-                        continue
-                    
-                    tried = []
-                    # 후보 키워드/주소 리스트 (순서대로 시도)
-                    candidates = [
-                        ("keyword", f"서울 {station}"),
-                        ("keyword", f"서울 {station.replace('서','경찰서')}") if station.endswith("서") else None,
-                        ("keyword", f"서울 {station} 경찰서"),
-                        ("keyword", f"{station} 경찰서"),
-                        ("keyword", station.replace("서","경찰서")) if station.endswith("서") else None,
-                        ("address", fallback_map.get(station)) if station in fallback_map else None,
-                    ]
-                    candidates = [c for c in candidates if c and c[1]]
-                    
-                    result = {"documents": []}
-                    for typ, query in candidates:
-                        tried.append((typ, query))
-                        print(f"🔎 시도({typ}): {query}")
-                        result = self.kakao_map.search_keyword(query) if typ == "keyword" else self.kakao_map.geocode(query)
-                        if result.get('documents'):
-                            break
-                    
-                    # 최종 fallback: 좌표 하드코딩
-                    if not result.get('documents') and station in fallback_coords:
-                        fc = fallback_coords[station]
-                        geocoding_info = {
-                            '관서명': station,
-                            '주소': fc['주소'],
-                            '경도': fc['경도'],
-                            '위도': fc['위도'],
-                            '성공': True,
-                            'fallback': 'hardcoded'
-                        }
-                        geocoding_results.append(geocoding_info)
-                        success_count += 1
-                        print(f"✅ 성공(하드코딩): {fc['주소']}")
-                        ic(f"{station} 좌표(하드코딩): ({fc['경도']}, {fc['위도']})")
-                        continue
-                    
-                    if result.get('documents'):
-                        doc = result['documents'][0]
-                        geocoding_info = {
-                            '관서명': station,
-                            '주소': doc.get('address_name', ''),
-                            '경도': float(doc.get('x', 0)),
-                            '위도': float(doc.get('y', 0)),
-                            '성공': True
-                        }
-                        geocoding_results.append(geocoding_info)
-                        success_count += 1
-                        print(f"✅ 성공: {doc.get('address_name', '')}")
-                        ic(f"{station} 좌표: ({geocoding_info['경도']}, {geocoding_info['위도']})")
-                    else:
-                        geocoding_results.append({
-                            '관서명': station,
-                            '주소': 'N/A',
-                            '경도': 0,
-                            '위도': 0,
-                            '성공': False,
-                            '오류': f"검색 결과 없음 | 시도: {tried}"
-                        })
-                        fail_count += 1
-                        print(f"❌ 실패: 검색 결과 없음 | 시도: {tried}")
-                        
-                except Exception as e:
-                    geocoding_results.append({
-                        '관서명': station,
-                        '주소': 'N/A',
-                        '경도': 0,
-                        '위도': 0,
-                        '성공': False,
-                        '오류': str(e)
-                    })
-                    fail_count += 1
-                    print(f"❌ 오류: {str(e)}")
+            # 각 경찰서의 지오코딩 정보 수집 (gather 는 입력 순서대로 결과 반환)
+            geocoder = get_async_geocoder()
+            geocoding_results = await asyncio.gather(*(
+                self._geocode_station(geocoder, station, idx, len(police_stations))
+                for idx, station in enumerate(police_stations, 1)
+            ))
+            success_count = sum(1 for r in geocoding_results if r['성공'])
+            fail_count = len(geocoding_results) - success_count
             
             print("\n" + "="*80)
             print(f"🎉 지오코딩 완료!")
@@ -354,7 +279,7 @@ class SeoulService:
                 "success_count": success_count,
                 "fail_count": fail_count,
                 "police_stations": police_stations,
-                "geocoding_results": geocoding_results
+                "geocoding_results": list(geocoding_results)
             }
             
         except Exception as e:
@@ -364,31 +289,87 @@ class SeoulService:
             print(f"\n❌ {error_msg}")
             raise
 
+    async def _geocode_station(self, geocoder, station: str, idx: int, total: int) -> Dict[str, Any]:
+        """경찰서 하나의 좌표 조회 (후보 검색어를 순서대로 시도, 실패 시 하드코딩 좌표)"""
+        print(f"\n[{idx}/{total}] {station} 지오코딩 중...")
+        fallback_coords = self.POLICE_FALLBACK_COORDS
+        fallback_map = self.POLICE_FALLBACK_ADDRESSES
+        
+        try:
+            # 특정 관서는 바로 하드코딩 좌표 사용 (안정성 확보)
+            if station in fallback_coords:
+                fc = fallback_coords[station]
+                print(f"✅ 성공(하드코딩 우선): {fc['주소']}")
+                ic(f"{station} 좌표(하드코딩): ({fc['경도']}, {fc['위도']})")
+                return {
+                    '관서명': station,
+                    '주소': fc['주소'],
+                    '경도': fc['경도'],
+                    '위도': fc['위도'],
+                    '성공': True,
+                    'fallback': 'hardcoded'
+                }
+            
+            # 후보 키워드/주소 리스트 (순서대로 시도)
+            candidates = [
+                ("keyword", f"서울 {station}"),
+                ("keyword", f"서울 {station.replace('서','경찰서')}") if station.endswith("서") else None,
+                ("keyword", f"서울 {station} 경찰서"),
+                ("keyword", f"{station} 경찰서"),
+                ("keyword", station.replace("서","경찰서")) if station.endswith("서") else None,
+                ("address", fallback_map.get(station)) if station in fallback_map else None,
+            ]
+            candidates = [c for c in candidates if c and c[1]]
+            
+            result, tried = await geocoder.first_match(candidates)
+            
+            if result.get('documents'):
+                doc = result['documents'][0]
+                geocoding_info = {
+                    '관서명': station,
+                    '주소': doc.get('address_name', ''),
+                    '경도': float(doc.get('x', 0)),
+                    '위도': float(doc.get('y', 0)),
+                    '성공': True
+                }
+                print(f"✅ 성공: {doc.get('address_name', '')}")
+                ic(f"{station} 좌표: ({geocoding_info['경도']}, {geocoding_info['위도']})")
+                return geocoding_info
+            
+            print(f"❌ 실패: 검색 결과 없음 | 시도: {tried}")
+            return {
+                '관서명': station,
+                '주소': 'N/A',
+                '경도': 0,
+                '위도': 0,
+                '성공': False,
+                '오류': f"검색 결과 없음 | 시도: {tried}"
+            }
+                
+        except Exception as e:
+            print(f"❌ 오류: {str(e)}")
+            return {
+                '관서명': station,
+                '주소': 'N/A',
+                '경도': 0,
+                '위도': 0,
+                '성공': False,
+                '오류': str(e)
+            }
+
     def merge_all_and_save(self):
         """
         1) CCTV+인구 머지
         2) 범죄+CCTV 머지
         3) 경찰서 지오코딩
         를 하나로 합쳐 save 폴더에 CSV 저장
+        
+        1), 2) 는 입력 파일 버전별 머지 스냅샷을 재사용하고, 내용이 이전 저장본과 같으면
+        CSV 를 다시 쓰지 않습니다.
         """
-        # 1. CCTV+인구 (인구만 사용)
-        df_cctv_pop = self.method.merge_cctv_pop()
-        pop_part = df_cctv_pop.rename(columns={"구": "기관명"})
-        pop_part = pop_part[["기관명"] + [c for c in pop_part.columns if c.startswith("인구_")]]
-
-        # 2. 범죄+CCTV
-        df_crime_cctv = self.method.merge_crime_cctv()
-
-        # 키 컬럼 공백 제거
-        pop_part["기관명"] = pop_part["기관명"].astype(str).str.strip()
-        df_crime_cctv["기관명"] = df_crime_cctv["기관명"].astype(str).str.strip()
-
-        # 3. 병합 (기관명 기준으로 인구 붙이기)
-        merged = df_crime_cctv.merge(pop_part, on="기관명", how="left")
-
-        # CCTV 연도별 컬럼 제거 요청 반영
-        drop_cols = ["CCTV_2013년도 이전", "CCTV_2014년", "CCTV_2015년", "CCTV_2016년"]
-        merged = merged.drop(columns=[c for c in drop_cols if c in merged.columns])
+        # 1~3. CCTV+인구, 범죄+CCTV 머지 (입력 파일이 바뀐 경우에만 다시 계산)
+        snapshot = get_seoul_store().snapshot()
+        merged = snapshot.frame("merged")
 
         # 4. 지오코딩 정보
         geo_result = self.get_police_stations_with_geocoding()
@@ -404,12 +385,28 @@ class SeoulService:
         save_dir = Path(self.method.dataset.sname)
         save_dir.mkdir(parents=True, exist_ok=True)
         save_path = save_dir / "seoul_merged_all.csv"
-        # Excel 호환을 위해 BOM 포함 UTF-8로 저장
-        merged.to_csv(save_path, index=False, encoding="utf-8-sig")
-
-        print(f"✅ 통합 CSV 저장 완료: {save_path}")
+        meta_path = save_dir / "seoul_merged_all.meta.json"
+        # 머지 스냅샷 버전 + 지오코딩 결과 해시가 이전 저장본과 같으면 다시 쓰지 않음
+        digest = hashlib.sha1(snapshot.version.encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(merged, index=False).to_numpy().tobytes())
+        signature = digest.hexdigest()
+        previous = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+        rewritten = not (save_path.exists() and previous.get("signature") == signature)
+        if rewritten:
+            # Excel 호환을 위해 BOM 포함 UTF-8로 저장
+            merged.to_csv(save_path, index=False, encoding="utf-8-sig")
+            meta_path.write_text(json.dumps({
+                "signature": signature,
+                "version": snapshot.version,
+                "saved_at": datetime.now().isoformat(timespec="seconds"),
+            }, ensure_ascii=False, indent=2), encoding="utf-8")
+            print(f"✅ 통합 CSV 저장 완료: {save_path}")
+        else:
+            print(f"✅ 통합 CSV 변경 없음 (버전 {snapshot.version}): {save_path}")
         return {
             "status": "success",
+            "version": snapshot.version,
+            "rewritten": rewritten,
             "save_path": str(save_path),
             "rows": len(merged),
             "cols": len(merged.columns),
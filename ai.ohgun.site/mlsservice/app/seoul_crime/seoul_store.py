@@ -0,0 +1,164 @@
+"""
+Seoul Merged Store
+CCTV/인구/범죄 머지 결과를 입력 파일 버전별로 한 번만 만들어 메모리에 보관하는 저장소
+
+- 버전: cctv.csv, crime.csv, pop.xls 의 (이름, mtime, 크기) 해시 → 입력 파일이 바뀔 때만 다시 머지
+- 스냅샷: cctv_pop(CCTV+인구), crime_cctv(범죄+CCTV), merged(범죄+CCTV+인구) 프레임
+  (호출자에게는 복사본을 반환, merged 는 관서명/기관명 인덱스 제공)
+- 응답 본문(JSON bytes)도 스냅샷별로 한 번만 직렬화하고, 버전 기반 ETag 로 304 응답 가능
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from app.common.serializer import dumps
+from .seoul_method import SeoulMethod
+
+STORE_VERSION = 1
+INPUT_FILES = ("cctv.csv", "crime.csv", "pop.xls")
+# 통합 CSV 에서 제외하는 CCTV 연도별 컬럼
+CCTV_YEAR_COLUMNS = ["CCTV_2013년도 이전", "CCTV_2014년", "CCTV_2015년", "CCTV_2016년"]
+
+
+class SeoulSnapshot:
+    """입력 파일 한 버전에 대한 머지 결과"""
+
+    def __init__(self, version: str, inputs: Dict[str, Dict[str, Any]],
+                 cctv_pop: pd.DataFrame, crime_cctv: pd.DataFrame, merged: pd.DataFrame,
+                 build_seconds: float) -> None:
+        self.version = version
+        self.inputs = inputs
+        self.built_at = datetime.now().isoformat(timespec="seconds")
+        self.build_seconds = build_seconds
+        self.frames: Dict[str, pd.DataFrame] = {
+            "cctv_pop": cctv_pop,
+            "crime_cctv": crime_cctv,
+            "merged": merged,
+        }
+        # 관서명 → 행, 기관명 → 행 목록 (기관명은 여러 관서가 같은 구를 가질 수 있음)
+        self.by_station = merged.set_index("관서명", drop=False)
+        self.by_district = merged.set_index("기관명", drop=False).sort_index()
+        self._payloads: Dict[Tuple, bytes] = {}
+        self._lock = threading.Lock()
+
+    def etag(self, name: str) -> str:
+        # HTTP 헤더는 latin-1 만 허용하므로 한글 이름(관서명/기관명)은 해시로 표기
+        if not name.isascii():
+            name = hashlib.sha1(name.encode("utf-8")).hexdigest()[:12]
+        return f'"seoul-{self.version}-{name}"'
+
+    def frame(self, name: str) -> pd.DataFrame:
+        """스냅샷 프레임의 복사본 (호출자가 수정해도 스냅샷은 그대로)"""
+        return self.frames[name].copy()
+
+    def payload(self, key: Tuple, build: Callable[[], Dict[str, Any]]) -> bytes:
+        """key 별 응답 본문을 한 번만 직렬화하여 재사용"""
+        with self._lock:
+            body = self._payloads.get(key)
+        if body is None:
+            body = dumps(build())
+            with self._lock:
+                self._payloads[key] = body
+        return body
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "built_at": self.built_at,
+            "build_seconds": round(self.build_seconds, 4),
+            "inputs": self.inputs,
+            "frames": {name: {"rows": len(df), "cols": len(df.columns)} for name, df in self.frames.items()},
+            "cached_payloads": len(self._payloads),
+        }
+
+
+class SeoulMergedStore:
+    """입력 파일이 바뀔 때만 머지를 다시 수행하는 머지 결과 저장소"""
+
+    def __init__(self, method: Optional[SeoulMethod] = None) -> None:
+        self.method = method or SeoulMethod()
+        self._snapshot: Optional[SeoulSnapshot] = None
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def _fingerprint(self) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+        data_dir = Path(self.method.dataset.dname)
+        inputs: Dict[str, Dict[str, Any]] = {}
+        digest = hashlib.sha1(f"v{STORE_VERSION}".encode("utf-8"))
+        for name in INPUT_FILES:
+            path = data_dir / name
+            if not path.exists():
+                raise FileNotFoundError(f"입력 파일을 찾을 수 없습니다: {path}")
+            stat = path.stat()
+            inputs[name] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            digest.update(f"|{name}:{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8"))
+        return digest.hexdigest()[:16], inputs
+
+    def version(self) -> str:
+        """현재 입력 파일 기준 데이터 버전"""
+        return self._fingerprint()[0]
+
+    def current(self) -> Optional[SeoulSnapshot]:
+        """
+        최신 스냅샷이 이미 있으면 반환, 입력 파일이 바뀌었거나 아직 없으면 None
+        (파일 stat 만 하므로 이벤트 루프에서 호출해도 됨)
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self.version():
+            return snapshot
+        return None
+
+    def snapshot(self) -> SeoulSnapshot:
+        """최신 스냅샷 반환 (입력이 바뀌었으면 다시 머지, 동시 호출 시 한 번만 수행)"""
+        with self._lock:
+            version, inputs = self._fingerprint()
+            if self._snapshot is not None and self._snapshot.version == version:
+                return self._snapshot
+            started = time.perf_counter()
+            cctv_pop = self.method.merge_cctv_pop()
+            crime_cctv = self.method.merge_crime_cctv()
+            merged = self._merge_all(cctv_pop, crime_cctv)
+            self._snapshot = SeoulSnapshot(
+                version, inputs, cctv_pop, crime_cctv, merged, time.perf_counter() - started
+            )
+            self.builds += 1
+            return self._snapshot
+
+    @staticmethod
+    def _merge_all(cctv_pop: pd.DataFrame, crime_cctv: pd.DataFrame) -> pd.DataFrame:
+        """범죄+CCTV 에 구별 인구 컬럼을 붙이고 CCTV 연도별 컬럼 제거"""
+        pop_part = cctv_pop.rename(columns={"구": "기관명"})
+        pop_part = pop_part[["기관명"] + [c for c in pop_part.columns if c.startswith("인구_")]].copy()
+        crime_cctv = crime_cctv.copy()
+
+        # 키 컬럼 공백 제거
+        pop_part["기관명"] = pop_part["기관명"].astype(str).str.strip()
+        crime_cctv["기관명"] = crime_cctv["기관명"].astype(str).str.strip()
+
+        merged = crime_cctv.merge(pop_part, on="기관명", how="left")
+        return merged.drop(columns=[c for c in CCTV_YEAR_COLUMNS if c in merged.columns])
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "builds": self.builds,
+            "snapshot": snapshot.info() if snapshot is not None else None,
+        }
+
+
+_store: Optional[SeoulMergedStore] = None
+_store_lock = threading.Lock()
+
+
+def get_seoul_store() -> SeoulMergedStore:
+    """머지 결과 저장소 싱글톤 인스턴스 반환"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SeoulMergedStore()
+        return _store
@@ -3,6 +3,26 @@ import numpy as np
 import re
 from pathlib import Path
 from .titanic_dataset import DataSets
+from .titanic_schema import read_titanic
+
+# 원본 CSV 위치 (train.csv, test.csv)
+DATA_DIR = Path(__file__).parent / "data"
+
+# Name → Title 호칭 매핑 (희귀 호칭은 Rare로 통합)
+TITLE_MAPPING = {
+    'Mr': 'Mr', 'Miss': 'Miss', 'Mrs': 'Mrs', 'Master': 'Master',
+    'Don': 'Rare', 'Rev': 'Rare', 'Dr': 'Rare', 'Mme': 'Mrs',
+    'Ms': 'Miss', 'Major': 'Rare', 'Lady': 'Rare', 'Sir': 'Rare',
+    'Mlle': 'Miss', 'Col': 'Rare', 'Capt': 'Rare', 'Countess': 'Rare', 'Jonkheer': 'Rare'
+}
+# Title을 숫자로 매핑: Mr=0, Miss=1, Mrs=2, Master=3, Rare=4
+TITLE_TO_NUM = {'Mr': 0, 'Miss': 1, 'Mrs': 2, 'Master': 3, 'Rare': 4}
+TITLE_PATTERN = r',\s*([A-Za-z]+)\.'
+GENDER_TO_NUM = {'male': 0, 'female': 1}
+EMBARKED_TO_NUM = {'C': 0, 'Q': 1, 'S': 2}
+# AgeGroup 구간: Unknown=0, Baby=1, ..., Senior=7
+AGE_BINS = [-1, 0, 5, 12, 18, 24, 35, 60, np.inf]
+AGE_LABELS = [0, 1, 2, 3, 4, 5, 6, 7]
 
 
 class TitanicMethod(object): 
@@ -12,7 +32,12 @@ class TitanicMethod(object):
         self.dataset = DataSets()
 
     def new_model(self, file_name: str) -> pd.DataFrame:
-        return pd.read_csv(Path(__file__).parent / file_name)
+        file_path = DATA_DIR / file_name
+        if not file_path.exists():
+            # 이전 위치(titanic/ 바로 아래)도 허용
+            file_path = Path(__file__).parent / file_name
+        # 스키마 dtype(category/int8/float32)으로 로드
+        return read_titanic(file_path)
 
     def create_df(self, df: pd.DataFrame, label: str) -> pd.DataFrame:
         return df.drop(columns=[label])
@@ -43,18 +68,9 @@ class TitanicMethod(object):
         Name 컬럼에서 Title 추출
         Name에서 Mr, Mrs, Miss, Master 등 호칭을 정규표현식으로 추출하여 Title 컬럼 생성
         """
-        title_mapping = {
-            'Mr': 'Mr', 'Miss': 'Miss', 'Mrs': 'Mrs', 'Master': 'Master',
-            'Don': 'Rare', 'Rev': 'Rare', 'Dr': 'Rare', 'Mme': 'Mrs',
-            'Ms': 'Miss', 'Major': 'Rare', 'Lady': 'Rare', 'Sir': 'Rare',
-            'Mlle': 'Miss', 'Col': 'Rare', 'Capt': 'Rare', 'Countess': 'Rare', 'Jonkheer': 'Rare'
-        }
-        # Title을 숫자로 매핑: Mr=0, Miss=1, Mrs=2, Master=3, Rare=4
-        title_to_num = {'Mr': 0, 'Miss': 1, 'Mrs': 2, 'Master': 3, 'Rare': 4}
-        
         for df in (train_df, test_df):
-            title_text = df['Name'].str.extract(r',\s*([A-Za-z]+)\.', expand=False).map(title_mapping).fillna('Rare')
-            df['Title'] = title_text.map(title_to_num)
+            title_text = df['Name'].str.extract(TITLE_PATTERN, expand=False).map(TITLE_MAPPING).fillna('Rare')
+            df['Title'] = title_text.map(TITLE_TO_NUM)
         return train_df, test_df
     
     def gender_nominal(self, train_df, test_df):
@@ -67,7 +83,7 @@ class TitanicMethod(object):
             if 'Sex' in df.columns:
                 df.rename(columns={'Sex': 'Gender'}, inplace=True)
             # Gender 컬럼을 0(male), 1(female)로 변환
-            df['Gender'] = df['Gender'].map({'male': 0, 'female': 1})
+            df['Gender'] = df['Gender'].map(GENDER_TO_NUM)
             df['Gender_encoded'] = df['Gender']
             # 원본 값 기준으로 더미 변수 생성 (백업용)
             df['Gender_male'] = (df['Gender'] == 0).astype(int)
@@ -80,9 +96,6 @@ class TitanicMethod(object):
         Age 결측치는 중앙값으로 채우거나 Title 기반 예측치로 대체
         AgeGroup 생성
         """
-        bins = [-1, 0, 5, 12, 18, 24, 35, 60, np.inf]
-        labels = [0, 1, 2, 3, 4, 5, 6, 7]  # 숫자로 변경: Unknown=0, Baby=1, ..., Senior=7
-        
         for df in (train_df, test_df):
             if 'Title' in df.columns:
                 df['Age'].fillna(df['Title'].map(df.groupby('Title')['Age'].median()), inplace=True)
@@ -90,7 +103,7 @@ class TitanicMethod(object):
                 df['Age'].fillna(df['Age'].median(), inplace=True)
             # Age를 정수로 변환 (소수점 제거)
             df['Age'] = df['Age'].round().astype(int)
-            df['AgeGroup'] = pd.cut(df['Age'], bins=bins, labels=labels, right=False).astype(int)
+            df['AgeGroup'] = pd.cut(df['Age'], bins=AGE_BINS, labels=AGE_LABELS, right=False).astype(int)
         return train_df, test_df
     
     def sibsp_ratio(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -167,13 +180,11 @@ class TitanicMethod(object):
         Embarked Nominal 처리
         S, C, Q → 숫자로 인코딩 (C=0, Q=1, S=2)
         """
-        embarked_to_num = {'C': 0, 'Q': 1, 'S': 2}
-        
         for df in (train_df, test_df):
             if df['Embarked'].isnull().any():
                 df['Embarked'].fillna(df['Embarked'].mode()[0], inplace=True)
             # Embarked를 숫자로 변환
-            df['Embarked'] = df['Embarked'].map(embarked_to_num)
+            df['Embarked'] = df['Embarked'].map(EMBARKED_TO_NUM)
             # 더미 변수도 생성
             df['Embarked_C'] = (df['Embarked'] == 0).astype(int)
             df['Embarked_Q'] = (df['Embarked'] == 1).astype(int)
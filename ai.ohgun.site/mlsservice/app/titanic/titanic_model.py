@@ -1,10 +1,353 @@
-from multiprocessing.process import parent_process
+"""
+Titanic Model Registry
+학습된 모델을 버전별로 디스크에 저장하고, 활성 모델을 메모리에 유지하는 레지스트리
+"""
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
 import pandas as pd
-import os
-from icecream import ic
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.naive_bayes import GaussianNB
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+
+from .titanic_pipeline import SAVE_DIR
+
+MODEL_DIR = SAVE_DIR / "models"
+EVALUATION_DIR = SAVE_DIR / "evaluations"
+ACTIVE_POINTER = "active.json"
 
+# 레지스트리에서 학습할 수 있는 모델 종류
+MODEL_FACTORIES = {
+    "RandomForest": RandomForestClassifier,
+    "DecisionTree": DecisionTreeClassifier,
+    "LogisticRegression": LogisticRegression,
+    "GaussianNB": GaussianNB,
+    "SVM_rbf": SVC,
+}
+
+# evaluating 에서 비교하는 후보 모델 (프로세스별로 병렬 학습하므로 n_jobs=1)
+EVALUATION_CANDIDATES = [
+    ("DecisionTree", {"random_state": 42}),
+    ("RandomForest", {"n_estimators": 200, "random_state": 42, "n_jobs": 1}),
+    ("GaussianNB", {}),
+    ("SVM_rbf", {"kernel": "rbf", "probability": True, "random_state": 42}),
+    ("LogisticRegression", {"max_iter": 1000}),
+]
+
+DEFAULT_MODEL_NAME = "RandomForest"
+# 모델별 기본 하이퍼파라미터 (요청한 params 가 같은 키를 덮어씀)
+DEFAULT_MODEL_PARAMS: Dict[str, Dict[str, Any]] = {
+    "RandomForest": {"n_estimators": 200, "random_state": 42, "n_jobs": -1},
+    "DecisionTree": {"random_state": 42},
+    "LogisticRegression": {"max_iter": 1000},
+    "GaussianNB": {},
+    "SVM_rbf": {"kernel": "rbf", "probability": True, "random_state": 42},
+}
 
 
 class TitanicModels:
-    def __init__(self) -> None:
-       pass
\ No newline at end of file
+    """
+    타이타닉 모델 레지스트리
+
+    모델 버전은 (학습 데이터 해시, 모델 이름, 하이퍼파라미터, 피처 형태)로 결정됩니다.
+    피처 형태는 피처 컬럼 + 파이프라인 버전 + compact 여부이며 모델 메타에 함께 저장됩니다.
+    같은 버전의 아티팩트가 디스크에 있으면 다시 학습하지 않고 로드하며,
+    활성 모델 교체는 새 모델 학습/저장이 끝난 뒤 락 안에서 한 번에 이루어집니다.
+    """
+
+    def __init__(self, model_dir: Path = MODEL_DIR) -> None:
+        self.model_dir = Path(model_dir)
+        self._lock = threading.Lock()
+        self._train_lock = threading.Lock()
+        self._active: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    def make_version(data_fingerprint: str, name: str, params: Dict[str, Any],
+                     features: Dict[str, Any]) -> str:
+        """학습 데이터 해시 + 하이퍼파라미터 + 피처 형태로 모델 버전 키 생성"""
+        key = json.dumps({
+            "data": data_fingerprint,
+            "name": name,
+            "params": params,
+            "features": features,
+        }, sort_keys=True, default=str)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+    @staticmethod
+    def matches(meta: Dict[str, Any], data_fingerprint: str, features: Dict[str, Any]) -> bool:
+        """모델 메타가 현재 학습 데이터/피처 형태로 만들어진 것인지 (형태 정보가 없는 이전 모델은 False)"""
+        return (meta.get("data_fingerprint") == data_fingerprint
+                and all(meta.get(key) == value for key, value in features.items()))
+
+    @staticmethod
+    def _features(X: pd.DataFrame, features: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return dict(features) if features is not None else {"feature_columns": list(X.columns)}
+
+    @staticmethod
+    def resolve_params(name: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """모델 기본 하이퍼파라미터에 요청한 params 를 덮어쓴 최종 파라미터"""
+        if name not in MODEL_FACTORIES:
+            raise ValueError(f"지원하지 않는 모델입니다: {name} (지원: {', '.join(MODEL_FACTORIES)})")
+        return {**DEFAULT_MODEL_PARAMS[name], **(params or {})}
+
+    @staticmethod
+    def build(name: str, params: Dict[str, Any]):
+        """모델 이름과 파라미터로 estimator 생성"""
+        if name not in MODEL_FACTORIES:
+            raise ValueError(f"지원하지 않는 모델입니다: {name} (지원: {', '.join(MODEL_FACTORIES)})")
+        return MODEL_FACTORIES[name](**params)
+
+    def _paths(self, name: str, version: str):
+        stem = f"{name}-{version}"
+        return self.model_dir / f"{stem}.joblib", self.model_dir / f"{stem}.json"
+
+    @property
+    def active(self) -> Optional[Dict[str, Any]]:
+        """현재 활성 모델 엔트리 ({"model", "meta"})"""
+        return self._active
+
+    @staticmethod
+    def _for_serving(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        예측용 설정: 요청 하나의 예측은 행 수가 적어 joblib 병렬 실행 비용이 더 크므로
+        n_jobs 가 있는 모델(RandomForest 등)은 단일 스레드로 예측
+        """
+        model = entry["model"]
+        if "n_jobs" in model.get_params():
+            model.set_params(n_jobs=1)
+        return entry
+
+    def activate(self, entry: Dict[str, Any]) -> None:
+        """활성 모델 교체 (원자적) 및 재시작 후에도 같은 모델을 쓰도록 포인터 기록"""
+        self._for_serving(entry)
+        with self._lock:
+            self._active = entry
+        meta = entry["meta"]
+        self._write_json(self.model_dir / ACTIVE_POINTER, {"name": meta["name"], "version": meta["version"]})
+
+    def load_active(self, data_fingerprint: str, features: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        마지막으로 활성화된 모델을 디스크에서 로드하여 활성화
+        학습 데이터나 피처 형태(컬럼, 파이프라인 버전, compact)가 바뀌었으면 None 반환
+        """
+        pointer_path = self.model_dir / ACTIVE_POINTER
+        if not pointer_path.exists():
+            return None
+        try:
+            pointer = json.loads(pointer_path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        entry = self.load(pointer.get("name", ""), pointer.get("version", ""))
+        if entry is None or not self.matches(entry["meta"], data_fingerprint, features):
+            return None
+        self._for_serving(entry)
+        with self._lock:
+            self._active = entry
+        return entry
+
+    @staticmethod
+    def _write_json(file_path: Path, data: Dict[str, Any]) -> None:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = file_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp_path.replace(file_path)
+
+    def load(self, name: str, version: str) -> Optional[Dict[str, Any]]:
+        """디스크에서 특정 버전의 모델 로드 (없으면 None)"""
+        model_path, meta_path = self._paths(name, version)
+        if not (model_path.exists() and meta_path.exists()):
+            return None
+        try:
+            model = joblib.load(model_path)
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except Exception:
+            return None  # 손상된 아티팩트는 다시 학습
+        return {"model": model, "meta": meta}
+
+    def train(self, X: pd.DataFrame, y: pd.Series, data_fingerprint: str,
+              name: str = DEFAULT_MODEL_NAME, params: Optional[Dict[str, Any]] = None,
+              features: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """모델을 학습하고 버전 아티팩트로 저장 (활성 모델은 바꾸지 않음)"""
+        params = self.resolve_params(name, params)
+        features = self._features(X, features)
+        version = self.make_version(data_fingerprint, name, params, features)
+        model = self.build(name, params)
+        # /titanic/predict 는 생존 확률을 반환하므로 확률 예측이 안 되는 모델은 활성화하지 않음
+        if not hasattr(model, "predict_proba"):
+            raise ValueError(f"{name} 모델은 확률 예측(predict_proba)을 지원하지 않습니다. (SVM_rbf 는 probability=True 필요)")
+        model.fit(X, y)
+
+        meta = {
+            "name": name,
+            "version": version,
+            "params": params,
+            "data_fingerprint": data_fingerprint,
+            **features,
+            "train_rows": int(len(X)),
+            "trained_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        model_path, meta_path = self._paths(name, version)
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+        # 임시 파일에 쓴 뒤 교체하여 반쯤 쓰인 파일을 읽지 않도록 함
+        tmp_model = model_path.with_suffix(".joblib.tmp")
+        joblib.dump(model, tmp_model)
+        tmp_model.replace(model_path)
+        self._write_json(meta_path, meta)
+        return {"model": model, "meta": meta}
+
+    def get_or_train(self, X: pd.DataFrame, y: pd.Series, data_fingerprint: str,
+                     name: str = DEFAULT_MODEL_NAME, params: Optional[Dict[str, Any]] = None,
+                     force: bool = False, features: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        요청한 버전의 모델을 활성화하여 반환
+        - 이미 활성 모델이면 그대로 반환
+        - 디스크에 같은 버전이 있으면 로드
+        - 없거나 force=True 이면 학습 후 저장
+        """
+        params = self.resolve_params(name, params)
+        features = self._features(X, features)
+        version = self.make_version(data_fingerprint, name, params, features)
+
+        active = self._active
+        if not force and active is not None and active["meta"]["version"] == version:
+            return active
+
+        # 동시에 들어온 요청이 같은 모델을 중복 학습하지 않도록 직렬화
+        with self._train_lock:
+            active = self._active
+            if not force and active is not None and active["meta"]["version"] == version:
+                return active
+            entry = None if force else self.load(name, version)
+            if entry is None:
+                entry = self.train(X, y, data_fingerprint, name, params, features)
+            self.activate(entry)
+            return entry
+
+    def list_versions(self) -> List[Dict[str, Any]]:
+        """디스크에 저장된 모델 버전 목록 (최신순)"""
+        if not self.model_dir.exists():
+            return []
+        metas = []
+        for meta_path in self.model_dir.glob("*.json"):
+            if meta_path.name == ACTIVE_POINTER:
+                continue
+            try:
+                metas.append(json.loads(meta_path.read_text(encoding="utf-8")))
+            except Exception:
+                continue
+        active_version = self._active["meta"]["version"] if self._active else None
+        for meta in metas:
+            meta["active"] = meta.get("version") == active_version
+        return sorted(metas, key=lambda m: m.get("trained_at", ""), reverse=True)
+
+
+def predict_proba(model, X: pd.DataFrame) -> np.ndarray:
+    """
+    클래스별 확률 예측 (model.predict_proba 와 같은 값)
+
+    RandomForest 는 sklearn 이 트리마다 joblib 작업/설정 컨텍스트를 만들어 행이 적을 때
+    예측 시간 대부분이 그 비용이므로, 트리 배열(tree_.predict)을 직접 평균합니다.
+    """
+    if not isinstance(model, RandomForestClassifier) or model.n_outputs_ != 1:
+        return model.predict_proba(X)
+    values = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+    proba = np.zeros((len(values), model.n_classes_))
+    for tree in model.estimators_:
+        tree_proba = tree.tree_.predict(values)[:, :model.n_classes_]
+        normalizer = tree_proba.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        proba += tree_proba / normalizer
+    return proba / len(model.estimators_)
+
+
+def evaluate_candidate(name: str, params: Dict[str, Any], X: pd.DataFrame, y: pd.Series,
+                       cv: Optional[int] = None) -> Dict[str, Any]:
+    """
+    후보 모델 하나를 평가 (프로세스 풀 워커에서 실행되므로 모듈 레벨 함수)
+
+    Args:
+        cv: None 이면 기존과 같은 80/20 홀드아웃, 정수면 Stratified K-Fold
+
+    Returns:
+        fold 별 정확도와 평균/표준편차
+    """
+    started = time.perf_counter()
+    if cv:
+        splits = StratifiedKFold(n_splits=cv, shuffle=True, random_state=42).split(X, y)
+    else:
+        train_idx, val_idx = train_test_split(
+            np.arange(len(X)), test_size=0.2, random_state=42, stratify=y
+        )
+        splits = [(train_idx, val_idx)]
+
+    fold_scores = []
+    for train_idx, val_idx in splits:
+        model = MODEL_FACTORIES[name](**params)
+        model.fit(X.iloc[train_idx], y.iloc[train_idx])
+        fold_scores.append(float(accuracy_score(y.iloc[val_idx], model.predict(X.iloc[val_idx]))))
+
+    return {
+        "name": name,
+        "params": params,
+        "cv": cv,
+        "fold_scores": fold_scores,
+        "accuracy": float(np.mean(fold_scores)),
+        "std": float(np.std(fold_scores)),
+        "fit_seconds": round(time.perf_counter() - started, 4),
+    }
+
+
+class EvaluationCache:
+    """
+    모델 평가 결과 메모이제이션
+    (데이터 해시, 피처 형태, 모델 이름, 파라미터, 분할 방식) 이 같으면 저장된 점수를 그대로 반환
+    """
+
+    def __init__(self, cache_dir: Path = EVALUATION_DIR) -> None:
+        self.cache_dir = Path(cache_dir)
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(data_fingerprint: str, name: str, params: Dict[str, Any], cv: Optional[int],
+                 features: Optional[Dict[str, Any]] = None) -> str:
+        key = json.dumps({"data": data_fingerprint, "features": features, "name": name, "params": params, "cv": cv},
+                         sort_keys=True, default=str)
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+        file_path = self.cache_dir / f"{key}.json"
+        if not file_path.exists():
+            return None
+        try:
+            result = json.loads(file_path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        with self._lock:
+            self._memory[key] = result
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = result
+        TitanicModels._write_json(self.cache_dir / f"{key}.json", result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        for file_path in self.cache_dir.glob("*.json"):
+            file_path.unlink(missing_ok=True)
@@ -0,0 +1,315 @@
+"""
+Titanic Preprocessing Pipeline
+학습 데이터로 한 번 fit 한 뒤 재사용하는 전처리 파이프라인
+"""
+import copy
+import hashlib
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+from .titanic_method import (
+    AGE_BINS,
+    AGE_LABELS,
+    DATA_DIR,
+    EMBARKED_TO_NUM,
+    GENDER_TO_NUM,
+    TITLE_MAPPING,
+    TITLE_PATTERN,
+    TITLE_TO_NUM,
+)
+from .titanic_schema import read_titanic
+
+# 파이프라인/모델 아티팩트 저장 위치
+SAVE_DIR = Path(__file__).parent / "save"
+PIPELINE_PATH = SAVE_DIR / "titanic_pipeline.joblib"
+
+_TITLE_RE = re.compile(TITLE_PATTERN)
+
+
+def _fill(values: np.ndarray, fill) -> np.ndarray:
+    """NaN 을 fill(스칼라 또는 같은 길이 배열)로 대체"""
+    return np.where(np.isnan(values), fill, values)
+
+
+def file_fingerprint(file_path: Path) -> str:
+    """파일 내용의 sha1 해시 (데이터 변경 감지용)"""
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TitanicPipeline:
+    """
+    타이타닉 전처리 파이프라인
+
+    TitanicMethod 의 drop_feature → title_nominal → gender_nominal → age_ratio
+    → fare_ratio → embarked_nominal 체인과 같은 피처를 만들지만,
+    결측치 대체값(Title별 Age 중앙값, Fare 중앙값, Embarked 최빈값 등)은
+    fit 시점의 train 데이터에서 한 번만 학습하고 이후에는 그대로 재사용합니다.
+    transform 은 새 행 전체를 한 번의 벡터 연산으로 변환합니다.
+
+    compact=True 이면 Gender 와 값이 같은 Gender_encoded/Gender_male/Gender_female,
+    Embarked 와 값이 같은 Embarked_C/Q/S 더미 컬럼을 만들지 않고,
+    피처를 int8/float32 로 내보내 대용량 데이터에서도 메모리를 적게 씁니다.
+    """
+
+    VERSION = 2
+    LABEL = "Survived"
+    ID = "PassengerId"
+    FEATURE_COLUMNS = [
+        'Pclass', 'Gender', 'Age', 'Fare', 'Embarked', 'Title',
+        'Gender_encoded', 'Gender_male', 'Gender_female', 'AgeGroup',
+        'Fare_log', 'Embarked_C', 'Embarked_Q', 'Embarked_S',
+    ]
+    # 중복 더미 컬럼을 뺀 피처 (compact 모드)
+    COMPACT_FEATURE_COLUMNS = [
+        'Pclass', 'Gender', 'Age', 'Fare', 'Embarked', 'Title', 'AgeGroup', 'Fare_log',
+    ]
+    COMPACT_DTYPES = {
+        'Pclass': np.int8, 'Gender': np.int8, 'Age': np.int16, 'Fare': np.float32,
+        'Embarked': np.int8, 'Title': np.int8, 'AgeGroup': np.int8, 'Fare_log': np.float32,
+    }
+
+    def __init__(self, compact: bool = False) -> None:
+        self.version = self.VERSION
+        self.compact = compact
+        self.title_age_medians: Dict[int, float] = {}
+        self.age_median: Optional[float] = None
+        self.fare_median: Optional[float] = None
+        self.embarked_mode: Optional[int] = None
+        self.gender_mode: Optional[int] = None
+        self.pclass_mode: Optional[int] = None
+        self.feature_columns: List[str] = list(self.COMPACT_FEATURE_COLUMNS if compact else self.FEATURE_COLUMNS)
+        self.source_fingerprint: Optional[str] = None
+        self.fitted_at: Optional[str] = None
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.age_median is not None
+
+    # ------------------------------------------------------------------
+    # 컬럼 단위 변환 (fit/transform 공용, numpy 배열 반환)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _text(series: pd.Series) -> pd.Series:
+        """.str 접근자를 쓸 수 있도록 문자열이 아닌 dtype(전부 결측인 float 등)은 object 로 변환"""
+        if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            return series
+        return series.astype(object)
+
+    @classmethod
+    def _title(cls, df: pd.DataFrame) -> np.ndarray:
+        rare = TITLE_TO_NUM['Rare']
+        if 'Name' not in df.columns:
+            return np.full(len(df), rare, dtype=np.int64)
+        # 호칭 추출 후 고유 호칭에만 매핑 (추출 실패/결측 코드 -1 은 마지막 Rare)
+        codes, titles = pd.factorize(cls._text(df['Name']).str.extract(_TITLE_RE, expand=False))
+        table = pd.Series(titles, dtype=object).map(TITLE_MAPPING).fillna('Rare').map(TITLE_TO_NUM)
+        return np.append(table.to_numpy(dtype=np.int64), rare)[codes]
+
+    @classmethod
+    def _lookup(cls, df: pd.DataFrame, column: str, mapping: Dict[str, int], normalize: str) -> np.ndarray:
+        """범주형 컬럼을 mapping 으로 코드화 (normalize: 'lower'/'upper', 알 수 없는 값/결측은 NaN)"""
+        if column not in df.columns:
+            return np.full(len(df), np.nan)
+        series = df[column]
+        # 고유값(범주형이면 범주)만 정규화/매핑하고 코드로 한 번에 조회
+        if isinstance(series.dtype, CategoricalDtype):
+            codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+        normalized = getattr(cls._text(pd.Series(uniques)).str, normalize)()
+        table = normalized.map(mapping).to_numpy(dtype=np.float64, na_value=np.nan)
+        return np.append(table, np.nan)[codes]  # 결측 코드(-1)는 마지막 NaN
+
+    @classmethod
+    def _gender(cls, df: pd.DataFrame) -> np.ndarray:
+        column = 'Sex' if 'Sex' in df.columns else 'Gender'
+        if column in df.columns and pd.api.types.is_numeric_dtype(df[column]):
+            return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        return cls._lookup(df, column, GENDER_TO_NUM, 'lower')
+
+    @classmethod
+    def _embarked(cls, df: pd.DataFrame) -> np.ndarray:
+        return cls._lookup(df, 'Embarked', EMBARKED_TO_NUM, 'upper')
+
+    @staticmethod
+    def _numeric(df: pd.DataFrame, column: str) -> np.ndarray:
+        if column not in df.columns:
+            return np.full(len(df), np.nan)
+        # nullable 정수(Int8 등)의 pd.NA 도 NaN 으로 변환
+        return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+    @staticmethod
+    def _mode(values: np.ndarray) -> int:
+        values = values[~np.isnan(values)]
+        uniques, counts = np.unique(values, return_counts=True)
+        return int(uniques[np.argmax(counts)])
+
+    # ------------------------------------------------------------------
+    # fit / transform
+    # ------------------------------------------------------------------
+    def fit(self, df: pd.DataFrame, source_fingerprint: Optional[str] = None) -> "TitanicPipeline":
+        """
+        train 데이터로부터 결측치 대체값을 학습
+
+        Args:
+            df: 원본 train 데이터프레임 (Survived 포함 가능)
+            source_fingerprint: 원본 파일 해시 (재사용 가능 여부 판단용)
+        """
+        title = self._title(df)
+        age = pd.Series(self._numeric(df, 'Age'))
+
+        self.title_age_medians = {
+            int(k): float(v) for k, v in age.groupby(title).median().dropna().items()
+        }
+        self.age_median = float(age.median())
+        self.fare_median = float(np.nanmedian(self._numeric(df, 'Fare')))
+        self.embarked_mode = self._mode(self._embarked(df))
+        self.gender_mode = self._mode(self._gender(df))
+        self.pclass_mode = self._mode(self._numeric(df, 'Pclass'))
+        self.source_fingerprint = source_fingerprint
+        self.fitted_at = datetime.now().isoformat(timespec='seconds')
+        return self
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        원본 행들을 모델 입력 피처로 변환 (한 번의 벡터 연산)
+
+        Args:
+            df: train/test 와 같은 컬럼을 가진 데이터프레임 (일부 컬럼 누락 허용)
+
+        Returns:
+            feature_columns 순서의 피처 데이터프레임 (입력 index 유지)
+        """
+        if not self.is_fitted:
+            raise RuntimeError("파이프라인이 아직 fit 되지 않았습니다.")
+
+        title = self._title(df)
+        gender = _fill(self._gender(df), self.gender_mode).astype(np.int64)
+        age = self._numeric(df, 'Age')
+        title_medians = np.array([
+            self.title_age_medians.get(code, np.nan) for code in range(len(TITLE_TO_NUM))
+        ])
+        age = _fill(age, title_medians[title])
+        age = np.round(_fill(age, self.age_median)).astype(np.int64)
+        # pd.cut(bins=AGE_BINS, right=False) 와 같은 구간 인덱스
+        age_group = np.clip(np.searchsorted(AGE_BINS, age, side='right') - 1, 0, len(AGE_LABELS) - 1)
+        fare = _fill(self._numeric(df, 'Fare'), self.fare_median)
+        embarked = _fill(self._embarked(df), self.embarked_mode).astype(np.int64)
+        pclass = _fill(self._numeric(df, 'Pclass'), self.pclass_mode).astype(np.int64)
+
+        if self.compact:
+            features = pd.DataFrame({
+                'Pclass': pclass,
+                'Gender': gender,
+                'Age': age,
+                'Fare': fare,
+                'Embarked': embarked,
+                'Title': title,
+                'AgeGroup': np.asarray(AGE_LABELS)[age_group],
+                'Fare_log': np.log1p(fare),
+            }, index=df.index)
+            return features[self.feature_columns].astype(self.COMPACT_DTYPES)
+
+        features = pd.DataFrame({
+            'Pclass': pclass,
+            'Gender': gender,
+            'Age': age,
+            'Fare': fare,
+            'Embarked': embarked,
+            'Title': title,
+            'Gender_encoded': gender,
+            'Gender_male': (gender == 0).astype(np.int64),
+            'Gender_female': (gender == 1).astype(np.int64),
+            'AgeGroup': np.asarray(AGE_LABELS)[age_group],
+            'Fare_log': np.log1p(fare),
+            'Embarked_C': (embarked == 0).astype(np.int64),
+            'Embarked_Q': (embarked == 1).astype(np.int64),
+            'Embarked_S': (embarked == 2).astype(np.int64),
+        }, index=df.index)
+        return features[self.feature_columns]
+
+    def fit_transform(self, df: pd.DataFrame, source_fingerprint: Optional[str] = None) -> pd.DataFrame:
+        return self.fit(df, source_fingerprint).transform(df)
+
+    def with_compact(self, compact: bool) -> "TitanicPipeline":
+        """같은 학습값으로 출력 형태(compact 여부와 피처 컬럼)만 바꾼 사본"""
+        pipeline = copy.copy(self)
+        pipeline.compact = compact
+        pipeline.feature_columns = list(self.COMPACT_FEATURE_COLUMNS if compact else self.FEATURE_COLUMNS)
+        return pipeline
+
+    # ------------------------------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------------------------------
+    def save(self, file_path: Path = PIPELINE_PATH) -> Path:
+        """파이프라인을 디스크에 저장 (임시 파일에 쓴 뒤 교체)"""
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
+        joblib.dump(self, tmp_path)
+        tmp_path.replace(file_path)
+        return file_path
+
+    @classmethod
+    def load(cls, file_path: Path = PIPELINE_PATH) -> "TitanicPipeline":
+        pipeline = joblib.load(file_path)
+        if not isinstance(pipeline, cls):
+            raise TypeError(f"파이프라인 파일 형식이 올바르지 않습니다: {file_path}")
+        return pipeline
+
+    @classmethod
+    def load_or_fit(cls, train_path: Path = DATA_DIR / "train.csv",
+                    file_path: Path = PIPELINE_PATH, compact: bool = False) -> "TitanicPipeline":
+        """
+        저장된 파이프라인이 현재 train.csv 로 같은 설정(compact)으로 학습된 것이면 그대로 로드하고,
+        없거나 train.csv 가 바뀌었으면 다시 fit 후 저장
+        """
+        fingerprint = file_fingerprint(train_path)
+        if Path(file_path).exists():
+            try:
+                pipeline = cls.load(file_path)
+                if (pipeline.source_fingerprint == fingerprint
+                        and getattr(pipeline, 'version', None) == cls.VERSION
+                        and getattr(pipeline, 'compact', False) == compact):
+                    return pipeline
+            except Exception:
+                pass  # 손상된 파일은 다시 생성
+
+        pipeline = cls(compact=compact).fit(read_titanic(train_path), source_fingerprint=fingerprint)
+        pipeline.save(file_path)
+        return pipeline
+
+    def feature_signature(self) -> Dict[str, Any]:
+        """이 파이프라인이 만드는 피처의 형태 (모델/평가 결과가 같은 피처로 만들어졌는지 비교용)"""
+        return {
+            "feature_columns": list(self.feature_columns),
+            "pipeline_version": self.version,
+            "compact": self.compact,
+        }
+
+    def get_info(self) -> dict:
+        """학습된 파라미터 요약"""
+        return {
+            "version": self.version,
+            "compact": self.compact,
+            "fitted_at": self.fitted_at,
+            "source_fingerprint": self.source_fingerprint,
+            "feature_columns": self.feature_columns,
+            "title_age_medians": self.title_age_medians,
+            "age_median": self.age_median,
+            "fare_median": self.fare_median,
+            "embarked_mode": self.embarked_mode,
+            "gender_mode": self.gender_mode,
+            "pclass_mode": self.pclass_mode,
+        }
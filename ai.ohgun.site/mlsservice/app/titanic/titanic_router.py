@@ -3,61 +3,24 @@ Titanic Router
 타이타닉 데이터 관련 API 라우터
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Request
+from typing import List, Optional, Dict, Any, Union
+from pydantic import BaseModel, Field
 import pandas as pd
 import os
 import sys
-import io
-from contextlib import redirect_stdout, redirect_stderr
+import time
+import logging
+import traceback
 from pathlib import Path
+from app.common.executor import get_executor
+from app.common.export import export_response
+from app.common.jobs import get_job_manager
+from app.common.log_capture import capture_logs
+from app.common.serializer import frame_response
 from .titanic_service import TitanicService
 
 
-class TeeOutput:
-    """
-    출력을 버퍼와 실제 stdout/stderr 둘 다에 전달하는 클래스
-    ic() 등 모든 출력이 터미널에도 표시되도록 함
-    """
-    def __init__(self, buffer, original_stream):
-        self.buffer = buffer
-        self.original_stream = original_stream
-        # 원본 스트림의 속성들을 복사
-        self.mode = getattr(original_stream, 'mode', None)
-        self.name = getattr(original_stream, 'name', None)
-        self.encoding = getattr(original_stream, 'encoding', None)
-        self.errors = getattr(original_stream, 'errors', None)
-        self.closed = getattr(original_stream, 'closed', False)
-    
-    def write(self, text):
-        # 버퍼에 저장 (API 응답용)
-        if text:
-            self.buffer.write(text)
-            # 실제 stdout/stderr에도 출력 (터미널 로그용 - Docker 컨테이너 로그)
-            self.original_stream.write(text)
-            self.original_stream.flush()
-    
-    def flush(self):
-        self.buffer.flush()
-        if hasattr(self.original_stream, 'flush'):
-            self.original_stream.flush()
-    
-    def writable(self):
-        return True
-    
-    def readable(self):
-        return False
-    
-    def seekable(self):
-        return False
-    
-    def __getattr__(self, name):
-        """
-        다른 속성/메서드는 원본 스트림에서 가져옴
-        (ic() 등이 사용할 수 있는 모든 메서드 지원)
-        """
-        return getattr(self.original_stream, name)
-
 # APIRouter 생성 (prefix와 tags 설정)
 titanic_router = APIRouter(prefix="/titanic", tags=["titanic"])
 
@@ -72,6 +35,50 @@ def get_service() -> TitanicService:
     return _service_instance
 
 
+logger = logging.getLogger(__name__)
+
+
+@titanic_router.on_event("startup")
+def load_titanic_model():
+    """서버 시작 시 전처리 파이프라인과 활성 모델을 메모리에 올려둠"""
+    try:
+        entry = get_service().get_model()
+        logger.info(f"타이타닉 모델 로드 완료: {entry['meta']['name']} ({entry['meta']['version']})")
+    except Exception as e:
+        # 모델 로드 실패가 서버 기동을 막지 않도록 함 (첫 요청 시 다시 시도)
+        logger.error(f"타이타닉 모델 로드 실패: {e}")
+
+
+# ----------------------------------------------------------------------
+# 백그라운드 잡 (/jobs) 으로 실행할 수 있는 작업 등록
+# ----------------------------------------------------------------------
+def _preprocess_job() -> dict:
+    service = get_service()
+    service.preprogress()
+    return {"message": "전처리 완료", "pipeline": service.get_pipeline().get_info()}
+
+
+def _evaluating_job(cv: Optional[int] = None, refresh: bool = False) -> dict:
+    return get_service().evaluating(cv=cv, refresh=refresh)
+
+
+def _retrain_job(model_name: str = "RandomForest", params: Optional[Dict[str, Any]] = None) -> dict:
+    return get_service().retrain(name=model_name, params=params)
+
+
+get_job_manager().register("titanic.preprocess", _preprocess_job, description="타이타닉 전처리 및 파이프라인 재학습")
+get_job_manager().register("titanic.evaluating", _evaluating_job, description="후보 모델 비교 평가 (cv, refresh)")
+get_job_manager().register("titanic.retrain", _retrain_job, description="모델 재학습 및 활성 모델 교체 (model_name, params)")
+
+
+class RetrainRequest(BaseModel):
+    """모델 재학습 요청 모델"""
+    model_name: str = Field(
+        "RandomForest", description="RandomForest, DecisionTree, LogisticRegression, GaussianNB, SVM_rbf"
+    )
+    params: Optional[Dict[str, Any]] = Field(None, description="하이퍼파라미터 (생략한 키는 모델별 기본값)")
+
+
 @titanic_router.get("/")
 async def titanic_root():
     """타이타닉 서비스 상태 확인"""
@@ -86,223 +93,134 @@ async def titanic_root():
 @titanic_router.post("/preprocess")
 async def preprocess():
     """데이터 전처리 실행"""
-    import traceback
-    try:
-        service = get_service()
-        # 로그를 캡처하기 위한 StringIO 버퍼
-        log_buffer = io.StringIO()
-        
-        # stdout과 stderr를 캡처
-        with redirect_stdout(log_buffer), redirect_stderr(log_buffer):
-            try:
-                service.preprogress()
-            except Exception as inner_e:
-                # 내부 에러도 로그에 포함
-                traceback.print_exc(file=log_buffer)
-                raise inner_e
-        
-        # 캡처된 로그 가져오기
-        logs = log_buffer.getvalue()
-        
-        # 로그를 리스트로 변환 (빈 줄 제거)
-        log_lines = [line for line in logs.split('\n') if line.strip()]
-        
-        return {
-            "message": "전처리 완료",
-            "status": "success",
-            "logs": log_lines
-        }
-    except Exception as e:
-        error_trace = traceback.format_exc()
-        return {
-            "message": "전처리 중 오류 발생",
-            "status": "error",
-            "error": str(e),
-            "error_trace": error_trace.split('\n'),
-            "logs": []
-        }
+    return await _execute_preprocess()
 
 
 @titanic_router.post("/modeling")
 async def modeling():
     """모델링 실행"""
-    try:
-        service = get_service()
-        log_buffer = io.StringIO()
-        
-        with redirect_stdout(log_buffer), redirect_stderr(log_buffer):
-            service.modeling()
-        
-        logs = log_buffer.getvalue()
-        
-        return {
-            "message": "모델링 완료",
-            "status": "success",
-            "logs": logs.split('\n') if logs else []
-        }
-    except Exception as e:
-        return {
-            "message": "모델링 중 오류 발생",
-            "status": "error",
-            "error": str(e),
-            "logs": []
-        }
+    with capture_logs() as request_log:
+        try:
+            await get_executor().run_in_thread("titanic.modeling", get_service().modeling)
+            return {
+                "message": "모델링 완료",
+                "status": "success",
+                "logs": request_log.lines()
+            }
+        except Exception as e:
+            return {
+                "message": "모델링 중 오류 발생",
+                "status": "error",
+                "error": str(e),
+                "logs": request_log.lines()
+            }
 
 
 @titanic_router.post("/learning")
 async def learning():
     """학습 실행"""
-    try:
-        service = get_service()
-        log_buffer = io.StringIO()
-        
-        with redirect_stdout(log_buffer), redirect_stderr(log_buffer):
-            service.learning()
-        
-        logs = log_buffer.getvalue()
-        
-        return {
-            "message": "학습 완료",
-            "status": "success",
-            "logs": logs.split('\n') if logs else []
-        }
-    except Exception as e:
-        return {
-            "message": "학습 중 오류 발생",
-            "status": "error",
-            "error": str(e),
-            "logs": []
-        }
+    with capture_logs() as request_log:
+        try:
+            await get_executor().run_in_thread("titanic.learning", get_service().learning)
+            return {
+                "message": "학습 완료",
+                "status": "success",
+                "logs": request_log.lines()
+            }
+        except Exception as e:
+            return {
+                "message": "학습 중 오류 발생",
+                "status": "error",
+                "error": str(e),
+                "logs": request_log.lines()
+            }
 
 
 @titanic_router.post("/evaluating")
-async def evaluating():
-    """평가 실행"""
-    try:
-        service = get_service()
-        log_buffer = io.StringIO()
-        
-        with redirect_stdout(log_buffer), redirect_stderr(log_buffer):
-            service.evaluating()
-        
-        logs = log_buffer.getvalue()
-        
-        return {
-            "message": "평가 완료",
-            "status": "success",
-            "logs": logs.split('\n') if logs else []
-        }
-    except Exception as e:
-        return {
-            "message": "평가 중 오류 발생",
-            "status": "error",
-            "error": str(e),
-            "logs": []
-        }
+async def evaluating(
+    cv: Optional[int] = Query(None, ge=2, le=20, description="K-Fold 교차 검증 fold 수 (생략 시 80/20 홀드아웃)"),
+    refresh: bool = Query(False, description="캐시된 평가 결과를 무시하고 다시 평가")
+):
+    """
+    평가 실행
+    
+    후보 모델들을 병렬로 평가하며, 데이터와 모델 파라미터가 같으면 캐시된 점수를 반환합니다.
+    """
+    with capture_logs() as request_log:
+        try:
+            # 후보 모델 학습은 evaluating 내부에서 공용 프로세스 풀로 분산됨
+            result = await get_executor().run_in_thread(
+                "titanic.evaluating", get_service().evaluating, cv=cv, refresh=refresh
+            )
+            return {
+                "message": "평가 완료",
+                "status": "success",
+                "result": result,
+                "logs": request_log.lines()
+            }
+        except Exception as e:
+            return {
+                "message": "평가 중 오류 발생",
+                "status": "error",
+                "error": str(e),
+                "logs": request_log.lines()
+            }
 
 
 # GET 메서드도 지원 (Postman에서 GET 호출 시 405 방지)
 @titanic_router.get("/evaluating")
-async def evaluating_get():
-    return await evaluating()
+async def evaluating_get(
+    cv: Optional[int] = Query(None, ge=2, le=20, description="K-Fold 교차 검증 fold 수 (생략 시 80/20 홀드아웃)"),
+    refresh: bool = Query(False, description="캐시된 평가 결과를 무시하고 다시 평가")
+):
+    return await evaluating(cv=cv, refresh=refresh)
 
 
 @titanic_router.post("/submit")
 async def submit():
     """제출 실행"""
-    try:
-        service = get_service()
-        log_buffer = io.StringIO()
-        
-        with redirect_stdout(log_buffer), redirect_stderr(log_buffer):
-            service.submit()
-        
-        logs = log_buffer.getvalue()
-        
-        return {
-            "message": "제출 완료",
-            "status": "success",
-            "logs": logs.split('\n') if logs else []
-        }
-    except Exception as e:
-        return {
-            "message": "제출 중 오류 발생",
-            "status": "error",
-            "error": str(e),
-            "logs": []
-        }
+    with capture_logs() as request_log:
+        try:
+            await get_executor().run_in_thread("titanic.submit", get_service().submit)
+            return {
+                "message": "제출 완료",
+                "status": "success",
+                "logs": request_log.lines()
+            }
+        except Exception as e:
+            return {
+                "message": "제출 중 오류 발생",
+                "status": "error",
+                "error": str(e),
+                "logs": request_log.lines()
+            }
 
 
 async def _execute_preprocess():
     """
     전처리 실행 공통 로직
-    터미널과 API 응답 둘 다에 로그 출력
+    
+    서비스 로그는 logging 을 통해 컨테이너 로그(배치 출력)와
+    이 요청의 수집기에 동시에 기록되며, 응답에는 이 요청에서 발생한 로그만 포함됩니다.
     """
-    import traceback
-    try:
-        service = get_service()
-        log_buffer = io.StringIO()
-        
-        # Docker 컨테이너의 실제 stdout/stderr 가져오기
-        # Docker에서는 sys.stdout이 이미 컨테이너의 stdout과 연결되어 있음
-        # 하지만 버퍼링을 피하기 위해 sys.stderr도 사용
-        original_stdout = sys.stdout
-        original_stderr = sys.stderr
-        
-        # TeeOutput으로 버퍼와 실제 stdout/stderr 둘 다에 출력
-        # Docker 컨테이너의 stdout/stderr는 자동으로 docker logs에 표시됨
-        tee_stdout = TeeOutput(log_buffer, original_stdout)
-        tee_stderr = TeeOutput(log_buffer, original_stderr)
-        
-        # stdout과 stderr를 TeeOutput으로 리다이렉트
-        sys.stdout = tee_stdout
-        sys.stderr = tee_stderr
-        
-        # Python의 출력 버퍼링 비활성화 (즉시 출력 보장)
-        import os
-        os.environ['PYTHONUNBUFFERED'] = '1'
-        
+    with capture_logs() as request_log:
         try:
-            service.preprogress()
-            # 모든 출력이 flush되도록 보장
-            sys.stdout.flush()
-            sys.stderr.flush()
-        except Exception as inner_e:
-            # 내부 에러도 로그에 포함
-            traceback.print_exc(file=tee_stderr)
-            sys.stderr.flush()
-            raise inner_e
-        finally:
-            # 모든 출력 flush
-            sys.stdout.flush()
-            sys.stderr.flush()
-            # 원본 stdout/stderr 복원
-            sys.stdout = original_stdout
-            sys.stderr = original_stderr
-        
-        # 캡처된 로그 가져오기
-        logs = log_buffer.getvalue()
-        
-        # 로그를 리스트로 변환 (빈 줄 제거)
-        log_lines = [line for line in logs.split('\n') if line.strip()]
-        
-        return {
-            "message": "전처리 완료",
-            "status": "success",
-            "logs": log_lines
-        }
-    except Exception as e:
-        error_trace = traceback.format_exc()
-        # 에러도 터미널에 출력
-        print(f"❌ 전처리 중 오류 발생: {e}", file=sys.stderr)
-        print(error_trace, file=sys.stderr)
-        return {
-            "message": "전처리 중 오류 발생",
-            "status": "error",
-            "error": str(e),
-            "error_trace": error_trace.split('\n'),
-            "logs": []
-        }
+            await get_executor().run_in_thread("titanic.preprocess", get_service().preprogress)
+            return {
+                "message": "전처리 완료",
+                "status": "success",
+                "logs": request_log.lines()
+            }
+        except Exception as e:
+            error_trace = traceback.format_exc()
+            logger.error(f"❌ 전처리 중 오류 발생: {e}\n{error_trace}")
+            return {
+                "message": "전처리 중 오류 발생",
+                "status": "error",
+                "error": str(e),
+                "error_trace": error_trace.split('\n'),
+                "logs": request_log.lines()
+            }
 
 
 @titanic_router.get("/preprocess/run")
@@ -323,8 +241,242 @@ async def preprocess_run_post():
     return await _execute_preprocess()
 
 
+@titanic_router.get("/pipeline")
+async def get_pipeline_info():
+    """
+    fit 된 전처리 파이프라인 정보 조회
+    
+    저장된 파이프라인이 없거나 train.csv 가 바뀌었으면 새로 fit 후 저장합니다.
+    """
+    try:
+        service = get_service()
+        pipeline = await get_executor().run_in_thread("titanic.pipeline", service.get_pipeline)
+        return {
+            "success": True,
+            "pipeline": pipeline.get_info()
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"파이프라인 조회 중 오류 발생: {str(e)}"
+        )
+
+
+@titanic_router.get("/memory")
+async def get_memory_report(
+    file_name: str = Query("train.csv", description="data 폴더의 CSV 파일명 (train.csv, test.csv)"),
+    arrow: bool = Query(False, description="문자열 컬럼을 Arrow 문자열로 로드 (pyarrow 필요)")
+):
+    """
+    데이터 로드/피처 메모리 사용량 리포트
+    
+    - load: pd.read_csv 기본 dtype 대비 스키마 로더(category, int8, float32)
+    - features: 전체 피처 대비 중복 더미 컬럼을 뺀 compact 피처
+    """
+    if file_name not in ("train.csv", "test.csv"):
+        raise HTTPException(status_code=400, detail="file_name 은 train.csv 또는 test.csv 만 가능합니다.")
+    try:
+        report = await get_executor().run_in_thread(
+            "titanic.data", get_service().memory_report, file_name=file_name, arrow=arrow
+        )
+        return {"success": True, "report": report}
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"메모리 리포트 생성 중 오류 발생: {str(e)}"
+        )
+
+
+class PassengerRecord(BaseModel):
+    """예측할 승객 한 명 (train.csv/test.csv 와 같은 컬럼, 누락 값은 학습된 대체값 사용)"""
+    PassengerId: Optional[int] = None
+    Pclass: Optional[int] = None
+    Name: Optional[str] = None
+    Sex: Optional[str] = None
+    Age: Optional[float] = None
+    SibSp: Optional[int] = None
+    Parch: Optional[int] = None
+    Ticket: Optional[str] = None
+    Fare: Optional[float] = None
+    Cabin: Optional[str] = None
+    Embarked: Optional[str] = None
+
+
+class PredictRequest(BaseModel):
+    """예측 요청 모델 (승객 1명 ~ 수천 명)"""
+    passengers: List[PassengerRecord]
+
+
+def _prediction_response(result: pd.DataFrame, started: float) -> dict:
+    service = get_service()
+    result = result.astype(object).where(pd.notna(result), None)
+    return {
+        "success": True,
+        "count": len(result),
+        "model_version": service.models.active["meta"]["version"] if service.models.active else None,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        "predictions": result.to_dict(orient='records')
+    }
+
+
+@titanic_router.post("/predict")
+async def predict(request: Union[PredictRequest, List[PassengerRecord], PassengerRecord]):
+    """
+    승객 생존 확률 예측 (JSON)
+    
+    승객 1명(객체), 승객 목록(배열) 또는 {"passengers": [...]} 형식을 받아
+    fit 된 전처리 파이프라인과 활성 모델로 한 번에 예측합니다.
+    
+    Returns:
+        PassengerId, survival_probability, Survived 목록
+    """
+    started = time.perf_counter()
+    if isinstance(request, PredictRequest):
+        records = request.passengers
+    elif isinstance(request, list):
+        records = request
+    else:
+        records = [request]
+    if not records:
+        raise HTTPException(status_code=400, detail="예측할 승객 데이터가 없습니다.")
+    try:
+        df = pd.DataFrame([record.model_dump() for record in records])
+        result = await get_executor().run_in_thread("titanic.predict", get_service().predict, df)
+        return _prediction_response(result, started)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"예측 중 오류 발생: {str(e)}"
+        )
+
+
+@titanic_router.post("/predict/csv")
+async def predict_csv(file: UploadFile = File(..., description="train.csv/test.csv 형식의 승객 CSV")):
+    """
+    승객 생존 확률 예측 (CSV 업로드)
+    
+    업로드된 CSV 를 PREDICT_BATCH_SIZE 행 단위 청크로 읽으면서 예측하므로
+    파일 전체를 한 번에 데이터프레임으로 올리지 않습니다.
+    """
+    started = time.perf_counter()
+    try:
+        service = get_service()
+        
+        def run():
+            return [
+                service.predict(chunk)
+                for chunk in pd.read_csv(file.file, chunksize=service.PREDICT_BATCH_SIZE)
+            ]
+        
+        results = await get_executor().run_in_thread("titanic.predict", run)
+        if not results:
+            raise HTTPException(status_code=400, detail="CSV 파일에 데이터가 없습니다.")
+        return _prediction_response(pd.concat(results, ignore_index=True), started)
+    except HTTPException:
+        raise
+    except pd.errors.EmptyDataError:
+        raise HTTPException(status_code=400, detail="CSV 파일이 비어있습니다.")
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"CSV 예측 중 오류 발생: {str(e)}"
+        )
+    finally:
+        await file.close()
+
+
+@titanic_router.get("/predict/export")
+async def export_predictions(
+    request: Request,
+    source: str = Query("test", pattern="^(train|test)$", description="예측할 데이터 (train, test)"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="출력 형식 (ndjson, csv)"),
+    compress: bool = Query(True, description="Accept-Encoding: gzip 이면 gzip 으로 전송")
+):
+    """
+    train.csv/test.csv 전체 예측 결과 스트리밍 다운로드
+    
+    CSV 를 PREDICT_BATCH_SIZE 행 단위로 읽어 예측한 청크를 바로 내보내므로
+    파일 크기와 무관하게 한 청크만 메모리에 올립니다.
+    
+    Returns:
+        PassengerId, survival_probability, Survived 행 (NDJSON 또는 CSV)
+    """
+    csv_path = Path(__file__).parent / "data" / f"{source}.csv"
+    if not csv_path.exists():
+        raise HTTPException(status_code=404, detail=f"{source}.csv 파일을 찾을 수 없습니다: {csv_path}")
+    service = get_service()
+    try:
+        # 파이프라인/모델 준비는 스트리밍 전에 끝내서 실패 시 정상적인 오류 응답을 반환
+        entry = await get_executor().run_in_thread("titanic.predict", service.get_model)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"모델 로드 중 오류 발생: {str(e)}")
+
+    def chunks():
+        for chunk in pd.read_csv(csv_path, chunksize=service.PREDICT_BATCH_SIZE):
+            yield service.predict(chunk)
+
+    return export_response(
+        request, chunks, format, f"titanic_{source}_predictions", compress=compress,
+        headers={"X-Model-Version": entry["meta"]["version"]},
+    )
+
+
+@titanic_router.get("/models")
+async def get_models():
+    """
+    모델 레지스트리 조회
+    
+    현재 활성 모델과 디스크에 저장된 모델 버전 목록을 반환합니다.
+    """
+    try:
+        service = get_service()
+        active = service.models.active
+        return {
+            "success": True,
+            "active": active["meta"] if active else None,
+            "versions": service.models.list_versions()
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"모델 목록 조회 중 오류 발생: {str(e)}"
+        )
+
+
+@titanic_router.post("/models/retrain")
+async def retrain_model(request: Optional[RetrainRequest] = None):
+    """
+    모델 재학습 및 활성 모델 교체
+    
+    새 모델 학습과 저장이 끝난 뒤에 활성 모델을 한 번에 교체하므로,
+    학습 중에도 /titanic/submit 은 기존 모델로 응답합니다.
+    """
+    request = request or RetrainRequest()
+    try:
+        service = get_service()
+        meta = await get_executor().run_in_thread(
+            "titanic.retrain", service.retrain, name=request.model_name, params=request.params
+        )
+        return {
+            "success": True,
+            "message": "모델 재학습 완료",
+            "model": meta
+        }
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"잘못된 모델 설정: {str(e)}")
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"모델 재학습 중 오류 발생: {str(e)}"
+        )
+
+
 @titanic_router.get("/passengers/top10")
-async def get_top_10_passengers():
+async def get_top_10_passengers(
+    format: str = Query("json", pattern="^(json|ndjson|arrow)$", description="응답 형식 (json, ndjson, arrow)")
+):
     """
     train.csv 파일에서 상위 10명의 승객 목록을 조회합니다.
     
@@ -334,7 +486,7 @@ async def get_top_10_passengers():
     try:
         # CSV 파일 경로 설정
         current_dir = Path(__file__).parent
-        csv_path = current_dir / "train.csv"
+        csv_path = current_dir / "data" / "train.csv"
         
         # 파일 존재 확인
         if not csv_path.exists():
@@ -343,30 +495,14 @@ async def get_top_10_passengers():
                 detail=f"train.csv 파일을 찾을 수 없습니다: {csv_path}"
             )
         
-        # CSV 파일 읽기
-        df = pd.read_csv(csv_path)
+        # CSV 파일 읽기 (상위 10행만)
+        df = await get_executor().run_in_thread("titanic.data", pd.read_csv, csv_path, nrows=10)
         
         # 상위 10명 선택 (PassengerId 기준)
         top_10 = df.head(10)
         
-        # NaN, inf 값을 None으로 변환하여 JSON 직렬화 가능하게 함
-        top_10 = top_10.replace([float('inf'), float('-inf')], None)
-        top_10 = top_10.where(pd.notna(top_10), None)
-        
-        # DataFrame을 딕셔너리 리스트로 변환
-        passengers_list = top_10.to_dict(orient='records')
-        
-        # 딕셔너리 내부의 모든 값도 확인하여 inf, nan 처리
-        for passenger in passengers_list:
-            for key, value in passenger.items():
-                if pd.isna(value) or (isinstance(value, float) and (value == float('inf') or value == float('-inf'))):
-                    passenger[key] = None
-        
-        return {
-            "success": True,
-            "count": len(passengers_list),
-            "data": passengers_list
-        }
+        # NaN/inf 를 컬럼 단위로 None 처리하여 요청 형식(json/ndjson/arrow)으로 직렬화
+        return frame_response(top_10, format, {"success": True})
         
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -381,42 +517,26 @@ async def get_top_10_passengers():
 @titanic_router.get("/submit")
 async def submit_prediction():
     """
-    RandomForest 모델로 test.csv 예측 후 Kaggle 제출용 CSV 생성
+    활성 모델(레지스트리)로 test.csv 예측 후 Kaggle 제출용 CSV 생성
     
     Returns:
         제출 파일 생성 결과 및 상위 10개 예측 결과
     """
     try:
-        service = TitanicService()
-        
-        # TeeOutput을 사용하여 터미널 로그도 출력
-        stdout_buffer = io.StringIO()
-        stderr_buffer = io.StringIO()
-        
-        tee_stdout = TeeOutput(stdout_buffer, sys.__stdout__)
-        tee_stderr = TeeOutput(stderr_buffer, sys.__stderr__)
-        
-        result = None
-        with redirect_stdout(tee_stdout), redirect_stderr(tee_stderr):
-            result = service.submit()
-        
-        # 버퍼에서 출력 로그 가져오기
-        captured_logs = stdout_buffer.getvalue() + stderr_buffer.getvalue()
+        service = get_service()
         
-        # ANSI 색상 코드 제거
-        import re
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        clean_logs = ansi_escape.sub('', captured_logs)
+        # 이 요청에서 발생한 로그만 수집 (ic() 출력은 색상 코드 없이 logging 으로 기록됨)
+        with capture_logs() as request_log:
+            result = await get_executor().run_in_thread("titanic.submit", service.submit)
         
         return {
             "status": "success",
             "message": "Kaggle 제출 파일이 생성되었습니다",
             "result": result,
-            "logs": clean_logs
+            "logs": "\n".join(request_log.lines())
         }
         
     except Exception as e:
-        import traceback
         error_detail = traceback.format_exc()
         raise HTTPException(
             status_code=500,
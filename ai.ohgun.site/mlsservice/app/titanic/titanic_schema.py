@@ -0,0 +1,148 @@
+"""
+Titanic Schema
+타이타닉 CSV 를 작은 dtype(category, int8, float32)으로 읽는 스키마 기반 로더
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+from app.common.dataset_cache import get_dataset_cache
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:  # pyarrow 가 없으면 기본 pandas 엔진/문자열 사용
+    HAS_PYARROW = False
+
+SEX_DTYPE = CategoricalDtype(['male', 'female'])
+EMBARKED_DTYPE = CategoricalDtype(['C', 'Q', 'S'])
+
+# 컬럼별 목표 dtype (정수 컬럼에 결측이 있으면 같은 크기의 nullable 정수로 대체)
+TITANIC_SCHEMA: Dict[str, object] = {
+    'PassengerId': np.int32,
+    'Survived': np.int8,
+    'Pclass': np.int8,
+    'Name': 'string',
+    'Sex': SEX_DTYPE,
+    'Age': np.float32,
+    'SibSp': np.int8,
+    'Parch': np.int8,
+    'Ticket': 'string',
+    'Fare': np.float32,
+    'Cabin': 'string',
+    'Embarked': EMBARKED_DTYPE,
+}
+_NULLABLE_INT = {np.int8: 'Int8', np.int16: 'Int16', np.int32: 'Int32', np.int64: 'Int64'}
+
+PathLike = Union[str, Path]
+
+
+def _string_dtype(arrow: bool):
+    # pyarrow 문자열은 행마다 파이썬 객체를 만들지 않아 메모리가 훨씬 작음
+    return 'string[pyarrow]' if arrow and HAS_PYARROW else object
+
+
+def apply_schema(df: pd.DataFrame, arrow: bool = False) -> pd.DataFrame:
+    """
+    데이터프레임을 TITANIC_SCHEMA dtype 으로 변환 (스키마에 없는 컬럼은 그대로)
+
+    Args:
+        df: 원본 데이터프레임
+        arrow: True 이면 문자열 컬럼을 Arrow 문자열로 저장 (pyarrow 필요)
+    """
+    converted = {}
+    for column, dtype in TITANIC_SCHEMA.items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if dtype == 'string':
+            converted[column] = values.astype(_string_dtype(arrow))
+        elif isinstance(dtype, CategoricalDtype):
+            # 대소문자/공백이 섞인 입력도 같은 범주로 정규화 (알 수 없는 값은 결측)
+            if not isinstance(values.dtype, CategoricalDtype):
+                normalize = str.upper if column == 'Embarked' else str.lower
+                values = values.map(lambda v: normalize(v.strip()) if isinstance(v, str) else v)
+            converted[column] = values.astype(dtype)
+        elif np.issubdtype(dtype, np.integer):
+            numeric = pd.to_numeric(values, errors='coerce')
+            converted[column] = numeric.astype(_NULLABLE_INT[dtype] if numeric.isna().any() else dtype)
+        else:
+            converted[column] = pd.to_numeric(values, errors='coerce').astype(dtype)
+    return df.assign(**converted)
+
+
+def read_titanic(file_path: PathLike, columns: Optional[List[str]] = None,
+                 arrow: bool = False) -> pd.DataFrame:
+    """
+    타이타닉 형식 파일을 스키마 dtype 으로 로드
+
+    Args:
+        file_path: .csv, .parquet, .feather 파일 경로
+        columns: 읽을 컬럼 (None 이면 전체)
+        arrow: True 이면 pyarrow 엔진으로 읽고 문자열을 Arrow 로 보관 (pyarrow 없으면 무시)
+
+    Returns:
+        스키마가 적용된 데이터프레임
+    """
+    file_path = Path(file_path)
+    suffix = file_path.suffix.lower()
+    if suffix == '.parquet':
+        df = pd.read_parquet(file_path, columns=columns)
+    elif suffix == '.feather':
+        df = pd.read_feather(file_path, columns=columns)
+    else:
+        # CSV 는 스키마 적용 결과 전체를 공용 데이터셋 캐시(Feather)에 두고 컬럼만 골라 반환
+        df = get_dataset_cache().read(
+            file_path,
+            lambda p: apply_schema(_read_csv(p, arrow), arrow=arrow),
+            variant=f"titanic-schema:arrow={arrow and HAS_PYARROW}",
+        )
+        return df[columns] if columns is not None else df
+    return apply_schema(df, arrow=arrow)
+
+
+def _read_csv(file_path: Path, arrow: bool) -> pd.DataFrame:
+    # dtype 을 read_csv 에 바로 넘기면 결측이 있는 정수 컬럼에서 실패하므로 읽은 뒤 변환
+    if arrow and HAS_PYARROW:
+        return pd.read_csv(file_path, engine='pyarrow')
+    return pd.read_csv(file_path)
+
+
+def write_parquet(df: pd.DataFrame, file_path: PathLike) -> Path:
+    """스키마가 적용된 데이터프레임을 Parquet 로 저장 (pyarrow 필요)"""
+    if not HAS_PYARROW:
+        raise ImportError("Parquet 저장에는 pyarrow 가 필요합니다.")
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(file_path, index=False)
+    return file_path
+
+
+def memory_usage(df: pd.DataFrame) -> Dict[str, object]:
+    """컬럼별 dtype 과 실제 메모리 사용량(bytes, 문자열 포함)"""
+    usage = df.memory_usage(deep=True, index=False)
+    return {
+        "rows": int(len(df)),
+        "total_bytes": int(usage.sum()),
+        "columns": {
+            column: {"dtype": str(df[column].dtype), "bytes": int(usage[column])}
+            for column in df.columns
+        },
+    }
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> Dict[str, object]:
+    """두 데이터프레임의 메모리 사용량 비교 (before → after)"""
+    before_usage = memory_usage(before)
+    after_usage = memory_usage(after)
+    before_bytes = before_usage["total_bytes"]
+    after_bytes = after_usage["total_bytes"]
+    return {
+        "before": before_usage,
+        "after": after_usage,
+        "saved_bytes": before_bytes - after_bytes,
+        "ratio": round(after_bytes / before_bytes, 4) if before_bytes else None,
+    }
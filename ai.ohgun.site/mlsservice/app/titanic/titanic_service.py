@@ -5,6 +5,7 @@
 import sys
 import os
 import logging
+from concurrent.futures import as_completed
 from pathlib import Path
 from typing import List, Dict, Optional, Any, ParamSpecArgs
 import pandas as pd
@@ -17,7 +18,7 @@ from sklearn.naive_bayes import GaussianNB
 from sklearn.svm import SVC
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-from icecream import ic
+from app.common.log_capture import make_print, make_ic
 from tabulate import tabulate
 
 # Windows 터미널 인코딩 설정
@@ -31,28 +32,28 @@ if sys.platform == 'win32':
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# print() 함수를 래핑하여 항상 flush되도록 함 (Docker 로그 즉시 표시)
-_original_print = print
-def print(*args, **kwargs):
-    """print() 함수 래퍼: 항상 flush하여 Docker 로그에 즉시 표시"""
-    kwargs.setdefault('flush', True)  # flush=True 기본값 설정
-    _original_print(*args, **kwargs)
-
-# ic() 함수도 래핑하여 출력이 즉시 표시되도록 함
-_original_ic = ic
-def ic(*args, **kwargs):
-    """ic() 함수 래퍼: 출력 후 flush하여 Docker 로그에 즉시 표시"""
-    result = _original_ic(*args, **kwargs)
-    # ic() 출력 후 강제 flush
-    sys.stdout.flush()
-    sys.stderr.flush()
-    return result
+# print()/ic() 출력은 logging 으로 보냄
+# (요청별 로그 수집 + 컨테이너 로그는 배치로 출력, 전역 stdout 을 건드리지 않음)
+print = make_print(logger)
+ic = make_ic(logger)
 
 # 공통 모듈 경로 추가
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
+from app.common.executor import get_executor
+
 # TitanicMethod import
-from .titanic_method import TitanicMethod
+from .titanic_method import TitanicMethod, DATA_DIR
+from .titanic_pipeline import TitanicPipeline, PIPELINE_PATH, file_fingerprint
+from .titanic_schema import read_titanic, memory_report
+from .titanic_model import (
+    TitanicModels,
+    EvaluationCache,
+    predict_proba,
+    DEFAULT_MODEL_NAME,
+    EVALUATION_CANDIDATES,
+    evaluate_candidate,
+)
 
 
 class TitanicService:
@@ -60,8 +61,148 @@ class TitanicService:
     타이타닉 승객 데이터 CRUD 서비스 클래스
     Java 스타일의 서비스 레이어 패턴 구현
     """
-    def __init__(self):
-        pass
+    def __init__(self, compact: Optional[bool] = None):
+        # 중복 더미 컬럼 없이 int8/float32 피처를 쓰는 compact 파이프라인 사용 여부
+        if compact is None:
+            compact = os.getenv("TITANIC_COMPACT_FEATURES", "0").lower() in ("1", "true", "yes")
+        self.compact = compact
+        # fit 된 전처리 파이프라인과 변환된 train 데이터 (train.csv 해시 기준으로 재사용)
+        self._pipeline: Optional[TitanicPipeline] = None
+        # train.csv (mtime, 크기) → 내용 해시 (파일이 그대로면 요청마다 다시 해시하지 않음)
+        self._train_stat: Optional[tuple] = None
+        self._train_fingerprint: Optional[str] = None
+        self._train_cache: Optional[Dict[str, Any]] = None
+        # 학습된 모델 레지스트리 (활성 모델은 메모리에 유지)
+        self.models = TitanicModels()
+        # 후보 모델 평가 결과 캐시
+        self.evaluation_cache = EvaluationCache()
+
+    def _train_file_fingerprint(self, train_path: Path) -> str:
+        """train.csv 내용 해시 (mtime/크기가 같으면 이전 해시 재사용)"""
+        stat = train_path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._train_stat != key or self._train_fingerprint is None:
+            self._train_fingerprint = file_fingerprint(train_path)
+            self._train_stat = key
+        return self._train_fingerprint
+
+    def get_pipeline(self, refresh: bool = False) -> TitanicPipeline:
+        """
+        fit 된 전처리 파이프라인 반환
+        train.csv 가 바뀌지 않았다면 메모리/디스크에 있는 파이프라인을 재사용
+        """
+        train_path = DATA_DIR / 'train.csv'
+        fingerprint = self._train_file_fingerprint(train_path)
+        if (refresh or self._pipeline is None
+                or self._pipeline.source_fingerprint != fingerprint):
+            if refresh:
+                self._pipeline = TitanicPipeline(compact=self.compact).fit(
+                    read_titanic(train_path), source_fingerprint=fingerprint
+                )
+                self._pipeline.save()
+            else:
+                self._pipeline = TitanicPipeline.load_or_fit(train_path, compact=self.compact)
+            self._train_cache = None
+        return self._pipeline
+
+    def get_training_data(self):
+        """
+        파이프라인으로 변환한 train 피처(X)와 레이블(y) 반환
+        같은 파이프라인이면 변환 결과를 재사용
+        """
+        pipeline = self.get_pipeline()
+        if self._train_cache is None or self._train_cache['fingerprint'] != pipeline.source_fingerprint:
+            df_train = TitanicMethod().new_model('train.csv')
+            self._train_cache = {
+                'fingerprint': pipeline.source_fingerprint,
+                'X': pipeline.transform(df_train),
+                'y': df_train[TitanicPipeline.LABEL],
+            }
+        return self._train_cache['X'], self._train_cache['y']
+
+    def get_model(self) -> Dict[str, Any]:
+        """
+        현재 train 데이터/피처 형태에 맞는 활성 모델 반환 ({"model", "meta"})
+        활성 모델이 없으면 레지스트리에 저장된 같은 버전을 로드하고, 없을 때만 학습
+        """
+        active = self.models.active
+        X, y = self.get_training_data()
+        pipeline = self.get_pipeline()
+        fingerprint, features = pipeline.source_fingerprint, pipeline.feature_signature()
+        if active is not None and self.models.matches(active["meta"], fingerprint, features):
+            return active
+        # 재시작 직후: 마지막 활성 모델(재학습된 모델 포함)을 우선 로드
+        # (compact 설정이나 파이프라인 버전이 바뀌었으면 다시 학습)
+        return (self.models.load_active(fingerprint, features)
+                or self.models.get_or_train(X, y, fingerprint, features=features))
+
+    def memory_report(self, file_name: str = 'train.csv', arrow: bool = False) -> Dict[str, Any]:
+        """
+        원본 read_csv 대비 스키마 로더, 전체 피처 대비 compact 피처의 메모리 사용량 비교
+
+        Args:
+            file_name: data 폴더의 CSV 파일명
+            arrow: 스키마 로더에서 Arrow 문자열 사용 여부 (pyarrow 필요)
+        """
+        file_path = DATA_DIR / file_name
+        if not file_path.exists():
+            raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
+        raw = pd.read_csv(file_path)
+        typed = read_titanic(file_path, arrow=arrow)
+        pipeline = self.get_pipeline()
+        # 같은 학습값을 쓰되 출력 형태만 다르게 비교
+        full, compact = pipeline.with_compact(False), pipeline.with_compact(True)
+        return {
+            "file": file_name,
+            "arrow": arrow,
+            "load": memory_report(raw, typed),
+            "features": memory_report(full.transform(typed), compact.transform(typed)),
+        }
+
+    # 예측 시 한 번에 변환/예측할 최대 행 수 (메모리 상한)
+    PREDICT_BATCH_SIZE = 5000
+
+    def predict(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        승객 원본 행들의 생존 확률 예측
+        fit 된 파이프라인과 활성 모델로 PREDICT_BATCH_SIZE 단위 벡터 연산
+
+        Args:
+            df: train/test 와 같은 컬럼의 승객 데이터 (Survived 불필요)
+
+        Returns:
+            PassengerId, survival_probability, Survived 컬럼의 데이터프레임
+        """
+        pipeline = self.get_pipeline()
+        model = self.get_model()["model"]
+        survived_idx = list(model.classes_).index(1)
+
+        results = []
+        for start in range(0, len(df), self.PREDICT_BATCH_SIZE):
+            batch = df.iloc[start:start + self.PREDICT_BATCH_SIZE]
+            proba = predict_proba(model, pipeline.transform(batch))[:, survived_idx]
+            passenger_ids = (batch['PassengerId'].to_numpy() if 'PassengerId' in batch.columns
+                             else np.full(len(batch), None, dtype=object))
+            results.append(pd.DataFrame({
+                'PassengerId': passenger_ids,
+                'survival_probability': proba,
+                'Survived': (proba >= 0.5).astype(int),
+            }))
+        if not results:
+            return pd.DataFrame(columns=['PassengerId', 'survival_probability', 'Survived'])
+        return pd.concat(results, ignore_index=True)
+
+    def retrain(self, name: str = DEFAULT_MODEL_NAME, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        모델을 새로 학습하여 활성 모델을 교체
+        학습이 끝날 때까지는 기존 활성 모델로 계속 예측합니다.
+        """
+        X, y = self.get_training_data()
+        pipeline = self.get_pipeline()
+        entry = self.models.get_or_train(X, y, pipeline.source_fingerprint, name=name, params=params,
+                                         force=True, features=pipeline.feature_signature())
+        logger.info(f"모델 재학습 완료: {entry['meta']['name']} ({entry['meta']['version']})")
+        return entry["meta"]
     
     def _print_dataframe_info(self, name: str, df: pd.DataFrame, stage: str = ""):
         """
@@ -199,6 +340,10 @@ class TitanicService:
             print(f'[IC] 4. {name} 의 null 의 갯수\n {data.isnull().sum().to_dict()}개')
             ic(f'4. {name} 의 null 의 갯수\n {data.isnull().sum().to_dict()}개')
         
+        # train 에서 학습한 대체값/컬럼 순서를 파이프라인으로 저장 (evaluating, submit 에서 재사용)
+        pipeline = self.get_pipeline(refresh=True)
+        print(f"💾 전처리 파이프라인 저장: {PIPELINE_PATH} (피처 {len(pipeline.feature_columns)}개)")
+
         print("\n" + "="*80)
         print("🎉 전처리 완료!")
         print("="*80 + "\n")
@@ -225,62 +370,71 @@ class TitanicService:
 
         logger.info("😊😊 학습 완료")
 
-    def evaluating(self):
+    def evaluating(self, cv: Optional[int] = None, refresh: bool = False) -> Dict[str, Any]:
+        """
+        후보 모델 비교 평가
+        - 후보 모델들을 공용 프로세스 풀에서 동시에 학습/평가
+        - cv 지정 시 Stratified K-Fold 교차 검증 (기본: 80/20 홀드아웃)
+        - (데이터 해시, 모델 파라미터, 분할 방식) 기준으로 결과를 캐시하여
+          데이터가 바뀌지 않았다면 다시 학습하지 않음
+        """
         ic("😊😊 평가 시작")
-
-        the_method = TitanicMethod()
-
-        # 1) 데이터 로드
-        df_train = the_method.new_model('train.csv')
-
-        # 2) 레이블 분리
-        y_df = the_method.create_label(df_train, 'Survived')
-        X_df = the_method.create_df(df_train, 'Survived')
-
-        # 3) 동일 파이프라인 전처리 (train_df, test_df 형태로 처리)
-        dummy = X_df.copy()
-
-        drop_features = ['SibSp', 'Parch', 'Cabin', 'Ticket']
-        X_df, dummy = the_method.drop_feature(X_df, dummy, *drop_features)
-        X_df, dummy = the_method.pclass_ordinal(X_df, dummy)
-        X_df, dummy = the_method.title_nominal(X_df, dummy)
-        X_df, dummy = the_method.gender_nominal(X_df, dummy)
-        X_df, dummy = the_method.age_ratio(X_df, dummy)
-        X_df, dummy = the_method.fare_ratio(X_df, dummy)
-        X_df, dummy = the_method.embarked_nominal(X_df, dummy)
-
-        if 'Name' in X_df.columns:
-            X_df, dummy = the_method.drop_feature(X_df, dummy, 'Name')
-
-        # 4) 학습/검증 분리
-        y = y_df.squeeze()
-        X_train, X_val, y_train, y_val = train_test_split(
-            X_df, y, test_size=0.2, random_state=42, stratify=y
-        )
-
-        # 5) 여러 모델 검증
-        models = [
-            ("DecisionTree", DecisionTreeClassifier(random_state=42)),
-            ("RandomForest", RandomForestClassifier(n_estimators=200, random_state=42, n_jobs=-1)),
-            ("GaussianNB", GaussianNB()),
-            ("SVM_rbf", SVC(kernel='rbf', probability=True, random_state=42)),
-            ("LogisticRegression", LogisticRegression(max_iter=1000, n_jobs=-1))
-        ]
-
-        for name, model in models:
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_val)
-            acc = accuracy_score(y_val, y_pred)
-            msg = f"{name} 검증 정확도: {acc*100:.2f}%"
+        if cv is not None and cv < 2:
+            raise ValueError("cv 는 2 이상이어야 합니다.")
+
+        # 1) fit 된 파이프라인으로 변환된 train 데이터 (요청마다 다시 전처리하지 않음)
+        X_df, y = self.get_training_data()
+        pipeline = self.get_pipeline()
+        fingerprint, features = pipeline.source_fingerprint, pipeline.feature_signature()
+
+        # 2) 캐시에 없는 후보만 골라서 병렬 평가 (피처 형태가 바뀌면 다른 키)
+        keys = {name: self.evaluation_cache.make_key(fingerprint, name, params, cv, features)
+                for name, params in EVALUATION_CANDIDATES}
+        results: Dict[str, Dict[str, Any]] = {}
+        pending = []
+        for name, params in EVALUATION_CANDIDATES:
+            cached = None if refresh else self.evaluation_cache.get(keys[name])
+            if cached is not None:
+                results[name] = {**cached, "cached": True}
+            else:
+                pending.append((name, params))
+
+        if pending:
+            # 공용 프로세스 풀 사용 (요청마다 워커 프로세스를 새로 띄우지 않음)
+            executor = get_executor()
+            futures = {
+                executor.submit_process(evaluate_candidate, name, params, X_df, y, cv): name
+                for name, params in pending
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                self.evaluation_cache.put(keys[result["name"]], result)
+                results[result["name"]] = {**result, "cached": False}
+
+        # 3) 결과 출력 (후보 순서 유지)
+        ordered = [results[name] for name, _ in EVALUATION_CANDIDATES]
+        for result in ordered:
+            msg = f"{result['name']} 검증 정확도: {result['accuracy']*100:.2f}%"
+            if cv:
+                msg += f" (±{result['std']*100:.2f}, {cv}-fold)"
+            if result["cached"]:
+                msg += " [cached]"
             logger.info(msg)
             ic(msg)
 
+        best = max(ordered, key=lambda r: r["accuracy"])
         logger.info("😊😊 평가 완료")
         ic("😊😊 평가 완료")
+        return {
+            "split": f"{cv}-fold" if cv else "holdout(0.2)",
+            "data_fingerprint": fingerprint,
+            "best": best["name"],
+            "results": ordered,
+        }
 
     def submit(self):
         """
-        RandomForest 모델로 test.csv 예측 후 Kaggle 제출용 CSV 생성
+        레지스트리의 활성 모델(기본: RandomForest)로 test.csv 예측 후 Kaggle 제출용 CSV 생성
         출력: submission.csv (PassengerId, Survived)
         """
         ic("😊😊 제출 시작")
@@ -288,59 +442,37 @@ class TitanicService:
 
         the_method = TitanicMethod()
 
-        # 1) train.csv 로드 및 전처리 (전체 데이터로 학습)
-        df_train = the_method.new_model('train.csv')
-        y_train_full = the_method.create_label(df_train, 'Survived').squeeze()
-        X_train_full = the_method.create_df(df_train, 'Survived')
-
-        # 2) test.csv 로드 (PassengerId 저장)
+        # 1) test.csv 로드 (PassengerId 저장)
         df_test = the_method.new_model('test.csv')
         test_passenger_ids = df_test['PassengerId'].copy()
-        X_test = df_test.copy()
 
-        # 3) 동일 전처리 파이프라인 적용 (train, test 함께 처리)
-        drop_features = ['SibSp', 'Parch', 'Cabin', 'Ticket']
-        X_train_full, X_test = the_method.drop_feature(X_train_full, X_test, *drop_features)
-        X_train_full, X_test = the_method.pclass_ordinal(X_train_full, X_test)
-        X_train_full, X_test = the_method.title_nominal(X_train_full, X_test)
-        X_train_full, X_test = the_method.gender_nominal(X_train_full, X_test)
-        X_train_full, X_test = the_method.age_ratio(X_train_full, X_test)
-        X_train_full, X_test = the_method.fare_ratio(X_train_full, X_test)
-        X_train_full, X_test = the_method.embarked_nominal(X_train_full, X_test)
-
-        if 'Name' in X_train_full.columns:
-            X_train_full, X_test = the_method.drop_feature(X_train_full, X_test, 'Name')
-
-        # 4) PassengerId 제거 (모델 학습용 피처에서 제외)
-        if 'PassengerId' in X_train_full.columns:
-            X_train_full = X_train_full.drop(columns=['PassengerId'])
-        if 'PassengerId' in X_test.columns:
-            X_test = X_test.drop(columns=['PassengerId'])
-
-        # 5) RandomForest 모델 학습 (전체 train 데이터 사용)
-        model = RandomForestClassifier(n_estimators=200, random_state=42, n_jobs=-1)
-        model.fit(X_train_full, y_train_full)
-        logger.info("RandomForest 모델 학습 완료")
-        ic("RandomForest 모델 학습 완료")
-
-        # 6) test 데이터 예측
+        # 2) 동일 파이프라인을 test 에 한 번에 적용 (train 에서 학습한 대체값 사용)
+        X_test = self.get_pipeline().transform(df_test)
+
+        # 3) 레지스트리의 활성 모델 사용 (전체 train 데이터로 학습된 모델, 요청마다 재학습하지 않음)
+        entry = self.get_model()
+        model = entry["model"]
+        logger.info(f"활성 모델 사용: {entry['meta']['name']} ({entry['meta']['version']})")
+        ic(f"활성 모델 사용: {entry['meta']['name']} ({entry['meta']['version']})")
+
+        # 4) test 데이터 예측
         y_pred = model.predict(X_test)
         logger.info(f"예측 완료: {len(y_pred)}개 샘플")
         ic(f"예측 완료: {len(y_pred)}개 샘플")
 
-        # 7) Kaggle 제출용 CSV 생성
+        # 5) Kaggle 제출용 CSV 생성
         submission = pd.DataFrame({
             'PassengerId': test_passenger_ids,
             'Survived': y_pred
         })
 
-        # 8) CSV 파일 저장
+        # 6) CSV 파일 저장
         output_path = Path(__file__).parent / 'submission.csv'
         submission.to_csv(output_path, index=False)
         logger.info(f"제출 파일 생성 완료: {output_path}")
         ic(f"제출 파일 생성 완료: {output_path}")
 
-        # 9) 결과 미리보기
+        # 7) 결과 미리보기
         logger.info(f"\n제출 파일 미리보기 (상위 10개):\n{submission.head(10).to_string(index=False)}")
         ic(submission.head(10))
 
@@ -351,5 +483,6 @@ class TitanicService:
             "status": "success",
             "output_file": str(output_path),
             "total_predictions": len(y_pred),
+            "model": entry["meta"],
             "preview": submission.head(10).to_dict(orient='records')
         }
\ No newline at end of file
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import HTMLResponse, JSONResponse
 
+from app.common.executor import get_executor
 from .service import USUnemploymentMap
 
 usa_router = APIRouter(prefix="/usa", tags=["usa"])
@@ -22,10 +23,16 @@ async def get_usa_unemployment_map():
     """
     try:
         service = USUnemploymentMap()
-        # 파일 저장 (기본: app/us_unemployment/save/us_unemployment.html)
-        saved_path = service.save_html()
-        # 브라우저에서 바로 렌더링할 수 있도록 HTML 문자열 반환
-        m = service.build_map()
-        return HTMLResponse(content=m._repr_html_(), headers={"X-Saved-Path": saved_path})
+
+        def run():
+            # 파일 저장 (기본: app/us_unemployment/save/us_unemployment.html)
+            saved_path = service.save_html()
+            # 브라우저에서 바로 렌더링할 수 있도록 HTML 문자열 반환
+            m = service.build_map()
+            return saved_path, m._repr_html_()
+
+        # 외부 데이터 다운로드와 지도 렌더링은 실행기 스레드에서 수행
+        saved_path, html = await get_executor().run_in_thread("usa.map", run)
+        return HTMLResponse(content=html, headers={"X-Saved-Path": saved_path})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"지도 생성 중 오류 발생: {e}")
@@ -0,0 +1,99 @@
+"""
+Okt 명사 추출 벤치마크 스크립트
+SamsungWordCloud.extract_noun 의 기존 방식(어절마다 okt.pos 호출)과
+NounExtractor(배치 / 어절 캐시 / 프로세스 병렬)의 초당 처리 어절 수를 비교합니다.
+입력은 kr-Report_2018.txt 를 extract_noun 과 같은 방식(한글만 남기고 공백 분리)으로 만든 어절 목록입니다.
+
+    python run_okt_bench.py          # 원문 1배
+    python run_okt_bench.py 1 4 16   # 원문을 반복한 배수 직접 지정 (반복이 많을수록 캐시 효과가 큼)
+
+konlpy 와 JVM 이 필요합니다.
+"""
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from app.common.executor import get_executor
+from app.nlp.samsung.noun_extractor import NounExtractor, analyze_eojeols_in_worker
+from app.nlp.samsung.samsung_wordcloud import SamsungWordCloud
+
+DEFAULT_REPEATS = (1,)
+
+
+def load_tokens(wordcloud: SamsungWordCloud) -> list:
+    """extract_noun 과 같은 전처리 (파일 읽기 → 한글만 → 공백 분리)"""
+    return wordcloud.change_token(wordcloud.extract_hangeul(wordcloud.read_file()))
+
+
+def legacy_extract(okt, tokens: list) -> list:
+    """SamsungWordCloud.extract_noun 의 기존 루프"""
+    noun_tokens = []
+    for i in tokens:
+        temp = [j[0] for j in okt.pos(i) if j[1] == 'Noun']
+        if len(''.join(temp)) > 1:
+            noun_tokens.append(''.join(temp))
+    return noun_tokens
+
+
+def measure(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def report(name: str, tokens: int, seconds: float, baseline: float, same: bool) -> None:
+    speedup = f"{baseline / seconds:7.1f}x" if seconds else "      -"
+    print(f"  {name:<28} {seconds:9.3f}s {tokens / seconds if seconds else 0:12,.0f} tok/s {speedup}"
+          f"  {'동일' if same else '불일치'}")
+
+
+def run(wordcloud: SamsungWordCloud, base_tokens: list, repeat: int, workers: int) -> None:
+    tokens = base_tokens * repeat
+    print(f"\n어절 {len(tokens):,}개 (원문 x{repeat}, 고유 어절 {len(set(tokens)):,}개)")
+
+    expected, legacy_seconds = measure(lambda: legacy_extract(wordcloud.okt, tokens))
+    report("기존 (어절별 okt.pos)", len(tokens), legacy_seconds, legacy_seconds, True)
+
+    # 배치만 (단일 프로세스, 빈 캐시)
+    batched = NounExtractor(okt=wordcloud.okt, workers=1)
+    result, seconds = measure(lambda: batched.extract(tokens))
+    report("배치 + 캐시 (첫 실행)", len(tokens), seconds, legacy_seconds, result == expected)
+
+    # 같은 추출기로 다시 (모든 어절이 캐시에 있음)
+    result, seconds = measure(lambda: batched.extract(tokens))
+    report("배치 + 캐시 (재실행)", len(tokens), seconds, legacy_seconds, result == expected)
+
+    if workers > 1:
+        parallel = NounExtractor(okt=wordcloud.okt, workers=workers, parallel_min_tokens=0)
+        result, seconds = measure(lambda: parallel.extract(tokens))
+        report(f"프로세스 병렬 x{workers} (첫 실행)", len(tokens), seconds, legacy_seconds, result == expected)
+
+
+def main() -> None:
+    repeats = [int(arg) for arg in sys.argv[1:]] or list(DEFAULT_REPEATS)
+    wordcloud = SamsungWordCloud(batched=False)
+    base_tokens = load_tokens(wordcloud)
+
+    # JVM 시작/클래스 로딩은 측정에서 제외
+    wordcloud.okt.pos("삼성전자 스마트폰")
+    executor = get_executor()
+    workers = executor.process_workers
+    if workers > 1:
+        # 워커마다 Okt(JVM) 를 미리 띄움 (워커 시작 비용은 서버 실행 중 한 번만 발생)
+        for future in [executor.submit_process(analyze_eojeols_in_worker, ["예열"]) for _ in range(workers)]:
+            future.result()
+
+    print(f"kr-Report_2018.txt 어절 {len(base_tokens):,}개, 프로세스 워커 {workers}개")
+    try:
+        for repeat in repeats:
+            run(wordcloud, base_tokens, repeat, workers)
+    finally:
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
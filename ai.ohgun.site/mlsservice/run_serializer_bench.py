@@ -0,0 +1,102 @@
+"""
+직렬화 마이크로 벤치마크 스크립트
+기존 방식(replace/where/to_dict + 셀 단위 루프 + json)과 공용 직렬화기(app.common.serializer)의
+행당 직렬화 비용을 1천/10만/100만 행에서 비교합니다.
+
+    python run_serializer_bench.py            # 1k, 100k, 1M
+    python run_serializer_bench.py 1000 50000 # 행 수 직접 지정
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from app.common.serializer import HAS_ORJSON, HAS_PYARROW, dumps, frame_to_arrow, frame_to_ndjson, frame_to_records
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+# 기존 방식은 느리므로 이 행 수까지만 측정
+LEGACY_MAX_ROWS = 100_000
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    """AIFIX/KOICA 데이터와 비슷한 형태(숫자+문자열, NaN/inf/빈 문자열/#REF! 포함)의 합성 데이터"""
+    rng = np.random.default_rng(42)
+    score = rng.normal(50, 15, rows)
+    score[rng.random(rows) < 0.05] = np.nan
+    score[rng.random(rows) < 0.01] = np.inf
+    names = np.array(["삼성전자", "LG화학", "", "#REF!", "현대자동차", "SK하이닉스", "카카오"], dtype=object)
+    grades = np.array(["A+", "A", "B+", "B", "C", None], dtype=object)
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "name": names[rng.integers(0, len(names), rows)],
+        "grade": grades[rng.integers(0, len(grades), rows)],
+        "score": score,
+        "amount": rng.integers(0, 10_000_000, rows).astype("float64"),
+        "flag": rng.random(rows) < 0.5,
+    })
+
+
+def legacy_serialize(df: pd.DataFrame) -> bytes:
+    """라우터에 있던 기존 방식"""
+    df = df.replace([np.inf, -np.inf], np.nan)
+    df = df.where(pd.notna(df), None)
+    records = df.to_dict(orient="records")
+    for record in records:
+        for key, value in record.items():
+            if pd.isna(value) or value == "" or (isinstance(value, str) and value.strip() in ("", "#REF!")):
+                record[key] = None
+            elif isinstance(value, (np.integer, np.floating)):
+                record[key] = value.item()
+    return json.dumps({"success": True, "count": len(records), "data": records}, ensure_ascii=False).encode("utf-8")
+
+
+def fast_serialize(df: pd.DataFrame) -> bytes:
+    records = frame_to_records(df, blank_as_null=True, null_tokens=("#REF!",))
+    return dumps({"success": True, "count": len(records), "data": records})
+
+
+def measure(func, df: pd.DataFrame, repeat: int) -> float:
+    """최소 실행 시간(초)"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(df)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or list(DEFAULT_SIZES)
+    cases = [
+        ("legacy (loop + json)", legacy_serialize),
+        ("records + orjson" if HAS_ORJSON else "records + json", fast_serialize),
+        ("ndjson", lambda df: frame_to_ndjson(df, blank_as_null=True, null_tokens=("#REF!",))),
+    ]
+    if HAS_PYARROW:
+        cases.append(("arrow ipc", frame_to_arrow))
+
+    print("=" * 80)
+    print(f"직렬화 벤치마크 (orjson={HAS_ORJSON}, pyarrow={HAS_PYARROW})")
+    print("=" * 80)
+    print(f"{'rows':>10}  {'방식':<24}{'총 시간(ms)':>14}{'행당(µs)':>12}{'배속':>8}")
+    for rows in sizes:
+        df = make_frame(rows)
+        repeat = 5 if rows <= 10_000 else (3 if rows <= 100_000 else 1)
+        baseline = None
+        for label, func in cases:
+            if func is legacy_serialize and rows > LEGACY_MAX_ROWS:
+                print(f"{rows:>10}  {label:<24}{'(생략)':>14}")
+                continue
+            seconds = measure(func, df, repeat)
+            if baseline is None and func is legacy_serialize:
+                baseline = seconds
+            speedup = f"{baseline / seconds:.1f}x" if baseline else "-"
+            print(f"{rows:>10}  {label:<24}{seconds * 1000:>14.1f}{seconds / rows * 1e6:>12.3f}{speedup:>8}")
+        print("-" * 80)
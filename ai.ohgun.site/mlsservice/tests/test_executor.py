@@ -0,0 +1,17 @@
+"""
+ExecutorLayer 테스트
+"""
+import asyncio
+
+from app.common.executor import ExecutorLayer
+
+
+def test_to_thread_inside_thread_pool_job_does_not_wait_on_thread_pool():
+    # 스레드 풀 워커가 하나뿐이어도, 그 워커에서 asyncio.run 으로 띄운 루프의 to_thread 는 I/O 풀에서 실행
+    executor = ExecutorLayer(thread_workers=1)
+    try:
+        future = executor.thread_pool.submit(lambda: asyncio.run(executor.to_thread(sum, [1, 2, 3])))
+        assert future.result(timeout=5) == 6
+        assert executor.metrics()["io_pool"]["started"]
+    finally:
+        executor.shutdown()
@@ -0,0 +1,97 @@
+"""
+AsyncKakaoGeocoder 테스트 (httpx.MockTransport 로 카카오 로컬 API 대체, 네트워크 호출 없음)
+"""
+import asyncio
+from collections import Counter
+
+import httpx
+import pytest
+
+from app.seoul_crime.geocode_cache import GeocodeCache
+from app.seoul_crime.kakao_async import AsyncKakaoGeocoder
+
+BASE_URL = "http://kakao.test/v2/local"
+
+
+def _documents(query: str):
+    return {"documents": [{"address_name": query, "x": "127.0", "y": "37.5"}], "meta": {"total_count": 1}}
+
+
+def _geocoder(tmp_path, handler, **kwargs) -> AsyncKakaoGeocoder:
+    return AsyncKakaoGeocoder(
+        "test-key", BASE_URL,
+        cache=GeocodeCache(db_path=tmp_path / "geocode.sqlite"),
+        rate_per_second=0,
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+
+async def _run(geocoder: AsyncKakaoGeocoder, coro):
+    try:
+        return await coro
+    finally:
+        await geocoder.aclose()
+
+
+def test_batch_keeps_input_order(tmp_path):
+    queries = [f"서울 {i}번지" for i in range(12)]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        query = request.url.params["query"]
+        assert request.headers["Authorization"] == "KakaoAK test-key"
+        # 뒤쪽 검색어가 먼저 끝나도록 지연
+        await asyncio.sleep(0.002 * (len(queries) - queries.index(query)))
+        return httpx.Response(200, json=_documents(query))
+
+    geocoder = _geocoder(tmp_path, handler, max_concurrency=len(queries))
+    results = asyncio.run(_run(geocoder, geocoder.batch(queries)))
+
+    assert [r["documents"][0]["address_name"] for r in results] == queries
+    assert geocoder.network_calls == len(queries)
+
+
+def test_retries_on_429_then_succeeds(tmp_path):
+    calls = Counter()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = request.url.params["query"]
+        calls[query] += 1
+        if calls[query] <= 2:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json=_documents(query))
+
+    geocoder = _geocoder(tmp_path, handler, max_retries=3)
+    result = asyncio.run(_run(geocoder, geocoder.geocode("서울 중구")))
+
+    assert result["documents"][0]["address_name"] == "서울 중구"
+    assert calls["서울 중구"] == 3
+    assert geocoder.retries == 2
+    assert geocoder.network_calls == 3
+
+
+def test_gives_up_after_max_retries(tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, headers={"Retry-After": "0"})
+
+    geocoder = _geocoder(tmp_path, handler, max_retries=2)
+    with pytest.raises(Exception, match="429"):
+        asyncio.run(_run(geocoder, geocoder.geocode("서울 중구")))
+    assert geocoder.network_calls == 3
+    # 실패한 응답은 캐시하지 않음
+    assert geocoder.cache.get("address", "서울 중구") is None
+
+
+def test_cached_queries_skip_network(tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=_documents(request.url.params["query"]))
+
+    geocoder = _geocoder(tmp_path, handler)
+    queries = ["서울 중구", ("keyword", "중부경찰서"), "서울 종로구"]
+    first = asyncio.run(_run(geocoder, geocoder.batch(queries)))
+    assert geocoder.network_calls == 3
+
+    second = asyncio.run(_run(geocoder, geocoder.batch(queries)))
+    assert second == first
+    assert geocoder.network_calls == 3
+    assert geocoder.cache.hits == 3
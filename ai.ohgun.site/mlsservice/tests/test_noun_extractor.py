@@ -0,0 +1,103 @@
+"""
+noun_extractor 테스트 (Okt 대신 공백 단위로 형태소를 만드는 대역 분석기 사용, konlpy/JVM 불필요)
+배치/캐시 결과가 SamsungWordCloud.extract_noun 의 어절별 okt.pos 루프와 같은지 확인
+"""
+import random
+
+from app.nlp.samsung.noun_extractor import NounExtractor, _align, analyze_eojeols
+
+
+class StandInOkt:
+    """
+    Okt 처럼 공백 단위 청크를 독립적으로 분석하는 대역
+    - "…는" → 명사 + 조사, "…다" → 동사, 4글자 이상 → 명사 두 개, 그 밖에는 명사
+    - "ㅋㅋ" 는 여러 어절을 함께 분석할 때만 "크크" 로 정규화 (배치 결과가 원문과 어긋나는 경우)
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def pos(self, text):
+        self.calls += 1
+        morphs = []
+        for word in text.split():
+            if word == "ㅋㅋ" and " " in text:
+                morphs.append(("크크", "KoreanParticle"))
+            elif word.endswith("는") and len(word) > 1:
+                morphs += [(word[:-1], "Noun"), ("는", "Josa")]
+            elif word.endswith("다"):
+                morphs.append((word, "Verb"))
+            elif len(word) >= 4:
+                morphs += [(word[:2], "Noun"), (word[2:], "Noun")]
+            else:
+                morphs.append((word, "Noun"))
+        return morphs
+
+
+def legacy_extract(okt, tokens):
+    """SamsungWordCloud.extract_noun 의 기존 루프"""
+    noun_tokens = []
+    for i in tokens:
+        temp = [j[0] for j in okt.pos(i) if j[1] == 'Noun']
+        if len(''.join(temp)) > 1:
+            noun_tokens.append(''.join(temp))
+    return noun_tokens
+
+
+def _tokens(count: int = 20000, with_laugh: bool = True):
+    rng = random.Random(1)
+    vocab = ["삼성전자는", "스마트폰", "하다", "가", "반도체는", "글로벌시장", "사업", "됩니다", "나"]
+    vocab += [f"단어{i}" for i in range(300)]
+    if with_laugh:
+        vocab.append("ㅋㅋ")
+    return [rng.choice(vocab) for _ in range(count)]
+
+
+def test_align_splits_batch_by_eojeol():
+    morphs = [("삼성", "Noun"), ("전자", "Noun"), ("는", "Josa"), ("하다", "Verb"), ("사업", "Noun")]
+    assert _align(morphs, ["삼성전자는", "하다", "사업"]) == ["삼성전자", "", "사업"]
+
+
+def test_align_rejects_misaligned_morphs():
+    # 형태소가 어절을 다 채우지 못함 / 원문과 다른 표면형 / 어절보다 형태소가 많음
+    assert _align([("삼성", "Noun")], ["삼성전자는"]) is None
+    assert _align([("크크", "KoreanParticle")], ["ㅋㅋ"]) is None
+    assert _align([("사업", "Noun"), ("나", "Noun")], ["사업"]) is None
+
+
+def test_batches_match_legacy_loop():
+    tokens = _tokens(with_laugh=False)
+    okt = StandInOkt()
+    expected = legacy_extract(okt, tokens)
+
+    okt.calls = 0
+    extractor = NounExtractor(okt=okt, batch_chars=200, workers=1)
+    assert extractor.extract(tokens) == expected
+    # 고유 어절만 배치로 분석하므로 어절 수보다 훨씬 적게 호출
+    unique_chars = sum(len(t) + 1 for t in set(tokens))
+    assert okt.calls <= unique_chars // 150 + 1
+
+    # 모든 어절이 캐시에 있으면 분석기를 호출하지 않음
+    okt.calls = 0
+    assert extractor.extract(tokens) == expected
+    assert okt.calls == 0
+    assert extractor.stats()["hits"] == len(set(tokens))
+
+
+def test_misaligned_batch_falls_back_to_per_eojeol():
+    tokens = _tokens()
+    okt = StandInOkt()
+    expected = legacy_extract(okt, tokens)
+    assert NounExtractor(okt=okt, batch_chars=200, workers=1).extract(tokens) == expected
+
+    batch = ["삼성전자는", "ㅋㅋ", "사업"]
+    okt.calls = 0
+    assert analyze_eojeols(okt, batch) == ["삼성전자", "ㅋㅋ", "사업"]
+    assert okt.calls == 1 + len(batch)
+
+
+def test_cache_is_capped():
+    tokens = _tokens()
+    extractor = NounExtractor(okt=StandInOkt(), cache_size=10, workers=1)
+    assert extractor.extract(tokens) == legacy_extract(StandInOkt(), tokens)
+    assert extractor.stats()["cached_eojeols"] == 10
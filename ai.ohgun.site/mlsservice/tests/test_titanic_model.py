@@ -0,0 +1,40 @@
+"""
+titanic_model.predict_proba 회귀 테스트
+RandomForest 트리 직접 평균 경로가 활성 모델의 model.predict_proba 와 같은 값을 내는지 확인
+"""
+import numpy as np
+import pytest
+
+from app.titanic.titanic_method import DATA_DIR
+from app.titanic.titanic_model import TitanicModels, predict_proba
+from app.titanic.titanic_schema import read_titanic
+from app.titanic.titanic_service import TitanicService
+
+
+@pytest.fixture(scope="module")
+def test_rows():
+    return read_titanic(DATA_DIR / "test.csv")
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("name, params", [
+    ("RandomForest", {"n_estimators": 50}),
+    ("RandomForest", {"n_estimators": 30, "max_depth": 4, "class_weight": "balanced"}),
+    ("DecisionTree", {}),
+])
+def test_predict_proba_matches_active_model(tmp_path, test_rows, compact, name, params):
+    service = TitanicService(compact=compact)
+    service.models = TitanicModels(model_dir=tmp_path)
+    pipeline = service.get_pipeline()
+    X, y = service.get_training_data()
+    service.models.get_or_train(X, y, pipeline.source_fingerprint, name=name, params=params,
+                                features=pipeline.feature_signature())
+    model = service.get_model()["model"]
+    assert model is service.models.active["model"]
+
+    for rows in (test_rows, test_rows.iloc[:1]):
+        features = pipeline.transform(rows)
+        expected = model.predict_proba(features)
+        actual = predict_proba(model, features)
+        assert actual.shape == expected.shape
+        np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-12)